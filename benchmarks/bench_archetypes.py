@@ -0,0 +1,290 @@
+"""
+bench_archetypes
+~~~~~~~~~~~~~~~~
+
+Times the stages of using an archetype: loading it
+(:py:class:`inception_tools.template_archetype.TemplateArchetype`, with cold and warm
+caches), resolving its paths (``file_paths``/``dir_paths``), rendering its files and
+building it, for each standard archetype and for synthetic archetypes of 100, 1k and
+10k files and with large prototypes.  For each case, reports the best wall time of
+several runs, the read/write syscalls and bytes of the first run (from
+``/proc/self/io``, where available) and the peak memory allocated (from
+:py:mod:`tracemalloc`, in a separate run).  Results can be saved as a JSON baseline
+and later runs compared against it, flagging regressions.  Run from the project root
+with:
+
+    python -m benchmarks.bench_archetypes [--quick] [--filter REGEX]
+        [--save-baseline PATH] [--baseline PATH [--threshold 0.25]]
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+from inception_tools.archetype_cache import ArchetypeCache
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.standard_archetype import StandardArchetype
+from inception_tools.synthetic_archetype import (
+    SyntheticArchetypeSpec,
+    write_synthetic_archetype,
+)
+from inception_tools.template_archetype import TemplateArchetype
+from inception_tools.template_cache import TemplateCache
+
+_PARAMS = ArchetypeParameters(
+    "some_package_name", "some_author", "some_author_email", datetime.date(2000, 1, 1)
+)
+
+_BASELINE_FORMAT = 1
+
+# The metrics compared against a baseline; the others are only reported
+_COMPARED_METRICS = ("wall_s", "syscr", "syscw", "peak_bytes")
+
+# Metrics smaller than these are too noisy to be flagged as regressions
+_NOISE_FLOORS = {"wall_s": 0.001, "syscr": 20, "syscw": 20, "peak_bytes": 64 * 1024}
+
+_CASES = ("load-cold", "load-warm", "paths", "render", "build")
+
+Result = namedtuple(
+    "Result",
+    ("name", "items", "wall_s", "syscr", "syscw", "rchar", "wchar", "peak_bytes"),
+)
+
+
+def _io_counters():
+    # Returns the I/O counters of this process, or None where /proc isn't available
+    try:
+        with open("/proc/self/io") as f:
+            pairs = (line.split(":") for line in f)
+            return {k.strip(): int(v) for k, v in pairs}
+    except (OSError, ValueError):
+        return None
+
+
+class _Suite(object):
+    # Holds the temporary directory in which synthetic archetypes, caches and
+    # builds are created
+
+    def __init__(self, tmp_dir, quick):
+        self._tmp_dir = tmp_dir
+        self._quick = quick
+        self._counter = itertools.count()
+
+    def _new_dir(self, prefix):
+        return os.path.join(self._tmp_dir, f"{prefix}-{next(self._counter)}")
+
+    def _load(self, dir_path, cache_dir=None):
+        cache_dir = cache_dir or self._new_dir("cache")
+        return TemplateArchetype(
+            dir_path, TemplateCache(cache_dir), ArchetypeCache(cache_dir)
+        )
+
+    def archetypes(self):
+        for sa in StandardArchetype:
+            yield f"standard/{sa.canonical_name}", sa.dir_path
+        sizes = (100, 1000) if self._quick else (100, 1000, 10000)
+        specs = [(f"{n}-files", SyntheticArchetypeSpec(n, fan_out=10)) for n in sizes]
+        large_size = 1 << 18 if self._quick else 1 << 20
+        # Large prototypes, like licenses, are mostly literal text
+        large_spec = SyntheticArchetypeSpec(
+            10, prototype_size=large_size, variable_density=0.02
+        )
+        specs.append(("large-prototypes", large_spec))
+        for name, spec in specs:
+            dir_path = self._new_dir(name)
+            write_synthetic_archetype(dir_path, spec)
+            yield f"synthetic/{name}", dir_path
+
+    def cases(self, name, dir_path):
+        # Yields (case name, item count, prepare) for each case, where prepare
+        # returns the callable to be timed and a callable cleaning up after it
+        warm_cache_dir = self._new_dir("cache")
+        loaded = self._load(dir_path, warm_cache_dir)
+        loaded.load()
+        file_count = len(loaded.file_paths("root", _PARAMS))
+
+        def load_cold():
+            return lambda: self._load(dir_path).load(), lambda: None
+
+        def load_warm():
+            return lambda: self._load(dir_path, warm_cache_dir), lambda: None
+
+        def paths():
+            # A new root directory defeats the memoized path resolution
+            root_dir = self._new_dir("root")
+            return (
+                lambda: (
+                    loaded.file_paths(root_dir, _PARAMS),
+                    loaded.dir_paths(root_dir, _PARAMS),
+                ),
+                lambda: None,
+            )
+
+        def render():
+            root_dir = self._new_dir("root")
+            return lambda: sum(1 for _ in loaded.iter_render(root_dir, _PARAMS)), (
+                lambda: None
+            )
+
+        def build():
+            root_dir = self._new_dir("root")
+            return lambda: loaded.build(root_dir, _PARAMS), lambda: shutil.rmtree(
+                root_dir, ignore_errors=True
+            )
+
+        counts = (1, 1, file_count, file_count, file_count)
+        prepares = (load_cold, load_warm, paths, render, build)
+        for case, items, prepare in zip(_CASES, counts, prepares):
+            yield f"{name}/{case}", items, prepare
+
+
+def _measure(name, items, prepare, repeat):
+    best, first_io = None, None
+    for i in range(repeat):
+        run, cleanup = prepare()
+        before = _io_counters()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        after = _io_counters()
+        cleanup()
+        best = elapsed if best is None else min(best, elapsed)
+        if i == 0 and before is not None and after is not None:
+            first_io = {k: after[k] - before[k] for k in after}
+
+    run, cleanup = prepare()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        cleanup()
+
+    io = first_io or {}
+    return Result(
+        name,
+        items,
+        best,
+        io.get("syscr"),
+        io.get("syscw"),
+        io.get("rchar"),
+        io.get("wchar"),
+        peak,
+    )
+
+
+def _print_result(r):
+    per_item = r.wall_s / r.items * 1e6 if r.items else 0.0
+    io = (
+        f"syscr={r.syscr:>7} syscw={r.syscw:>7} "
+        f"read={r.rchar / 1024:>9.0f}K write={r.wchar / 1024:>9.0f}K"
+        if r.syscr is not None
+        else "io=n/a"
+    )
+    print(
+        f"{r.name:<40} wall={r.wall_s * 1000:>9.2f}ms "
+        f"per-item={per_item:>8.1f}us {io} peak={r.peak_bytes / 1024:>9.0f}K",
+        flush=True,
+    )
+
+
+def _save_baseline(path, results):
+    obj = {
+        "format": _BASELINE_FORMAT,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": {r.name: r._asdict() for r in results},
+    }
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=2, sort_keys=True)
+
+
+def _regressions(path, results, threshold):
+    # Returns a description of each metric which exceeds its baseline value by more
+    # than threshold, relatively, and by more than its noise floor, absolutely
+    with open(path) as f:
+        obj = json.load(f)
+    if obj.get("format") != _BASELINE_FORMAT:
+        raise ValueError(f"Unsupported baseline format: {path!r}")
+    baseline = obj["results"]
+    found = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base is None:
+            continue
+        for metric in _COMPARED_METRICS:
+            value, base_value = getattr(r, metric), base.get(metric)
+            if value is None or base_value is None:
+                continue
+            if (
+                value > base_value * (1 + threshold)
+                and value - base_value > _NOISE_FLOORS[metric]
+            ):
+                found.append(
+                    f"{r.name}: {metric} {value:.6g} exceeds baseline "
+                    f"{base_value:.6g} by {(value / base_value - 1) * 100:.0f}%"
+                    if base_value
+                    else f"{r.name}: {metric} {value:.6g} exceeds baseline 0"
+                )
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--quick", action="store_true", help="skip the 10k-file archetype"
+    )
+    parser.add_argument("--filter", help="only run cases matching this regex")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    pattern = re.compile(args.filter) if args.filter else None
+    results = []
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        suite = _Suite(tmp_dir, args.quick)
+        for name, dir_path in suite.archetypes():
+            if pattern and not any(pattern.search(f"{name}/{c}") for c in _CASES):
+                continue
+            for case_name, items, prepare in suite.cases(name, dir_path):
+                if pattern and not pattern.search(case_name):
+                    continue
+                result = _measure(case_name, items, prepare, args.repeat)
+                _print_result(result)
+                results.append(result)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    if args.save_baseline:
+        _save_baseline(args.save_baseline, results)
+        print(f"Saved baseline: {args.save_baseline}")
+    if args.baseline:
+        regressions = _regressions(args.baseline, results, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r}")
+        if regressions:
+            return 1
+        print(f"No regressions against baseline: {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+bench_directory_planning
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Compares the directory-creation syscalls made by building every file on its own,
+each with its own ``os.makedirs`` of the parent directory, against those made by
+:py:meth:`inception_tools.archetype_base.ArchetypeBase.build`, which plans the
+directories up front and creates each one once.  Run from the project root with:
+
+    python -m benchmarks.bench_directory_planning [--files N] [--dirs N]
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import argparse
+import datetime
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from inception_tools.archetype_base import ArchetypeBase
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.file_builder import FileBuilder
+
+_PARAMS = ArchetypeParameters(
+    "some_package_name", "some_author", "some_author_email", datetime.date(2000, 1, 1)
+)
+
+
+class _StaticFileBuilder(FileBuilder):
+    def __init__(self, subpath: str) -> None:
+        super().__init__()
+        self._subpath = subpath
+
+    def subpath(self, params: ArchetypeParameters) -> str:
+        return self._subpath
+
+    def render(self, params: ArchetypeParameters) -> str:
+        return ""
+
+
+@contextmanager
+def _count_syscalls():
+    # Counts the calls made to the os functions which os.makedirs reduces to:
+    # os.mkdir, and os.stat by way of os.path.exists.
+    counts = {"mkdir": 0, "stat": 0}
+    real_mkdir, real_stat = os.mkdir, os.stat
+
+    def mkdir(*args, **kwargs):
+        counts["mkdir"] += 1
+        return real_mkdir(*args, **kwargs)
+
+    def stat(*args, **kwargs):
+        counts["stat"] += 1
+        return real_stat(*args, **kwargs)
+
+    with mock.patch("os.mkdir", mkdir), mock.patch("os.stat", stat):
+        yield counts
+
+
+def _builders(file_count: int, dir_count: int):
+    return tuple(
+        _StaticFileBuilder(os.path.join(f"dir_{i % dir_count}", "src", f"file_{i}.py"))
+        for i in range(file_count)
+    )
+
+
+def _per_file(builders, root_dir):
+    for b in builders:
+        b.build(root_dir, _PARAMS)
+
+
+def _planned(builders, root_dir):
+    ArchetypeBase(builders, ()).build(root_dir, _PARAMS)
+
+
+def _run(name, fn, builders):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        root_dir = os.path.join(tmp_dir, "root")
+        start = time.perf_counter()
+        with _count_syscalls() as counts:
+            fn(builders, root_dir)
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(tmp_dir)
+    print(
+        f"{name:<22} mkdir={counts['mkdir']:>7} stat={counts['stat']:>7} "
+        f"wall={elapsed * 1000:>9.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--dirs", type=int, default=50)
+    args = parser.parse_args()
+
+    builders = _builders(args.files, args.dirs)
+    print(f"{args.files} files in {args.dirs * 2} directories")
+    _run("per-file makedirs", _per_file, builders)
+    _run("planned directories", _planned, builders)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,44 @@ __author__ = "Andrew van Herick"
 __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
 __license__ = "Apache Software License 2.0"
 
+import hashlib
+import os
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.build_observer import BuildObserver
+from inception_tools.build_report import BuildReport, WriteStatus
 from inception_tools.constants import UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+from inception_tools.file_builder import FileBuilder
+from inception_tools.output_sink import OutputSink
+from inception_tools.plan_record import PlanRecord, ResourceKind
+
+
+class _MemorySink(OutputSink):
+    # Collects the directories and rendered files of a build, in build order, for
+    # the default implementations of Archetype.iter_render and, with newlines
+    # translated as they would be written, Archetype.plan.
+
+    def __init__(self, translate_newlines: bool = False) -> None:
+        super().__init__()
+        self._translate_newlines = translate_newlines
+        self.entries: List[Tuple[str, Optional[bytes]]] = []
+
+    def add_root(self, root_dir: str) -> None:
+        pass
+
+    def add_directory(self, path: str) -> None:
+        self.entries.append((path, None))
+
+    def add_file(
+        self, path: str, builder: FileBuilder, params: ArchetypeParameters
+    ) -> str:
+        content = builder.render_bytes(params)
+        if self._translate_newlines:
+            content = b"".join(builder.translate_newlines((content,)))
+        self.entries.append((path, content))
+        return WriteStatus.CREATED
 
 
 class Archetype(ABC):
@@ -55,8 +88,84 @@ class Archetype(ABC):
         """
         raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
 
+    def plan(self, root_dir: str, params: ArchetypeParameters) -> Iterator[PlanRecord]:
+        """
+        Describes, without writing anything, each resource that :py:meth:`build`
+        would create.  The default implementation renders the project structure in
+        memory, like :py:meth:`iter_render`, with newlines translated as
+        :py:meth:`build` writes them (see :py:meth:`FileBuilder.translate_newlines`),
+        and describes each entry.
+
+        :param root_dir: the root directory of the project structure to be
+        created
+        :param params: the :py:class:`ArchetypeParameters` to use as context
+        for the project to be built
+        :return: an iterator over a :py:class:`PlanRecord` for each file and
+        directory, in the order in which :py:meth:`build` creates them
+        """
+        sink = _MemorySink(translate_newlines=True)
+        self.build(root_dir, params, sink=sink)
+        for path, content in sink.entries:
+            if content is None:
+                yield PlanRecord(
+                    path, ResourceKind.DIRECTORY, None, None, os.path.lexists(path)
+                )
+            else:
+                digest = hashlib.new(PlanRecord.DIGEST_ALGORITHM, content).hexdigest()
+                yield PlanRecord(
+                    path, ResourceKind.FILE, len(content), digest, os.path.lexists(path)
+                )
+
+    def iter_render(
+        self, root_dir: str, params: ArchetypeParameters
+    ) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """
+        Renders the project structure in memory, without any file system access.
+        The default implementation runs :py:meth:`build` into an in-memory
+        :py:class:`OutputSink`, so that the whole project is rendered before the
+        first entry is generated; subclasses, e.g.,
+        :py:class:`inception_tools.ArchetypeBase`, may generate entries one at a
+        time instead.
+
+        :param root_dir: the root directory of the project structure, used only to
+        determine the paths of the entries
+        :param params: the :py:class:`ArchetypeParameters` to use as context
+        for the project to be rendered
+        :return: an iterator over a ``(path, content)`` pair for each directory
+        under ``root_dir``, with a content of :py:const:`None`, followed by each
+        file, with its rendered content, in the order in which :py:meth:`build`
+        creates them
+        """
+        sink = _MemorySink()
+        self.build(root_dir, params, sink=sink)
+        return iter(sink.entries)
+
+    def render_to_mapping(
+        self, root_dir: str, params: ArchetypeParameters
+    ) -> Dict[str, Optional[bytes]]:
+        """
+        Renders the project structure in memory, without any file system access.
+        See :py:meth:`iter_render`.
+
+        :param root_dir: the root directory of the project structure, used only to
+        determine the paths of the entries
+        :param params: the :py:class:`ArchetypeParameters` to use as context
+        for the project to be rendered
+        :return: a ``dict`` mapping the path of each directory to :py:const:`None`
+        and the path of each file to its rendered content, in build order
+        """
+        return dict(self.iter_render(root_dir, params))
+
     @abstractmethod
-    def build(self, root_dir: str, params: ArchetypeParameters) -> None:
+    def build(
+        self,
+        root_dir: str,
+        params: ArchetypeParameters,
+        jobs: Optional[int] = None,
+        incremental: bool = False,
+        sink: Optional[OutputSink] = None,
+        observers: Optional[Iterable[BuildObserver]] = None,
+    ) -> BuildReport:
         """
         Builds the project structure for this instance.  See the class-level
         documentation of :py:class:`Archetype` for more information.
@@ -65,6 +174,14 @@ class Archetype(ABC):
         created
         :param params: the :py:class:`ArchetypeParameters` to use as context
         for the project to be built
-        :return: :py:const:`None`
+        :param jobs: the number of threads used to build the project structure
+        concurrently, or :py:const:`None` to build it serially
+        :param incremental: whether to leave existing files whose content is
+        identical to the rendered content untouched
+        :param sink: the :py:class:`OutputSink` receiving the directories and files,
+        or :py:const:`None` to save them under ``root_dir``
+        :param observers: :py:class:`BuildObserver` instances receiving the events of
+        this build, or :py:const:`None`
+        :return: a :py:class:`BuildReport` summarizing the files saved
         """
         raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
@@ -9,42 +9,345 @@ __author__ = "Andrew van Herick"
 __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
 __license__ = "Apache Software License 2.0"
 
-from typing import Iterable
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from inception_tools.archetype import Archetype
 from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.build_observer import (
+    BuildEvent,
+    BuildEventType,
+    BuildObserver,
+    BuildPhase,
+)
+from inception_tools.build_report import BuildReport, WriteStatus
 from inception_tools.directory_builder import DirectoryBuilder
 from inception_tools.file_builder import FileBuilder
+from inception_tools.output_sink import DirectorySink, OutputSink
+from inception_tools.plan_record import PlanRecord, ResourceKind
+
+
+def _run_concurrently(
+    executor: ThreadPoolExecutor,
+    tasks: Sequence[Callable[[], Any]],
+    schedule: Optional[Sequence[int]] = None,
+) -> List[Any]:
+    # Runs the tasks, submitting them in the order of the indices in ``schedule``,
+    # waits for them to complete and returns their results in the order of
+    # ``tasks``.  If a task fails, every task after it (in the order of ``tasks``)
+    # which hasn't started yet is cancelled, and the error of the first failed task
+    # is raised, just as if the tasks had run one after another.
+    schedule = range(len(tasks)) if schedule is None else schedule
+    futures = {i: executor.submit(tasks[i]) for i in schedule}
+    indices = {f: i for i, f in futures.items()}
+    first_failed = len(tasks)
+    pending = set(futures.values())
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_EXCEPTION)
+        for f in done:
+            if not f.cancelled() and f.exception() is not None:
+                first_failed = min(first_failed, indices[f])
+        for f in pending:
+            if indices[f] > first_failed:
+                f.cancel()
+    if first_failed < len(tasks):
+        raise futures[first_failed].exception()
+    return [futures[i].result() for i in range(len(tasks))]
+
+
+class _ResolvedPaths(namedtuple("_ResolvedPathsBase", ("files", "dirs"))):
+    # The paths of every resource built by an ArchetypeBase for a single root
+    # directory and set of parameters.  Each of the attributes is a tuple of
+    # (builder, path) pairs, in the order in which the builders are held.
+    __slots__ = ()
+
+
+def _plan_directories(root_dir: str, resolved: _ResolvedPaths) -> Tuple[str, ...]:
+    # Returns every directory under root_dir needed by the resolved resources: the
+    # parent of each file, each directory and all of their ancestors.  Each directory
+    # is listed once, ordered by depth, so that every parent precedes its children
+    # and each directory can be created with a single mkdir.
+    root = os.path.normpath(root_dir)
+    planned = set()
+
+    def add(d):
+        d = os.path.normpath(d)
+        while d not in planned and d != root and d != os.curdir:
+            planned.add(d)
+            parent = os.path.dirname(d)
+            if not parent or parent == d:
+                break
+            d = parent
+
+    for _, p in resolved.files:
+        add(os.path.dirname(p))
+    for _, p in resolved.dirs:
+        add(p)
+
+    return tuple(sorted(planned, key=lambda d: (d.count(os.sep), d)))
+
+
+class _TimedFileBuilder(FileBuilder):
+    # Delegates to a FileBuilder, recording the time spent rendering its content and
+    # the size of the content, so that an _ObservedBuild can tell rendering apart
+    # from writing whichever OutputSink is used.
+
+    def __init__(self, builder: FileBuilder) -> None:
+        self._builder = builder
+        self.render_s = 0.0
+        self.size = 0
+
+    def render_bytes(self, params: ArchetypeParameters) -> bytes:
+        start = time.perf_counter()
+        content = self._builder.render_bytes(params)
+        self.render_s += time.perf_counter() - start
+        self.size = len(content)
+        return content
+
+    def iter_render_bytes(self, params: ArchetypeParameters) -> Iterator[bytes]:
+        chunks = self._builder.iter_render_bytes(params)
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            self.render_s += time.perf_counter() - start
+            if chunk is None:
+                return
+            self.size += len(chunk)
+            yield chunk
+
+    @property
+    def TRANSLATE_NEWLINES(self) -> bool:
+        return self._builder.TRANSLATE_NEWLINES
+
+    @property
+    def WRITE_BUFFER_SIZE(self) -> int:
+        return self._builder.WRITE_BUFFER_SIZE
+
+    def build_at(
+        self, path: str, params: ArchetypeParameters, incremental: bool = False
+    ) -> str:
+        if type(self._builder).build_at is FileBuilder.build_at:
+            # Renders through this instance, so that rendering is timed apart from
+            # writing
+            return super().build_at(path, params, incremental)
+        # The builder writes its own way, e.g., copying within the kernel, so the
+        # whole call is timed as writing
+        status = self._builder.build_at(path, params, incremental)
+        if status != WriteStatus.UNCHANGED:
+            self.size = os.stat(path).st_size
+        return status
+
+    def size_hint(self) -> int:
+        return self._builder.size_hint()
+
+    def subpath(self, params: ArchetypeParameters) -> str:
+        return self._builder.subpath(params)
+
+    def render(self, params: ArchetypeParameters) -> str:
+        return self._builder.render(params)
+
+
+def _notify(observers: Sequence[BuildObserver], method: str, event: BuildEvent):
+    for o in observers:
+        getattr(o, method)(event)
+
+
+class _ObservedBuild(object):
+    # Stands in for an OutputSink in ArchetypeBase.build, timing each directory and
+    # file added to the sink and reporting them to the observers.  Only used when
+    # there are observers, so that unobserved builds don't pay for any of this.
+
+    def __init__(
+        self,
+        sink: OutputSink,
+        observers: Sequence[BuildObserver],
+        subpath_times: dict,
+    ) -> None:
+        self._sink = sink
+        self.THREAD_SAFE = sink.THREAD_SAFE
+        self._observers = observers
+        self._subpath_times = subpath_times
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def _resource_started(self, path, kind):
+        event = BuildEvent(BuildEventType.RESOURCE_START, path, kind, None, None, None)
+        _notify(self._observers, "resource_started", event)
+
+    def _resource_ended(self, path, kind, size, **phase_times):
+        phases = dict.fromkeys(BuildPhase.ALL, 0.0)
+        phases[BuildPhase.SUBPATH] = self._subpath_times.get(
+            os.path.normpath(path), 0.0
+        )
+        phases.update(phase_times)
+        event = BuildEvent(
+            BuildEventType.RESOURCE_END,
+            path,
+            kind,
+            sum(phases.values()),
+            size,
+            phases,
+        )
+        with self._lock:
+            self.size += size
+        _notify(self._observers, "resource_ended", event)
+
+    def add_directory(self, path: str) -> None:
+        self._resource_started(path, ResourceKind.DIRECTORY)
+        start = time.perf_counter()
+        self._sink.add_directory(path)
+        elapsed = time.perf_counter() - start
+        self._resource_ended(path, ResourceKind.DIRECTORY, 0, makedirs=elapsed)
+
+    def add_file(
+        self, path: str, builder: FileBuilder, params: ArchetypeParameters
+    ) -> str:
+        self._resource_started(path, ResourceKind.FILE)
+        timed = _TimedFileBuilder(builder)
+        start = time.perf_counter()
+        status = self._sink.add_file(path, timed, params)
+        elapsed = time.perf_counter() - start
+        size = 0 if status == WriteStatus.UNCHANGED else timed.size
+        self._resource_ended(
+            path,
+            ResourceKind.FILE,
+            size,
+            render=timed.render_s,
+            write=elapsed - timed.render_s,
+        )
+        return status
 
 
 class ArchetypeBase(Archetype):
     """
     A base implementation of :py:class:`Archetype` that provides basic
     implementations of :py:meth:`Archetype.build` and :py:meth:`Archetype.file_paths`.
+
+    The path of each resource is resolved once for a given root directory and set of
+    parameters, and shared by :py:meth:`file_paths`, :py:meth:`dir_paths`,
+    :py:meth:`plan` and :py:meth:`build`.
+
+    :py:class:`BuildObserver` instances registered with :py:meth:`add_observer`
+    receive the events of every build.
     """
 
     def __init__(
         self,
         file_builders: Iterable[FileBuilder],
         dir_builders: Iterable[DirectoryBuilder],
+        observers: Iterable[BuildObserver] = (),
     ) -> None:
         """
         Class initializer.
         :param file_builders: a set of
         :py:class:`inception_tools.ArchetypeResourceBuilder` instances used by
         :py:meth:`build` to create the project structure.
+        :param observers: the :py:class:`BuildObserver` instances initially
+        registered
         """
         super().__init__()
-        self._file_builders = file_builders
-        self._dir_builders = dir_builders
+        self._file_builders = tuple(file_builders)
+        self._dir_builders = tuple(dir_builders)
+        self._resolved = None
+        # Replaced rather than mutated, so that a build in progress keeps iterating
+        # over the observers it started with
+        self._observers = tuple(observers)
+
+    @property
+    def observers(self) -> Tuple[BuildObserver, ...]:
+        """
+        The :py:class:`BuildObserver` instances registered with this archetype.
+        """
+        return self._observers
+
+    def add_observer(self, observer: BuildObserver) -> None:
+        """
+        Registers an observer, which will receive the events of every subsequent
+        build.
+        :param observer: the :py:class:`BuildObserver`
+        :return: :py:const:`None`
+        """
+        self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer: BuildObserver) -> None:
+        """
+        Unregisters an observer registered with :py:meth:`add_observer`.
+        :param observer: the :py:class:`BuildObserver`
+        :return: :py:const:`None`
+        :raise ValueError: if the observer isn't registered
+        """
+        observers = list(self._observers)
+        observers.remove(observer)
+        self._observers = tuple(observers)
+
+    def _resolve(self, root_dir: str, params: ArchetypeParameters) -> _ResolvedPaths:
+        # Only the most recently resolved paths are kept: a build, preceded by any
+        # number of calls to file_paths, dir_paths or plan, uses a single set of
+        # root directory and parameters.
+        key = (root_dir, params)
+        resolved = self._resolved
+        if resolved is None or resolved[0] != key:
+            paths = _ResolvedPaths(
+                tuple((r, r.path(root_dir, params)) for r in self._file_builders),
+                tuple((r, r.path(root_dir, params)) for r in self._dir_builders),
+            )
+            resolved = self._resolved = (key, paths)
+        return resolved[1]
 
     def file_paths(self, root_path: str, params: ArchetypeParameters) -> Iterable[str]:
-        return tuple(r.path(root_path, params) for r in self._file_builders)
+        return tuple(p for _, p in self._resolve(root_path, params).files)
 
     def dir_paths(self, root_path: str, params: ArchetypeParameters) -> Iterable[str]:
-        return tuple(r.path(root_path, params) for r in self._dir_builders)
+        return tuple(p for _, p in self._resolve(root_path, params).dirs)
+
+    def plan(self, root_dir: str, params: ArchetypeParameters) -> Iterator[PlanRecord]:
+        resolved = self._resolve(root_dir, params)
+        for d in _plan_directories(root_dir, resolved):
+            yield PlanRecord(d, ResourceKind.DIRECTORY, None, None, os.path.lexists(d))
+        for r, p in resolved.files:
+            digest = hashlib.new(PlanRecord.DIGEST_ALGORITHM)
+            size = 0
+            # Measured as written, so that they match the files built
+            for chunk in r.translate_newlines(r.iter_render_bytes(params)):
+                digest.update(chunk)
+                size += len(chunk)
+            yield PlanRecord(
+                p, ResourceKind.FILE, size, digest.hexdigest(), os.path.lexists(p)
+            )
 
-    def build(self, root_dir: str, params: ArchetypeParameters) -> None:
+    def iter_render(
+        self, root_dir: str, params: ArchetypeParameters
+    ) -> Iterator[Tuple[str, Optional[bytes]]]:
+        resolved = self._resolve(root_dir, params)
+        for d in _plan_directories(root_dir, resolved):
+            yield d, None
+        for r, p in resolved.files:
+            yield p, r.render_bytes(params)
+
+    def build(
+        self,
+        root_dir: str,
+        params: ArchetypeParameters,
+        jobs: Optional[int] = None,
+        incremental: bool = False,
+        sink: Optional[OutputSink] = None,
+        observers: Optional[Iterable[BuildObserver]] = None,
+    ) -> BuildReport:
         """
         Builds the project structure using the :py:class:`FileBuilder` instances held
         by this instance.
@@ -52,9 +355,121 @@ class ArchetypeBase(Archetype):
         created
         :param params: the :py:class:`ArchetypeParameters` to use as context
         for the project to be built
-        :return: :py:const:`None`
+        :param jobs: the number of threads used to create directories and to render
+        and write files concurrently, or :py:const:`None` to build serially.  Sinks
+        which aren't :py:attr:`OutputSink.THREAD_SAFE` are always built serially.
+        :param incremental: whether to leave existing files whose content is
+        identical to the rendered content untouched (see
+        :py:meth:`FileBuilder.build_at`); only used when ``sink`` is
+        :py:const:`None`
+        :param sink: the :py:class:`OutputSink` receiving the directories and files,
+        or :py:const:`None` to save them under ``root_dir`` using a
+        :py:class:`DirectorySink`.  The sink is not closed by this method.
+        :param observers: :py:class:`BuildObserver` instances receiving the events of
+        this build, in addition to those registered with :py:meth:`add_observer`.
+        When there are none, no event is created at all.
+        :return: a :py:class:`BuildReport` summarizing the files saved
         """
-        for r in self._file_builders:
-            r.build(root_dir, params)
-        for r in self._dir_builders:
-            r.build(root_dir, params)
+        if sink is None:
+            sink = DirectorySink(incremental)
+        if observers is not None:
+            observers = self._observers + tuple(observers)
+        else:
+            observers = self._observers
+        if observers:
+            return self._build_observed(root_dir, params, jobs, sink, observers)
+        resolved = self._resolve(root_dir, params)
+        dirs = _plan_directories(root_dir, resolved)
+        sink.add_root(root_dir)
+        return self._build_resolved(resolved, dirs, params, jobs, sink)
+
+    def _build_observed(
+        self,
+        root_dir: str,
+        params: ArchetypeParameters,
+        jobs: Optional[int],
+        sink: OutputSink,
+        observers: Sequence[BuildObserver],
+    ) -> BuildReport:
+        # Paths are resolved anew, rather than taken from the memo, so that the time
+        # spent in each builder's subpath is reported.
+        build_start = time.perf_counter()
+        subpath_times = {}
+
+        def resolve(builders):
+            pairs = []
+            for r in builders:
+                start = time.perf_counter()
+                p = r.path(root_dir, params)
+                subpath_times[os.path.normpath(p)] = time.perf_counter() - start
+                pairs.append((r, p))
+            return tuple(pairs)
+
+        resolved = _ResolvedPaths(
+            resolve(self._file_builders), resolve(self._dir_builders)
+        )
+        self._resolved = ((root_dir, params), resolved)
+        dirs = _plan_directories(root_dir, resolved)
+
+        event = BuildEvent(BuildEventType.BUILD_START, root_dir, None, None, None, None)
+        _notify(observers, "build_started", event)
+        observed = _ObservedBuild(sink, observers, subpath_times)
+        sink.add_root(root_dir)
+        report = self._build_resolved(resolved, dirs, params, jobs, observed)
+        event = BuildEvent(
+            BuildEventType.BUILD_END,
+            root_dir,
+            None,
+            time.perf_counter() - build_start,
+            observed.size,
+            None,
+        )
+        _notify(observers, "build_ended", event)
+        return report
+
+    @classmethod
+    def _build_resolved(
+        cls,
+        resolved: _ResolvedPaths,
+        dirs: Sequence[str],
+        params: ArchetypeParameters,
+        jobs: Optional[int],
+        sink: Union[OutputSink, _ObservedBuild],
+    ) -> BuildReport:
+        if jobs is not None and jobs > 1 and sink.THREAD_SAFE:
+            statuses = cls._build_concurrently(resolved, dirs, params, jobs, sink)
+        else:
+            for d in dirs:
+                sink.add_directory(d)
+            statuses = [sink.add_file(p, r, params) for r, p in resolved.files]
+        return BuildReport.from_statuses(statuses)
+
+    @classmethod
+    def _build_concurrently(
+        cls,
+        resolved: _ResolvedPaths,
+        dirs: Sequence[str],
+        params: ArchetypeParameters,
+        jobs: int,
+        sink: Union[OutputSink, _ObservedBuild],
+    ) -> List[str]:
+        # Every directory is created before any file is written.  Directories are
+        # created one depth level at a time, so that parents always precede their
+        # children, and files are then scheduled largest first, so that the longest
+        # writes don't end up at the tail of the build.
+        levels = {}
+        for d in dirs:
+            levels.setdefault(d.count(os.sep), []).append(
+                lambda d=d: sink.add_directory(d)
+            )
+
+        files = resolved.files
+        file_tasks = [lambda r=r, p=p: sink.add_file(p, r, params) for r, p in files]
+        schedule = sorted(
+            range(len(files)), key=lambda i: files[i][0].size_hint(), reverse=True
+        )
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for depth in sorted(levels):
+                _run_concurrently(executor, levels[depth])
+            return _run_concurrently(executor, file_tasks, schedule)
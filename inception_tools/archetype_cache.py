@@ -0,0 +1,274 @@
+"""
+archetype_cache
+~~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`ArchetypeCache` along with supporting classes,
+functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import hashlib
+import io
+import logging
+import marshal
+import os
+import tempfile
+import threading
+from typing import Optional, Tuple
+
+from inception_tools.archetype_descriptor import ArchetypeDescriptor
+from inception_tools.archetype_metadata import ArchetypeMetadata
+from inception_tools.archetype_source import (
+    ArchetypeSource,
+    DESCRIPTOR_FILE_NAME,
+    ENCODING,
+    METADATA_FILE_NAME,
+)
+from inception_tools.json_serializable import JsonSerializationError
+from inception_tools.template_cache import default_cache_dir, prune_cache_entries
+
+VERIFY_CONTENT_ENV_VAR = "INCEPTION_TOOLS_CACHE_VERIFY_CONTENT"
+"""
+The name of the environment variable that, when set to a non-empty value, makes the
+:py:func:`default_archetype_cache` verify cache entries by content hash.
+"""
+
+_FORMAT = 1
+
+_DIGEST_ALGORITHM = "sha256"
+
+
+def _logger() -> logging.Logger:
+    return logging.getLogger(__name__)
+
+
+def _digest(text: str) -> str:
+    return hashlib.new(_DIGEST_ALGORITHM, text.encode(ENCODING)).hexdigest()
+
+
+class ArchetypeCache(object):
+    """
+    A persistent, on-disk cache of parsed archetype metadata and descriptors, with
+    one entry per archetype location.  Loading an archetype found in the cache skips
+    reading, parsing and validating its :py:const:`METADATA_FILE_NAME` and
+    :py:const:`DESCRIPTOR_FILE_NAME` files, at the cost of reading the single cache
+    entry.
+
+    An entry is used only while the :py:meth:`ArchetypeSource.signature` (e.g., the
+    modification time and size) of both files is unchanged.  When
+    ``verify_content`` is set, the files are also read and their SHA-256 digests
+    compared with those recorded in the entry, which still saves parsing and
+    validating them.  Sources which can't provide signatures, such as
+    :py:class:`PackageSource`, are never cached.
+
+    At most about :py:attr:`MAX_ENTRIES` entries are kept: the least recently
+    stored entries are removed as new ones are added, so that entries for
+    archetypes which have been moved or deleted don't accumulate.
+
+    Like :py:class:`TemplateCache`, failures to read or write entries are never
+    fatal: a missing or corrupt entry is treated as a miss.
+    """
+
+    CACHE_FILE_SUFFIX = ".archetype"
+    """
+    The file name suffix of the cache entries stored by this class.
+    """
+
+    MAX_ENTRIES = 256
+    """
+    The number of entries kept by the cache.  Entries are pruned when the first
+    entry is stored by an instance, and then every :py:attr:`PRUNE_INTERVAL`
+    entries, so that the cache may briefly hold up to :py:attr:`PRUNE_INTERVAL`
+    more.
+    """
+
+    PRUNE_INTERVAL = 32
+    """
+    The number of entries stored by an instance between two prunings of the cache.
+    """
+
+    _FILE_NAMES = (METADATA_FILE_NAME, DESCRIPTOR_FILE_NAME)
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, verify_content: bool = False
+    ) -> None:
+        """
+        Initializes a new :py:class:`ArchetypeCache` instance.
+        :param cache_dir: the root directory under which entries are stored, or
+        :py:const:`None` to use :py:func:`default_cache_dir`
+        :param verify_content: whether to also compare the digests of the files with
+        those recorded in an entry before using it
+        """
+        super().__init__()
+        self._dir = os.path.join(cache_dir or default_cache_dir(), "archetypes")
+        self._verify_content = verify_content
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    @property
+    def dir_path(self) -> str:
+        """
+        The directory in which this instance stores its entries.
+        """
+        return self._dir
+
+    @property
+    def verify_content(self) -> bool:
+        """
+        Whether entries are only used once the digests of the files match those
+        recorded in the entry.
+        """
+        return self._verify_content
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of archetypes that have been loaded from the cache by this
+        instance.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        The number of archetypes that have been parsed by this instance.
+        """
+        return self._misses
+
+    def load(
+        self, source: ArchetypeSource
+    ) -> Tuple[ArchetypeMetadata, ArchetypeDescriptor]:
+        """
+        Returns the metadata and descriptor of an archetype, from the cache when its
+        entry is still valid and parsed (and added to the cache) otherwise.
+        :param source: the :py:class:`ArchetypeSource` of the archetype
+        :return: the :py:class:`ArchetypeMetadata` and
+        :py:class:`ArchetypeDescriptor`
+        :raise JsonSerializationError: if either file is invalid
+        """
+        signatures = tuple(source.signature(n) for n in self._FILE_NAMES)
+        if None in signatures:
+            return self._parse(source, self._read(source))
+
+        key = self.key(source.location)
+        entry = self._load_entry(key)
+        texts = None
+        if entry is not None and self._matches(entry, source.location, signatures):
+            if self._verify_content:
+                texts = self._read(source)
+                digests = tuple(_digest(t) for t in texts)
+            if not self._verify_content or digests == entry["digests"]:
+                try:
+                    result = (
+                        ArchetypeMetadata.from_json(entry["metadata"], validate=False),
+                        ArchetypeDescriptor.from_json(
+                            entry["descriptor"], validate=False
+                        ),
+                    )
+                except (JsonSerializationError, KeyError, TypeError):
+                    _logger().debug(f"Ignoring corrupt archetype cache entry: {key!r}")
+                else:
+                    with self._lock:
+                        self._hits += 1
+                    return result
+
+        texts = texts or self._read(source)
+        metadata, descriptor = self._parse(source, texts)
+        self._store_entry(
+            key,
+            {
+                "format": _FORMAT,
+                "location": source.location,
+                "signatures": signatures,
+                "digests": tuple(_digest(t) for t in texts),
+                "metadata": metadata.to_json(),
+                "descriptor": descriptor.to_json(),
+            },
+        )
+        return metadata, descriptor
+
+    def key(self, location: str) -> str:
+        """
+        Returns the key under which the entry for an archetype location is stored.
+        """
+        return hashlib.sha256(location.encode(ENCODING)).hexdigest()
+
+    @staticmethod
+    def _matches(entry, location: str, signatures: Tuple) -> bool:
+        return (
+            isinstance(entry, dict)
+            and entry.get("format") == _FORMAT
+            and entry.get("location") == location
+            and entry.get("signatures") == signatures
+        )
+
+    def _read(self, source: ArchetypeSource) -> Tuple[str, ...]:
+        return tuple(source.read_text(n) for n in self._FILE_NAMES)
+
+    def _parse(
+        self, source: ArchetypeSource, texts: Tuple[str, ...]
+    ) -> Tuple[ArchetypeMetadata, ArchetypeDescriptor]:
+        metadata_text, descriptor_text = texts
+        metadata = ArchetypeMetadata.from_text_io(io.StringIO(metadata_text))
+        descriptor = ArchetypeDescriptor.from_text_io(io.StringIO(descriptor_text))
+        with self._lock:
+            self._misses += 1
+        return metadata, descriptor
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._dir, key + self.CACHE_FILE_SUFFIX)
+
+    def _load_entry(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                return marshal.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError):
+            _logger().debug(f"Ignoring unreadable archetype cache entry: {key!r}")
+            return None
+
+    def _store_entry(self, key: str, entry: dict) -> None:
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    marshal.dump(entry, f)
+                os.replace(tmp_path, self._entry_path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, ValueError):
+            _logger().debug(f"Could not write archetype cache entry: {key!r}")
+            return
+        with self._lock:
+            prune = self._stores % self.PRUNE_INTERVAL == 0
+            self._stores += 1
+        if prune:
+            prune_cache_entries(self._dir, self.CACHE_FILE_SUFFIX, self.MAX_ENTRIES)
+
+
+_default_archetype_cache = None
+_default_archetype_cache_lock = threading.Lock()
+
+
+def default_archetype_cache() -> ArchetypeCache:
+    """
+    Returns the process-wide :py:class:`ArchetypeCache`, rooted at
+    :py:func:`default_cache_dir`, used by :py:class:`TemplateArchetype` instances
+    which aren't given a cache of their own.  It verifies entries by content hash
+    when the :py:const:`VERIFY_CONTENT_ENV_VAR` environment variable is set.
+    """
+    global _default_archetype_cache
+    if _default_archetype_cache is None:
+        with _default_archetype_cache_lock:
+            if _default_archetype_cache is None:
+                verify_content = bool(os.environ.get(VERIFY_CONTENT_ENV_VAR))
+                _default_archetype_cache = ArchetypeCache(None, verify_content)
+    return _default_archetype_cache
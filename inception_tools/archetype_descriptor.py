@@ -11,24 +11,41 @@ __license__ = "Apache Software License 2.0"
 
 from collections import namedtuple
 
-from jsonschema import validate, ValidationError
-
-from inception_tools.json_serializable import (
-    JSON_OBJ_TYPE,
-    JsonSerializable,
-    JsonSerializationError,
-)
+from inception_tools.json_serializable import JSON_OBJ_TYPE, JsonSerializable
 
 
 class _JsonKey(object):
     DIRECTORIES = "directories"
     FILES = "files"
+    KIND = "kind"
     PROTOTYPE = "prototype"
     SUBPATH = "subpath"
 
 
+class FileKind(object):
+    """
+    Enumerates the kinds of file described by a :py:class:`FileDescriptor`.
+    """
+
+    TEMPLATE = "template"
+    """
+    The prototype is a :py:class:`jinja2.Template` rendered with the archetype
+    parameters.
+    """
+
+    VERBATIM = "verbatim"
+    """
+    The prototype is copied as is, without being decoded or rendered, e.g., for
+    images or other binary assets.
+    """
+
+    ALL = (TEMPLATE, VERBATIM)
+
+
 DirectoryDescriptor = namedtuple("DirectoryDescriptor", ("subpath",))
-FileDescriptor = namedtuple("FileDescriptor", ("subpath", "prototype"))
+FileDescriptor = namedtuple(
+    "FileDescriptor", ("subpath", "prototype", "kind"), defaults=(FileKind.TEMPLATE,)
+)
 
 
 class ArchetypeDescriptor(
@@ -63,6 +80,7 @@ class ArchetypeDescriptor(
                 "properties": {
                     "subpath": {"type": "string"},
                     "prototype": {"type": "string"},
+                    "kind": {"type": "string", "enum": list(FileKind.ALL)},
                 },
             },
         },
@@ -75,7 +93,7 @@ class ArchetypeDescriptor(
     """
 
     @classmethod
-    def from_json(cls, json_obj: JSON_OBJ_TYPE):
+    def from_json(cls, json_obj: JSON_OBJ_TYPE, validate: bool = True):
         """
         Creates a new :py:class:`ArchetypeDescriptor` from a JSON-like Python object
         of the form:
@@ -95,17 +113,23 @@ class ArchetypeDescriptor(
                 'files': [
                     {
                         'subpath': <subpath-jinja2-template-string>,
-                        'prototype': <subpath-jinja2-template-string>
+                        'prototype': <subpath-jinja2-template-string>,
+                        'kind': <optional-file-kind>
                     },
                     ...
                     {
                         'subpath': <subpath-jinja2-template-string>,
-                        'prototype': <subpath-jinja2-template-string>
+                        'prototype': <subpath-jinja2-template-string>,
+                        'kind': <optional-file-kind>
                     }
                 ]
             }
+
+        where ``kind`` is one of the :py:class:`FileKind` values, and defaults to
+        :py:attr:`FileKind.TEMPLATE`.
         """
-        cls._validate_json(json_obj)
+        if validate:
+            cls.validate_json(json_obj)
 
         if isinstance(json_obj, dict):
 
@@ -115,10 +139,7 @@ class ArchetypeDescriptor(
             )
 
             f_json = json_obj[_JsonKey.FILES]
-            file_descriptors = tuple(
-                FileDescriptor(j[_JsonKey.SUBPATH], j[_JsonKey.PROTOTYPE])
-                for j in f_json
-            )
+            file_descriptors = tuple(cls._file_from_json(j) for j in f_json)
 
             return cls(file_descriptors, dir_descriptors)
 
@@ -127,12 +148,18 @@ class ArchetypeDescriptor(
         )
 
     @classmethod
-    def _validate_json(cls, json_obj: JSON_OBJ_TYPE):
-        try:
-            validate(json_obj, cls.JSON_SCHEMA)
-        except ValidationError as e:
-            to_raise = JsonSerializationError(f"Invalid JSON format: {json_obj}")
-            raise to_raise from e
+    def _file_from_json(cls, j: dict) -> FileDescriptor:
+        kind = j.get(_JsonKey.KIND, FileKind.TEMPLATE)
+        return FileDescriptor(j[_JsonKey.SUBPATH], j[_JsonKey.PROTOTYPE], kind)
+
+    @classmethod
+    def _file_to_json(cls, f: FileDescriptor) -> dict:
+        # noinspection PyProtectedMember
+        j = f._asdict()
+        # Omitted, so that template-only descriptors keep their former form
+        if f.kind == FileKind.TEMPLATE:
+            del j[_JsonKey.KIND]
+        return j
 
     def to_json(self) -> JSON_OBJ_TYPE:
         """
@@ -153,20 +180,24 @@ class ArchetypeDescriptor(
                 'files': [
                     {
                         'subpath': <subpath-jinja2-template-string>,
-                        'prototype': <subpath-jinja2-template-string>
+                        'prototype': <subpath-jinja2-template-string>,
+                        'kind': <optional-file-kind>
                     },
                     ...
                     {
                         'subpath': <subpath-jinja2-template-string>,
-                        'prototype': <subpath-jinja2-template-string>
+                        'prototype': <subpath-jinja2-template-string>,
+                        'kind': <optional-file-kind>
                     }
                 ]
             }
+
+        where ``kind`` is omitted for :py:attr:`FileKind.TEMPLATE` files.
         """
         # Suppressing protected member inspection because NamedTuple
         # documentation has _asdict as part of its API
         # noinspection PyProtectedMember
         return {
             _JsonKey.DIRECTORIES: [d._asdict() for d in self.directories],
-            _JsonKey.FILES: [d._asdict() for d in self.files],
+            _JsonKey.FILES: [self._file_to_json(f) for f in self.files],
         }
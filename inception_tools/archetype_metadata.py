@@ -11,12 +11,9 @@ __license__ = "Apache Software License 2.0"
 
 from collections import namedtuple
 
-from jsonschema import validate, ValidationError
-
 from inception_tools.json_serializable import (
     JSON_OBJ_TYPE,
     JsonSerializable,
-    JsonSerializationError,
 )
 
 
@@ -61,15 +58,7 @@ class ArchetypeMetadata(
     """
 
     @classmethod
-    def _validate_json(cls, json_obj: JSON_OBJ_TYPE) -> None:
-        try:
-            validate(json_obj, cls.JSON_SCHEMA)
-        except ValidationError as e:
-            to_raise = JsonSerializationError(f"Invalid JSON format: {json_obj}")
-            raise to_raise from e
-
-    @classmethod
-    def from_json(cls, json_obj: JSON_OBJ_TYPE):
+    def from_json(cls, json_obj: JSON_OBJ_TYPE, validate: bool = True):
         """
         Creates a new :py:class:`ArchetypeMetadata` from a JSON-like Python object of
         the form:
@@ -82,7 +71,8 @@ class ArchetypeMetadata(
                 'version_id': <version-id-string>,
             }
         """
-        cls._validate_json(json_obj)
+        if validate:
+            cls.validate_json(json_obj)
 
         if isinstance(json_obj, dict):
             return ArchetypeMetadata(
@@ -108,5 +98,5 @@ class ArchetypeMetadata(
             }
         """
         json_obj = self._asdict()
-        self._validate_json(json_obj)
+        self.validate_json(json_obj)
         return json_obj
@@ -10,6 +10,8 @@ __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Re
 __license__ = "Apache Software License 2.0"
 
 from collections import namedtuple
+from types import MappingProxyType
+from typing import Any, Mapping
 
 
 class ArchetypeParameters(
@@ -29,10 +31,16 @@ class ArchetypeParameters(
     :ivar str date: the inception date of the project
     """
 
-    def as_dict(self) -> dict:
+    def as_dict(self) -> Mapping[str, Any]:
         """
-        Returns a dictionary representation of this instance, wherein each named
-        attribute is a key in the dictionary returned.
+        Returns a read-only dictionary representation of this instance, wherein each
+        named attribute is a key in the dictionary returned.  The dictionary is
+        created the first time this method is called and the same dictionary is
+        returned by every subsequent call.
         :return: the dictionary representing this instance
         """
-        return self._asdict()
+        try:
+            return self.__dict__["_as_dict"]
+        except KeyError:
+            d = self.__dict__["_as_dict"] = MappingProxyType(self._asdict())
+            return d
@@ -0,0 +1,369 @@
+"""
+archetype_registry
+~~~~~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`ArchetypeRegistry` along with supporting
+classes, functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pkg_resources
+
+from inception_tools.archetype_metadata import ArchetypeMetadata
+from inception_tools.archetype_source import DirectorySource, ZipSource
+from inception_tools.json_serializable import JsonSerializationError
+from inception_tools.standard_archetype import ARCHETYPE_DIR
+from inception_tools.template_archetype import TemplateArchetype
+from inception_tools.template_cache import TemplateCache, default_cache_dir
+
+SEARCH_PATH_ENV_VAR = "INCEPTION_TOOLS_ARCHETYPE_PATH"
+"""
+The name of the environment variable listing, separated by :py:data:`os.pathsep`,
+additional directories searched by :py:class:`ArchetypeRegistry`.
+"""
+
+ENTRY_POINT_GROUP = "inception_tools.archetypes"
+"""
+The entry point group through which installed distributions provide archetypes.  Each
+entry point must resolve to the path of an archetype directory or zip archive, or of
+a directory containing them, or to an iterable of such paths.
+"""
+
+INDEX_FILE_NAME = "archetype-index.json"
+
+ARCHIVE_SUFFIXES = (".zip", ".whl")
+"""
+The file name extensions of the zip archives searched for archetypes.
+"""
+
+_INDEX_FORMAT = 2
+
+_VERSION_SEPARATORS = re.compile(r"[.\-_+]")
+
+
+def _logger() -> logging.Logger:
+    return logging.getLogger(__name__)
+
+
+def version_key(version_id: str) -> Tuple:
+    """
+    Returns a key ordering version identifiers by their components, separated by any
+    of ``.-_+``, comparing numeric components as numbers, so that ``'1.10'`` follows
+    ``'1.9'``.  Non-numeric components sort before numeric ones.
+    """
+    return tuple(
+        (1, int(p), "") if p.isdigit() else (0, 0, p)
+        for p in _VERSION_SEPARATORS.split(version_id)
+    )
+
+
+def default_search_paths() -> Tuple[str, ...]:
+    """
+    Returns the directories searched by an :py:class:`ArchetypeRegistry` created
+    without explicit search paths: the directory of the standard archetypes, followed
+    by each directory listed in the :py:const:`SEARCH_PATH_ENV_VAR` environment
+    variable.
+    """
+    env_paths = os.environ.get(SEARCH_PATH_ENV_VAR, "")
+    return (ARCHETYPE_DIR,) + tuple(p for p in env_paths.split(os.pathsep) if p)
+
+
+class RegisteredArchetype(
+    namedtuple("RegisteredArchetypeBase", ("metadata", "location"))
+):
+    """
+    An archetype found by an :py:class:`ArchetypeRegistry`.
+
+    Instances of this class are immutable.
+
+    :ivar ArchetypeMetadata metadata: the metadata of the archetype
+    :ivar str location: the absolute path to the archetype directory, or its
+    location within a zip archive (see :py:func:`open_archetype_source`)
+    """
+
+    # Make instances of this class immutable
+    __slots__ = ()
+
+    def load(self, template_cache: Optional[TemplateCache] = None):
+        """
+        Loads the archetype.
+        :param template_cache: the :py:class:`TemplateCache` used to compile the
+        archetype's templates, or :py:const:`None` to use the default cache
+        :return: the :py:class:`TemplateArchetype`
+        """
+        return TemplateArchetype(self.location, template_cache)
+
+
+class ArchetypeRegistry(object):
+    """
+    Discovers archetypes and resolves them by their :py:class:`ArchetypeMetadata`.
+    Archetypes are found under the configured search paths, and those provided
+    through the :py:const:`ENTRY_POINT_GROUP` entry points.  Each path may either be
+    an archetype directory or zip archive itself, or contain archetype directories
+    and zip archives (with one of the :py:const:`ARCHIVE_SUFFIXES`), each of which
+    may hold several archetypes.  Where several archetypes share the same group,
+    archetype and version identifiers, the first one found wins.
+
+    The metadata of every archetype found is kept in a small on-disk index, along
+    with the modification time and size of its metadata file, or of its archive.
+    Listing and resolving archetypes only reads metadata when it has changed since it
+    was indexed, and never reads any descriptor or prototype file.  The index only
+    keeps the archetypes under the search paths of the registry which last wrote it.
+    """
+
+    def __init__(
+        self,
+        search_paths: Optional[Iterable[str]] = None,
+        use_entry_points: bool = True,
+        index_path: Optional[str] = None,
+    ) -> None:
+        """
+        Initializes a new :py:class:`ArchetypeRegistry` instance.
+        :param search_paths: the directories searched for archetypes, or
+        :py:const:`None` to use :py:func:`default_search_paths`
+        :param use_entry_points: whether to also search the paths provided through
+        the :py:const:`ENTRY_POINT_GROUP` entry points
+        :param index_path: the path to the index file, or :py:const:`None` to use
+        :py:const:`INDEX_FILE_NAME` under :py:func:`default_cache_dir`
+        """
+        super().__init__()
+        self._search_paths = tuple(
+            default_search_paths() if search_paths is None else search_paths
+        )
+        self._use_entry_points = use_entry_points
+        self._index_path = index_path or os.path.join(
+            default_cache_dir(), INDEX_FILE_NAME
+        )
+        self._archetypes = None
+
+    @property
+    def index_path(self) -> str:
+        return self._index_path
+
+    def archetypes(self) -> Tuple[RegisteredArchetype, ...]:
+        """
+        Returns every archetype found, ordered by group, archetype and version
+        identifier.  Archetypes are discovered the first time this method is called
+        and the result kept thereafter; see :py:meth:`refresh`.
+        """
+        if self._archetypes is None:
+            self._archetypes = self._discover()
+        return self._archetypes
+
+    def refresh(self) -> None:
+        """
+        Discards the archetypes found so far, so that they are discovered again.
+        """
+        self._archetypes = None
+
+    def versions(
+        self, archetype_id: str, group_id: Optional[str] = None
+    ) -> Tuple[RegisteredArchetype, ...]:
+        """
+        Returns every version of an archetype, oldest first.
+        :param archetype_id: the archetype identifier
+        :param group_id: the group identifier, or :py:const:`None` to match any group
+        :return: the matching archetypes
+        """
+        matches = (
+            a
+            for a in self.archetypes()
+            if a.metadata.archetype_id == archetype_id
+            and (group_id is None or a.metadata.group_id == group_id)
+        )
+        return tuple(sorted(matches, key=lambda a: version_key(a.metadata.version_id)))
+
+    def resolve(
+        self,
+        archetype_id: str,
+        version_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+    ) -> RegisteredArchetype:
+        """
+        Returns the archetype with the given identifiers.
+        :param archetype_id: the archetype identifier
+        :param version_id: the version identifier, or :py:const:`None` for the latest
+        version
+        :param group_id: the group identifier, or :py:const:`None` to match any group
+        :return: the matching archetype
+        :raise KeyError: if no archetype matches
+        """
+        versions = self.versions(archetype_id, group_id)
+        if version_id is not None:
+            versions = tuple(a for a in versions if a.metadata.version_id == version_id)
+        if not versions:
+            raise KeyError(
+                f"No archetype found: group_id={group_id!r}, "
+                f"archetype_id={archetype_id!r}, version_id={version_id!r}"
+            )
+        return versions[-1]
+
+    def latest(
+        self, archetype_id: str, group_id: Optional[str] = None
+    ) -> RegisteredArchetype:
+        """
+        Returns the latest version of an archetype, as ordered by
+        :py:func:`version_key`.
+        :raise KeyError: if no archetype matches
+        """
+        return self.resolve(archetype_id, None, group_id)
+
+    def _roots(self) -> List[str]:
+        roots = list(self._search_paths)
+        if self._use_entry_points:
+            for ep in pkg_resources.iter_entry_points(ENTRY_POINT_GROUP):
+                try:
+                    value = ep.load()
+                except Exception:
+                    _logger().exception(f"Could not load entry point: {ep}")
+                    continue
+                roots.extend((value,) if isinstance(value, str) else value)
+        return roots
+
+    @staticmethod
+    def _candidates(root: str) -> List[str]:
+        # Returns the archetype directories and archives under root.  Directories
+        # without a metadata file are skipped by _indexed.
+        if os.path.isfile(root) or os.path.isfile(
+            os.path.join(root, TemplateArchetype.METADATA_FILE_NAME)
+        ):
+            return [root]
+        try:
+            entries = sorted(os.scandir(root), key=lambda e: e.name)
+        except OSError:
+            return []
+        return [
+            e.path
+            for e in entries
+            if e.is_dir() or e.name.lower().endswith(ARCHIVE_SUFFIXES)
+        ]
+
+    def _discover(self) -> Tuple[RegisteredArchetype, ...]:
+        index = self._load_index()
+        changed = False
+        found: Dict[ArchetypeMetadata, RegisteredArchetype] = {}
+        searched = set()
+        for root in self._roots():
+            for path in self._candidates(os.path.abspath(root)):
+                searched.add(path)
+                archetypes, entry_changed = self._indexed(index, path)
+                changed = changed or entry_changed
+                for a in archetypes:
+                    found.setdefault(a.metadata, a)
+        # Entries for paths no longer under any search path are dropped, so that
+        # the index doesn't grow as archetypes are moved or removed
+        for path in set(index) - searched:
+            del index[path]
+            changed = True
+        if changed:
+            self._store_index(index)
+        return tuple(
+            sorted(
+                found.values(),
+                key=lambda a: (
+                    a.metadata.group_id,
+                    a.metadata.archetype_id,
+                    version_key(a.metadata.version_id),
+                ),
+            )
+        )
+
+    @staticmethod
+    def _read(path: str) -> List[RegisteredArchetype]:
+        # Reads the metadata of the archetype in a directory, or of every archetype
+        # in an archive
+        if not os.path.isfile(path):
+            sources = [DirectorySource(path)]
+        else:
+            sources = [ZipSource(path, p) for p in ZipSource.archetype_prefixes(path)]
+        result = []
+        for source in sources:
+            with source:
+                text = source.read_text(TemplateArchetype.METADATA_FILE_NAME)
+            metadata = ArchetypeMetadata.from_text_io(io.StringIO(text))
+            result.append(RegisteredArchetype(metadata, source.location))
+        return result
+
+    @classmethod
+    def _indexed(cls, index: dict, path: str) -> Tuple[List[RegisteredArchetype], bool]:
+        # Returns the archetypes in the directory or archive at path, from the index
+        # if the archive, or the directory's metadata file, hasn't changed since it
+        # was indexed, along with whether the index was updated.
+        if os.path.isfile(path):
+            stat_path = path
+        else:
+            stat_path = os.path.join(path, TemplateArchetype.METADATA_FILE_NAME)
+        try:
+            st = os.stat(stat_path)
+        except OSError:
+            return [], index.pop(path, None) is not None
+        entry = index.get(path)
+        if (
+            entry is not None
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("size") == st.st_size
+        ):
+            # The index only holds metadata which was validated when it was read
+            try:
+                return [
+                    RegisteredArchetype(
+                        ArchetypeMetadata.from_json(a["metadata"], validate=False),
+                        a["location"],
+                    )
+                    for a in entry["archetypes"]
+                ], False
+            except (JsonSerializationError, KeyError, TypeError):
+                pass
+        try:
+            archetypes = cls._read(path)
+        except (OSError, ValueError, KeyError, JsonSerializationError):
+            _logger().warning(f"Could not read archetype metadata: {path!r}")
+            return [], index.pop(path, None) is not None
+        index[path] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "archetypes": [
+                {"location": a.location, "metadata": a.metadata.to_json()}
+                for a in archetypes
+            ],
+        }
+        return archetypes, True
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path) as f:
+                obj = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(obj, dict) or obj.get("format") != _INDEX_FORMAT:
+            return {}
+        archetypes = obj.get("archetypes")
+        return archetypes if isinstance(archetypes, dict) else {}
+
+    def _store_index(self, index: dict) -> None:
+        obj = {"format": _INDEX_FORMAT, "archetypes": index}
+        index_dir = os.path.dirname(self._index_path) or os.curdir
+        try:
+            os.makedirs(index_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=index_dir)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(obj, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self._index_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            _logger().debug(f"Could not write archetype index: {self._index_path!r}")
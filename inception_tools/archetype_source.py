@@ -0,0 +1,324 @@
+"""
+archetype_source
+~~~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`ArchetypeSource` and its implementations,
+:py:class:`DirectorySource`, :py:class:`ZipSource` and :py:class:`PackageSource`,
+along with supporting classes, functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import io
+import os
+import posixpath
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional, Tuple
+
+import pkg_resources
+
+from inception_tools.constants import UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+METADATA_FILE_NAME = "archetype-metadata.json"
+"""
+The name of the member identifying the root of an archetype.  See
+:py:attr:`inception_tools.TemplateArchetype.METADATA_FILE_NAME`.
+"""
+
+DESCRIPTOR_FILE_NAME = "archetype-descriptor.json"
+"""
+The name of the member describing the files and directories of an archetype.  See
+:py:attr:`inception_tools.TemplateArchetype.DESCRIPTOR_FILE_NAME`.
+"""
+
+ENCODING = "utf-8"
+"""
+The encoding of the members of archives and package resources.
+"""
+
+PACKAGE_LOCATION_PREFIX = "package:"
+"""
+The prefix of the locations of archetypes stored as package resources, e.g.,
+``'package:my_package/archetypes/cli'`` (see :py:attr:`PackageSource.location`).
+"""
+
+
+class ArchetypeSource(ABC):
+    """
+    Provides the members of an archetype, i.e., its metadata, descriptor and
+    prototype files, by name.  Member names are relative to the root of the
+    archetype and use ``/`` as separator.  Members are only read when requested.
+
+    Instances may be used as context managers, in which case :py:meth:`close` is
+    called on exit.
+    """
+
+    @property
+    @abstractmethod
+    def location(self) -> str:
+        """
+        A description of where the archetype is stored, e.g., a directory path.
+        """
+        raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+    @abstractmethod
+    def read_text(self, name: str) -> str:
+        """
+        Reads a member.
+        :param name: the name of the member
+        :return: the content of the member
+        """
+        raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+    @abstractmethod
+    def open_binary(self, name: str) -> BinaryIO:
+        """
+        Opens a member for reading its bytes, without decoding them, e.g., to copy
+        it verbatim.  The caller must close the file returned.
+        :param name: the name of the member
+        :return: a binary file object, backed by a file descriptor (see
+        :py:meth:`io.IOBase.fileno`) when the member is stored as a plain file
+        """
+        raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+    def size(self, name: str) -> int:
+        """
+        Returns the size of a member in bytes without reading it, if that can be done
+        cheaply.  The default implementation returns ``0``.
+        :param name: the name of the member
+        :return: the size, or ``0`` if unknown
+        """
+        return 0
+
+    def signature(self, name: str) -> Optional[Tuple]:
+        """
+        Returns a value which changes whenever a member changes, such as its
+        modification time and size, without reading the member.  The default
+        implementation returns :py:const:`None`.
+        :param name: the name of the member
+        :return: the signature, a tuple of ``int``s, or :py:const:`None` if changes
+        can't be detected cheaply
+        """
+        return None
+
+    def close(self) -> None:
+        """
+        Releases any resources held by this instance.  The default implementation
+        does nothing.
+        :return: :py:const:`None`
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class DirectorySource(ArchetypeSource):
+    """
+    An :py:class:`ArchetypeSource` reading the members of an archetype stored in a
+    directory.
+    """
+
+    def __init__(self, dir_path: str) -> None:
+        """
+        Initializes a new :py:class:`DirectorySource` instance.
+        :param dir_path: the path to the archetype directory
+        """
+        super().__init__()
+        self._dir_path = dir_path
+
+    @property
+    def location(self) -> str:
+        return self._dir_path
+
+    def read_text(self, name: str) -> str:
+        with open(self._path(name)) as f:
+            return f.read()
+
+    def open_binary(self, name: str) -> BinaryIO:
+        return open(self._path(name), "rb")
+
+    def size(self, name: str) -> int:
+        return os.path.getsize(self._path(name))
+
+    def signature(self, name: str) -> Optional[Tuple]:
+        st = os.stat(self._path(name))
+        return st.st_mtime_ns, st.st_size
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._dir_path, *name.split("/"))
+
+
+class ZipSource(ArchetypeSource):
+    """
+    An :py:class:`ArchetypeSource` reading the members of an archetype stored in a
+    zip archive, e.g., a wheel.  Only the central directory of the archive is read
+    when the instance is created; each member is decompressed when it is read.
+    """
+
+    def __init__(self, archive_path: str, prefix: Optional[str] = None) -> None:
+        """
+        Initializes a new :py:class:`ZipSource` instance.
+        :param archive_path: the path to the archive
+        :param prefix: the directory of the archetype within the archive, or
+        :py:const:`None` if the archive contains a single archetype, whose
+        directory is then found from the location of its
+        :py:const:`METADATA_FILE_NAME` member
+        """
+        super().__init__()
+        self._archive_path = archive_path
+        self._zip = zipfile.ZipFile(archive_path)
+        self._lock = threading.Lock()
+        if prefix is None:
+            prefixes = self._prefixes(self._zip)
+            if len(prefixes) != 1:
+                self._zip.close()
+                raise ValueError(
+                    f"Expected a single archetype in {archive_path!r} but found "
+                    f"{len(prefixes)}: specify the directory of the archetype"
+                )
+            prefix = prefixes[0]
+        self._prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+
+    @staticmethod
+    def _prefixes(zf: zipfile.ZipFile) -> Tuple[str, ...]:
+        return tuple(
+            sorted(
+                posixpath.dirname(n)
+                for n in zf.namelist()
+                if posixpath.basename(n) == METADATA_FILE_NAME
+            )
+        )
+
+    @classmethod
+    def archetype_prefixes(cls, archive_path: str) -> Tuple[str, ...]:
+        """
+        Returns the directory of each archetype within an archive, i.e., of each
+        :py:const:`METADATA_FILE_NAME` member, with ``''`` denoting the root of the
+        archive.
+        :param archive_path: the path to the archive
+        :return: the directories, sorted
+        """
+        with zipfile.ZipFile(archive_path) as zf:
+            return cls._prefixes(zf)
+
+    @property
+    def location(self) -> str:
+        if not self._prefix:
+            return self._archive_path
+        return f"{self._archive_path}/{self._prefix.rstrip('/')}"
+
+    def read_text(self, name: str) -> str:
+        # ZipFile instances can't safely be read from several threads at once
+        with self._lock:
+            data = self._zip.read(self._prefix + name)
+        return data.decode(ENCODING)
+
+    def open_binary(self, name: str) -> BinaryIO:
+        # Decompressed in memory, for the same reason as read_text
+        with self._lock:
+            data = self._zip.read(self._prefix + name)
+        return io.BytesIO(data)
+
+    def size(self, name: str) -> int:
+        return self._zip.getinfo(self._prefix + name).file_size
+
+    def signature(self, name: str) -> Optional[Tuple]:
+        info = self._zip.getinfo(self._prefix + name)
+        return info.date_time + (info.file_size, info.CRC)
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+class PackageSource(ArchetypeSource):
+    """
+    An :py:class:`ArchetypeSource` reading the members of an archetype stored as the
+    resources of an installed package, whether the package is installed as a
+    directory or as a zip file.
+    """
+
+    def __init__(self, package: str, resource_dir: str) -> None:
+        """
+        Initializes a new :py:class:`PackageSource` instance.
+        :param package: the name of the package, e.g., ``'my_package'``
+        :param resource_dir: the directory of the archetype within the package,
+        using ``/`` as separator, e.g., ``'archetypes/my_archetype'``
+        """
+        super().__init__()
+        self._package = package
+        self._resource_dir = resource_dir.strip("/")
+
+    @property
+    def location(self) -> str:
+        """
+        The location of the archetype, of the form
+        ``package:<package>/<resource-dir>``, which :py:func:`open_archetype_source`
+        accepts.
+        """
+        return f"{PACKAGE_LOCATION_PREFIX}{self._package}/{self._resource_dir}"
+
+    def _resource(self, name: str) -> str:
+        return f"{self._resource_dir}/{name}" if self._resource_dir else name
+
+    def read_text(self, name: str) -> str:
+        resource = self._resource(name)
+        return pkg_resources.resource_string(self._package, resource).decode(ENCODING)
+
+    def open_binary(self, name: str) -> BinaryIO:
+        return pkg_resources.resource_stream(self._package, self._resource(name))
+
+
+def split_archive_location(location: str) -> Optional[Tuple[str, str]]:
+    """
+    Splits a location within a zip archive, in the manner of :py:mod:`zipimport`,
+    e.g., ``'dist/my_package.whl/my_package/archetypes/cli'``, into the path to the
+    archive and the directory within it.
+    :param location: the location
+    :return: the path to the archive and the directory, which is ``''`` for the root
+    of the archive, or :py:const:`None` if ``location`` is not within an archive
+    """
+    archive_path, inner = os.path.normpath(location), []
+    while not os.path.isfile(archive_path):
+        head, tail = os.path.split(archive_path)
+        if not tail or head == archive_path:
+            return None
+        archive_path = head
+        inner.insert(0, tail)
+    if not zipfile.is_zipfile(archive_path):
+        return None
+    return archive_path, "/".join(inner)
+
+
+def open_archetype_source(location: str) -> ArchetypeSource:
+    """
+    Creates the :py:class:`ArchetypeSource` for a location, which is either the path
+    to an archetype directory, the path to a zip archive containing a single
+    archetype, a directory within a zip archive (see
+    :py:func:`split_archive_location`), or the resources of an installed package,
+    e.g., ``'package:my_package/archetypes/cli'`` (see
+    :py:const:`PACKAGE_LOCATION_PREFIX`).
+    :param location: the location
+    :return: the source
+    :raise FileNotFoundError: if ``location`` is neither a directory nor within a
+    zip archive
+    """
+    if os.path.isdir(location):
+        return DirectorySource(location)
+    if location.startswith(PACKAGE_LOCATION_PREFIX):
+        name = location[len(PACKAGE_LOCATION_PREFIX) :]
+        package, _, resource_dir = name.partition("/")
+        return PackageSource(package, resource_dir)
+    split = split_archive_location(location)
+    if split is None:
+        raise FileNotFoundError(
+            f"Not an archetype directory or zip archive: {location!r}"
+        )
+    archive_path, prefix = split
+    return ZipSource(archive_path, prefix or None)
@@ -0,0 +1,56 @@
+"""
+archive_format
+~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`ArchiveFormat` along with supporting classes,
+functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+STDOUT_PATH = "-"
+
+
+class ArchiveFormat(object):
+    """
+    Enumerates the archive formats understood by
+    :py:func:`inception_tools.archive_sink.open_archive_sink`.
+    """
+
+    TAR = "tar"
+    TAR_GZ = "tar.gz"
+    ZIP = "zip"
+
+    ALL = (TAR, TAR_GZ, ZIP)
+
+    MEDIA_TYPES = {
+        TAR: "application/x-tar",
+        TAR_GZ: "application/gzip",
+        ZIP: "application/zip",
+    }
+    """
+    The media (MIME) type of each format.
+    """
+
+    @classmethod
+    def from_path(cls, path: str) -> str:
+        """
+        Determines the archive format from the file name extension of ``path``.
+        Archives written to standard output, i.e., to :py:const:`STDOUT_PATH`, are
+        :py:attr:`TAR_GZ`.
+        """
+        if path == STDOUT_PATH:
+            return cls.TAR_GZ
+        lower = path.lower()
+        if lower.endswith(".zip"):
+            return cls.ZIP
+        if lower.endswith(".tar"):
+            return cls.TAR
+        if lower.endswith((".tar.gz", ".tgz")):
+            return cls.TAR_GZ
+        raise ValueError(
+            f"Could not determine the archive format of {path!r}: expected a name "
+            f"ending in '.tar', '.tar.gz', '.tgz' or '.zip'"
+        )
@@ -0,0 +1,352 @@
+"""
+archive_sink
+~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`ArchiveSink` and its implementations,
+:py:class:`TarSink` and :py:class:`ZipSink`, along with supporting classes,
+functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import gzip
+import os
+import stat
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterator, Optional
+
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.archive_format import STDOUT_PATH, ArchiveFormat
+from inception_tools.build_report import WriteStatus
+from inception_tools.constants import UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+from inception_tools.file_builder import FileBuilder
+from inception_tools.output_sink import OutputSink
+
+SOURCE_DATE_EPOCH_ENV_VAR = "SOURCE_DATE_EPOCH"
+
+DEFAULT_MTIME = 315532800
+"""
+The modification time given to every archive entry when the ``SOURCE_DATE_EPOCH``
+environment variable is not set: 1980-01-01T00:00:00Z, the earliest time that can be
+represented in a zip archive.
+"""
+
+
+def archive_mtime() -> int:
+    """
+    Returns the modification time, in seconds since the epoch, given to every archive
+    entry, so that building the same project twice produces identical archives.  This
+    is the value of the ``SOURCE_DATE_EPOCH`` environment variable, if set, and
+    :py:const:`DEFAULT_MTIME` otherwise.
+    """
+    value = os.environ.get(SOURCE_DATE_EPOCH_ENV_VAR)
+    if not value:
+        return DEFAULT_MTIME
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid {SOURCE_DATE_EPOCH_ENV_VAR}: expected an integer but received "
+            f"{value!r}"
+        ) from None
+
+
+class _Output(object):
+    # Forwards writes to a binary file object until discarded, after which they are
+    # dropped, so that archive objects finalized when garbage collected, e.g., by
+    # GzipFile.__del__, can't complete an aborted archive.
+
+    def __init__(self, fileobj: BinaryIO) -> None:
+        super().__init__()
+        self._fileobj = fileobj
+
+    def discard(self) -> None:
+        self._fileobj = None
+
+    def write(self, b) -> int:
+        if self._fileobj is None:
+            return len(b)
+        return self._fileobj.write(b)
+
+    def flush(self) -> None:
+        if self._fileobj is not None:
+            self._fileobj.flush()
+
+    def tell(self) -> int:
+        return 0 if self._fileobj is None else self._fileobj.tell()
+
+    def seek(self, *args) -> int:
+        return 0 if self._fileobj is None else self._fileobj.seek(*args)
+
+
+class ArchiveSink(OutputSink, ABC):
+    """
+    An :py:class:`OutputSink` which streams the project structure into an archive
+    written to a binary file object.  Each entry is written as soon as it is added,
+    so nothing is staged on disk.
+
+    Entry names are relative to the parent of the root directory, so that the
+    archive extracts to a single directory named after the root directory.  Every
+    entry is given the same modification time and fixed permissions and ownership,
+    and entries are added in build order, so that building the same project twice
+    produces identical archives.
+
+    File content is streamed into the archive as produced by
+    :py:meth:`FileBuilder.iter_render_bytes`, so that large files needn't be held in
+    memory at once.  :py:meth:`abort` leaves the archive unfinished, i.e., without
+    its end-of-archive records, and removes the file created for it, if any.
+    """
+
+    FILE_MODE = 0o644
+    DIR_MODE = 0o755
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        mtime: Optional[int] = None,
+        close_fileobj: bool = False,
+        path: Optional[str] = None,
+    ) -> None:
+        """
+        Initializes a new :py:class:`ArchiveSink` instance.
+        :param fileobj: the binary file object the archive is written to, which need
+        not be seekable
+        :param mtime: the modification time of every entry, or :py:const:`None` to
+        use :py:func:`archive_mtime`
+        :param close_fileobj: whether :py:meth:`close` should also close ``fileobj``
+        :param path: the path of the file created for ``fileobj``, which
+        :py:meth:`abort` removes, or :py:const:`None`
+        """
+        super().__init__()
+        self._fileobj = fileobj
+        # The archive objects of subclasses write through this, rather than to
+        # fileobj directly, so that abort can cut them off
+        self._out = _Output(fileobj)
+        self._mtime = archive_mtime() if mtime is None else mtime
+        self._close_fileobj = close_fileobj
+        self._path = path
+        self._base_dir = os.curdir
+
+    def _name(self, path: str) -> str:
+        return os.path.relpath(path, self._base_dir).replace(os.sep, "/")
+
+    def add_root(self, root_dir: str) -> None:
+        root = os.path.normpath(root_dir or os.curdir)
+        self._base_dir = os.path.dirname(root) or os.curdir
+        if root != os.curdir:
+            self._add_directory_entry(self._name(root))
+
+    def add_directory(self, path: str) -> None:
+        self._add_directory_entry(self._name(path))
+
+    def add_file(
+        self, path: str, builder: FileBuilder, params: ArchetypeParameters
+    ) -> str:
+        self._add_file_entry(self._name(path), builder.iter_render_bytes(params))
+        return WriteStatus.CREATED
+
+    def close(self) -> None:
+        self._close_archive()
+        if self._close_fileobj:
+            self._fileobj.close()
+        else:
+            self._fileobj.flush()
+
+    def abort(self) -> None:
+        self._out.discard()
+        try:
+            # Only so that nothing is left for the finalizers of the archive objects,
+            # since their output is now discarded
+            self._close_archive()
+        except Exception:
+            pass
+        if self._close_fileobj:
+            self._fileobj.close()
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+
+    @abstractmethod
+    def _add_directory_entry(self, name: str) -> None:
+        raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+    @abstractmethod
+    def _add_file_entry(self, name: str, chunks: Iterator[bytes]) -> None:
+        raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+    @abstractmethod
+    def _close_archive(self) -> None:
+        raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+
+class TarSink(ArchiveSink):
+    """
+    An :py:class:`ArchiveSink` which writes a tar archive, optionally compressed with
+    gzip.
+    """
+
+    SPOOL_SIZE = 1 << 20
+    """
+    The size up to which the content of a file is spooled in memory before being
+    added to the archive, larger files being spooled to a temporary file.  Tar
+    headers precede the content, so its size must be known before it is written.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        compress: bool = False,
+        mtime: Optional[int] = None,
+        close_fileobj: bool = False,
+        path: Optional[str] = None,
+    ) -> None:
+        """
+        Initializes a new :py:class:`TarSink` instance.
+        :param fileobj: the binary file object the archive is written to, which need
+        not be seekable
+        :param compress: whether to compress the archive with gzip
+        :param mtime: the modification time of every entry, or :py:const:`None` to
+        use :py:func:`archive_mtime`
+        :param close_fileobj: whether :py:meth:`close` should also close ``fileobj``
+        :param path: the path of the file created for ``fileobj``, which
+        :py:meth:`abort` removes, or :py:const:`None`
+        """
+        super().__init__(fileobj, mtime, close_fileobj, path)
+        # The gzip stream is created explicitly, rather than by tarfile, so that its
+        # header carries the entry mtime instead of the current time.
+        self._gzip = (
+            gzip.GzipFile(filename="", mode="wb", fileobj=self._out, mtime=self._mtime)
+            if compress
+            else None
+        )
+        self._tar = tarfile.open(fileobj=self._gzip or self._out, mode="w|")
+
+    def _tar_info(self, name: str, type_: bytes, mode: int) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(name)
+        info.type = type_
+        info.mode = mode
+        info.mtime = self._mtime
+        return info
+
+    def _add_directory_entry(self, name: str) -> None:
+        self._tar.addfile(self._tar_info(name, tarfile.DIRTYPE, self.DIR_MODE))
+
+    def _add_file_entry(self, name: str, chunks: Iterator[bytes]) -> None:
+        info = self._tar_info(name, tarfile.REGTYPE, self.FILE_MODE)
+        with tempfile.SpooledTemporaryFile(self.SPOOL_SIZE) as spool:
+            for chunk in chunks:
+                spool.write(chunk)
+            info.size = spool.tell()
+            spool.seek(0)
+            self._tar.addfile(info, spool)
+
+    def _close_archive(self) -> None:
+        self._tar.close()
+        if self._gzip is not None:
+            self._gzip.close()
+
+
+class ZipSink(ArchiveSink):
+    """
+    An :py:class:`ArchiveSink` which writes a zip archive, with deflate-compressed
+    file entries.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        mtime: Optional[int] = None,
+        close_fileobj: bool = False,
+        path: Optional[str] = None,
+    ) -> None:
+        """
+        Initializes a new :py:class:`ZipSink` instance.
+        :param fileobj: the binary file object the archive is written to, which need
+        not be seekable
+        :param mtime: the modification time of every entry, or :py:const:`None` to
+        use :py:func:`archive_mtime`
+        :param close_fileobj: whether :py:meth:`close` should also close ``fileobj``
+        :param path: the path of the file created for ``fileobj``, which
+        :py:meth:`abort` removes, or :py:const:`None`
+        """
+        super().__init__(fileobj, mtime, close_fileobj, path)
+        self._date_time = time.gmtime(max(self._mtime, DEFAULT_MTIME))[:6]
+        self._zip = zipfile.ZipFile(self._out, mode="w")
+
+    def _zip_info(self, name: str, mode: int) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, self._date_time)
+        # Always record unix permissions, whatever the current platform
+        info.create_system = 3
+        info.external_attr = mode << 16
+        return info
+
+    def _add_directory_entry(self, name: str) -> None:
+        info = self._zip_info(name + "/", stat.S_IFDIR | self.DIR_MODE)
+        # The MS-DOS directory flag
+        info.external_attr |= 0x10
+        self._zip.writestr(info, b"")
+
+    def _add_file_entry(self, name: str, chunks: Iterator[bytes]) -> None:
+        info = self._zip_info(name, stat.S_IFREG | self.FILE_MODE)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with self._zip.open(info, mode="w") as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+    def _close_archive(self) -> None:
+        self._zip.close()
+
+
+def create_archive_sink(
+    fileobj: BinaryIO,
+    archive_format: str,
+    close_fileobj: bool = False,
+    path: Optional[str] = None,
+) -> ArchiveSink:
+    """
+    Creates an :py:class:`ArchiveSink` writing an archive of the given format to
+    ``fileobj``.
+    :param fileobj: the binary file object the archive is written to, which need
+    not be seekable
+    :param archive_format: one of the :py:class:`ArchiveFormat` values
+    :param close_fileobj: whether closing the sink should also close ``fileobj``
+    :param path: the path of the file created for ``fileobj``, which aborting the
+    sink removes, or :py:const:`None`
+    :return: the sink, which the caller is responsible for closing
+    """
+    if archive_format not in ArchiveFormat.ALL:
+        raise ValueError(f"Unknown archive format: {archive_format!r}")
+    if archive_format == ArchiveFormat.ZIP:
+        return ZipSink(fileobj, close_fileobj=close_fileobj, path=path)
+    compress = archive_format == ArchiveFormat.TAR_GZ
+    return TarSink(fileobj, compress, close_fileobj=close_fileobj, path=path)
+
+
+def open_archive_sink(path: str, archive_format: Optional[str] = None) -> ArchiveSink:
+    """
+    Creates an :py:class:`ArchiveSink` writing to the file at ``path``, which is
+    created or truncated, or to standard output if ``path`` is
+    :py:const:`STDOUT_PATH`.
+    :param path: the path of the archive, or :py:const:`STDOUT_PATH`
+    :param archive_format: one of the :py:class:`ArchiveFormat` values, or
+    :py:const:`None` to determine the format from ``path``
+    :return: the sink, which the caller is responsible for closing, or aborting, in
+    which case the file at ``path`` is removed
+    """
+    archive_format = archive_format or ArchiveFormat.from_path(path)
+    if archive_format not in ArchiveFormat.ALL:
+        raise ValueError(f"Unknown archive format: {archive_format!r}")
+    if path == STDOUT_PATH:
+        return create_archive_sink(sys.stdout.buffer, archive_format)
+    return create_archive_sink(
+        open(path, "wb"), archive_format, close_fileobj=True, path=path
+    )
@@ -0,0 +1,201 @@
+"""
+batch
+~~~~~
+
+Houses the declaration of :py:func:`incept_batch`, which builds many projects from a
+single manifest, along with supporting classes, functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import csv
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Tuple
+
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.manifest_format import ManifestFormat
+from inception_tools.standard_archetype import StandardArchetype
+
+
+MANIFEST_FIELDS = (
+    "package_name",
+    "project_root",
+    "author",
+    "author_email",
+    "archetype",
+)
+"""
+The columns (CSV) or keys (JSONL) recognized in a manifest.  Only ``package_name``
+is required.
+"""
+
+DEFAULT_AUTHOR = "[insert-author-name]"
+DEFAULT_AUTHOR_EMAIL = "[insert-author-email]"
+
+
+class ManifestRow(
+    namedtuple("ManifestRowBase", ("line_number",) + MANIFEST_FIELDS + ("error",))
+):
+    """
+    A single row of a manifest read by :py:func:`read_manifest`.
+
+    :ivar int line_number: the line number of the row within the manifest
+    :ivar str package_name: the name of the package to be created
+    :ivar str project_root: the directory under which the project is created
+    :ivar str author: the package author name
+    :ivar str author_email: the author's email address
+    :ivar str archetype: the canonical name of the :py:class:`StandardArchetype` used
+    :ivar str error: a description of the problem, if the row could not be parsed,
+    and :py:const:`None` otherwise
+    """
+
+    # Make instances of this class immutable
+    __slots__ = ()
+
+
+class BatchResult(namedtuple("BatchResultBase", ("row", "error"))):
+    """
+    The outcome of building the project described by a single :py:class:`ManifestRow`.
+
+    :ivar ManifestRow row: the row
+    :ivar str error: a description of the error that prevented the project from
+    being built, or :py:const:`None` if it was built successfully
+    """
+
+    # Make instances of this class immutable
+    __slots__ = ()
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def _row(line_number: int, fields: dict) -> ManifestRow:
+    if not isinstance(fields, dict):
+        return _bad_row(line_number, f"Expected an object but received: {fields!r}")
+
+    values = {f: (fields.get(f) or None) for f in MANIFEST_FIELDS}
+    if values["package_name"] is None:
+        return _bad_row(line_number, "Missing required field: 'package_name'")
+    values["project_root"] = values["project_root"] or values["package_name"]
+    values["author"] = values["author"] or DEFAULT_AUTHOR
+    values["author_email"] = values["author_email"] or DEFAULT_AUTHOR_EMAIL
+    values["archetype"] = values["archetype"] or StandardArchetype.CLI.canonical_name
+    return ManifestRow(line_number=line_number, error=None, **values)
+
+
+def _bad_row(line_number: int, error: str) -> ManifestRow:
+    values = {f: None for f in MANIFEST_FIELDS}
+    return ManifestRow(line_number=line_number, error=error, **values)
+
+
+def _read_csv(lines: Iterable[str]) -> Iterator[ManifestRow]:
+    reader = csv.DictReader(lines)
+    for fields in reader:
+        yield _row(reader.line_num, fields)
+
+
+def _read_jsonl(lines: Iterable[str]) -> Iterator[ManifestRow]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            fields = json.loads(line)
+        except ValueError as e:
+            yield _bad_row(line_number, f"Invalid JSON: {e}")
+        else:
+            yield _row(line_number, fields)
+
+
+def read_manifest(path: str, manifest_format: Optional[str] = None) -> Tuple:
+    """
+    Reads the rows of a manifest file.  Rows which can't be parsed are returned with
+    their :py:attr:`ManifestRow.error` set, rather than raising, so that a single bad
+    row doesn't prevent the others from being built.
+    :param path: the path to the manifest
+    :param manifest_format: one of the :py:class:`ManifestFormat` values, or
+    :py:const:`None` to determine the format from the file name
+    :return: a ``tuple`` of :py:class:`ManifestRow` instances, in manifest order
+    """
+    manifest_format = manifest_format or ManifestFormat.from_path(path)
+    with open(path, newline="") as f:
+        if manifest_format == ManifestFormat.CSV:
+            return tuple(_read_csv(f))
+        return tuple(_read_jsonl(f))
+
+
+def _load_archetypes(archetype_names: Iterable[str]) -> None:
+    # Loads each archetype's delegate once per process.  When the pool forks its
+    # workers, they inherit the archetypes already loaded by the parent.
+    for name in archetype_names:
+        try:
+            StandardArchetype.from_string(name).delegate
+        except KeyError:
+            # Reported per row, by _incept_row
+            pass
+
+
+def _incept_row(row: ManifestRow, date: datetime) -> BatchResult:
+    if row.error is not None:
+        return BatchResult(row, row.error)
+    try:
+        try:
+            archetype = StandardArchetype.from_string(row.archetype)
+        except KeyError:
+            raise ValueError(f"Unknown archetype: {row.archetype!r}") from None
+        params = ArchetypeParameters(
+            package_name=row.package_name,
+            author=row.author,
+            author_email=row.author_email,
+            date=date,
+        )
+        archetype.build(root_dir=row.project_root, params=params)
+    except Exception as e:
+        # Only the description crosses the process boundary, since not every
+        # exception can be pickled.
+        return BatchResult(row, f"{type(e).__name__}: {e}")
+    return BatchResult(row, None)
+
+
+def incept_batch(
+    rows: Iterable[ManifestRow],
+    jobs: Optional[int] = None,
+    date: Optional[datetime] = None,
+) -> Iterator[BatchResult]:
+    """
+    Builds the project described by each row using a pool of worker processes.
+    Every :py:class:`StandardArchetype` referenced by the rows is loaded once, before
+    the pool starts, and shared by all the builds performed by a worker.  A row which
+    fails to build doesn't affect any other row.
+    :param rows: the rows, e.g., as returned by :py:func:`read_manifest`
+    :param jobs: the number of worker processes, or :py:const:`None` to use one per
+    CPU
+    :param date: the inception date used for every project, or :py:const:`None` to
+    use the current date and time
+    :return: an iterator over a :py:class:`BatchResult` for each row, in row order
+    """
+    rows = tuple(rows)
+    jobs = jobs or os.cpu_count() or 1
+    date = date or datetime.now()
+
+    archetype_names = {r.archetype for r in rows if r.error is None}
+    _load_archetypes(archetype_names)
+
+    if jobs == 1 or len(rows) <= 1:
+        for r in rows:
+            yield _incept_row(r, date)
+        return
+
+    chunksize = max(1, len(rows) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_load_archetypes, initargs=(archetype_names,)
+    ) as executor:
+        yield from executor.map(
+            _incept_row, rows, (date,) * len(rows), chunksize=chunksize
+        )
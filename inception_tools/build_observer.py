@@ -0,0 +1,132 @@
+"""
+build_observer
+~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`BuildObserver` and :py:class:`BuildEvent` along
+with supporting classes, functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+from collections import namedtuple
+
+
+class BuildEventType(object):
+    """
+    Enumerates the types of :py:class:`BuildEvent`.
+    """
+
+    ARCHETYPE_LOAD = "archetype-load"
+    BUILD_START = "build-start"
+    RESOURCE_START = "resource-start"
+    RESOURCE_END = "resource-end"
+    BUILD_END = "build-end"
+
+
+class BuildPhase(object):
+    """
+    Enumerates the phases timed for each resource, and reported by
+    :py:attr:`BuildEvent.phases`.
+    """
+
+    SUBPATH = "subpath"
+    """
+    Resolving the path of the resource, i.e., :py:meth:`FileBuilder.subpath`.
+    """
+
+    RENDER = "render"
+    """
+    Rendering the content of a file.
+    """
+
+    MAKEDIRS = "makedirs"
+    """
+    Creating a directory.
+    """
+
+    WRITE = "write"
+    """
+    Storing the content of a file, e.g., writing it to disk.
+    """
+
+    ALL = (SUBPATH, RENDER, MAKEDIRS, WRITE)
+
+
+class BuildEvent(
+    namedtuple(
+        "BuildEventBase", ("event_type", "path", "kind", "duration", "size", "phases")
+    )
+):
+    """
+    Describes a step of loading or building an archetype, as reported to a
+    :py:class:`BuildObserver`.
+
+    Instances of this class are immutable.
+
+    :ivar str event_type: one of the :py:class:`BuildEventType` values
+    :ivar str path: the path of the resource for resource events, the root directory
+    for build events or the location of the archetype for
+    :py:attr:`BuildEventType.ARCHETYPE_LOAD`
+    :ivar str kind: the :py:class:`inception_tools.plan_record.ResourceKind` of the
+    resource, or :py:const:`None` for events which don't concern a single resource
+    :ivar float duration: the time taken, in seconds, or :py:const:`None` for start
+    events
+    :ivar int size: the number of bytes written, for
+    :py:attr:`BuildEventType.RESOURCE_END` events of files and for
+    :py:attr:`BuildEventType.BUILD_END`, and :py:const:`None` otherwise
+    :ivar dict phases: for :py:attr:`BuildEventType.RESOURCE_END` events, the time
+    taken, in seconds, by each :py:class:`BuildPhase` of the resource, and
+    :py:const:`None` otherwise
+    """
+
+    # Make instances of this class immutable
+    __slots__ = ()
+
+    def to_json(self) -> dict:
+        """
+        Returns a JSON-like Python object holding the fields of this instance.
+        """
+        return self._asdict()
+
+
+class BuildObserver(object):
+    """
+    Receives the :py:class:`BuildEvent`s of archetypes, e.g., to feed them into a
+    tracing system.  Observers are either registered on an archetype (see
+    :py:meth:`ArchetypeBase.add_observer`), or passed to a single call of
+    :py:meth:`Archetype.build`.  Builds without observers don't create any event, so
+    that observing costs nothing unless used.
+
+    Each method is called with the event of the matching
+    :py:class:`BuildEventType`; the default implementations do nothing.  When a
+    build runs on several threads, resource events are reported from each of them,
+    so implementations must be thread-safe.
+    """
+
+    def archetype_loaded(self, event: BuildEvent) -> None:
+        """
+        Called once an archetype has been loaded.
+        """
+
+    def build_started(self, event: BuildEvent) -> None:
+        """
+        Called when a build starts, once the paths of its resources are resolved.
+        """
+
+    def resource_started(self, event: BuildEvent) -> None:
+        """
+        Called before a directory is created or a file is rendered.
+        """
+
+    def resource_ended(self, event: BuildEvent) -> None:
+        """
+        Called once a directory has been created or a file has been written.
+        """
+
+    def build_ended(self, event: BuildEvent) -> None:
+        """
+        Called once every resource of a build has been created.  Not called when the
+        build fails.
+        """
@@ -0,0 +1,105 @@
+"""
+build_profiler
+~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`BuildProfiler` along with supporting classes,
+functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import threading
+from typing import List, Optional
+
+from inception_tools.build_observer import BuildEvent, BuildObserver, BuildPhase
+
+
+class BuildProfiler(BuildObserver):
+    """
+    A :py:class:`BuildObserver` recording the time spent on each resource of a
+    build, in each :py:class:`BuildPhase`, and the bytes written, e.g.:
+
+    ::
+
+        profiler = BuildProfiler()
+        archetype.build(root_dir, params, observers=[profiler])
+        json.dump(profiler.to_json(), f)
+
+    Only the most recent build is kept: each build start discards the resources
+    recorded so far.
+    """
+
+    DEFAULT_TOP = 10
+    """
+    The default number of resources listed by :py:meth:`to_json`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._load_event = None
+        self._build_event = None
+        self._resources = []
+
+    @property
+    def resources(self) -> List[BuildEvent]:
+        """
+        The :py:attr:`BuildEventType.RESOURCE_END` event of each resource built, in
+        the order in which the resources were completed.
+        """
+        with self._lock:
+            return list(self._resources)
+
+    def archetype_loaded(self, event: BuildEvent) -> None:
+        self._load_event = event
+
+    def build_started(self, event: BuildEvent) -> None:
+        with self._lock:
+            self._build_event = None
+            self._resources = []
+
+    def resource_ended(self, event: BuildEvent) -> None:
+        with self._lock:
+            self._resources.append(event)
+
+    def build_ended(self, event: BuildEvent) -> None:
+        self._build_event = event
+
+    def to_json(self, top: Optional[int] = DEFAULT_TOP) -> dict:
+        """
+        Returns a JSON-like Python object summarizing the most recent build: the
+        archetype load and build wall times, the total time spent in each
+        :py:class:`BuildPhase` over all resources, the total bytes written and the
+        ``top`` slowest resources.  Times are given in seconds.
+        :param top: the number of resources listed, or :py:const:`None` to list every
+        resource
+        :return: the JSON-like object
+        """
+        resources = self.resources
+        totals = dict.fromkeys(BuildPhase.ALL, 0.0)
+        for r in resources:
+            for phase, duration in r.phases.items():
+                totals[phase] += duration
+        slowest = sorted(resources, key=lambda r: r.duration, reverse=True)
+        if top is not None:
+            slowest = slowest[:top]
+        load, build = self._load_event, self._build_event
+        return {
+            "load_s": load.duration if load else None,
+            "root_dir": build.path if build else None,
+            "wall_s": build.duration if build else None,
+            "resources": len(resources),
+            "bytes": sum(r.size for r in resources),
+            "totals": totals,
+            "slowest": [
+                {
+                    "path": r.path,
+                    "kind": r.kind,
+                    "duration": r.duration,
+                    "bytes": r.size,
+                    "phases": r.phases,
+                }
+                for r in slowest
+            ],
+        }
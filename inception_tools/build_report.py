@@ -0,0 +1,77 @@
+"""
+build_report
+~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`BuildReport` along with supporting classes,
+functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+from collections import namedtuple
+from typing import Iterable
+
+
+class WriteStatus(object):
+    """
+    Enumerates the outcomes of saving a single file, as returned by
+    :py:meth:`FileBuilder.build_at`.
+    """
+
+    CREATED = "created"
+    """
+    The file didn't exist and was created.
+    """
+
+    WRITTEN = "written"
+    """
+    The file already existed and was overwritten.
+    """
+
+    UNCHANGED = "unchanged"
+    """
+    The file already existed with identical content and was left untouched.
+    """
+
+
+class BuildReport(namedtuple("BuildReportBase", ("created", "written", "unchanged"))):
+    """
+    Summarizes the files saved by :py:meth:`Archetype.build`.
+
+    Instances of this class are immutable.
+
+    :ivar int created: the number of files that didn't exist and were created
+    :ivar int written: the number of existing files that were overwritten
+    :ivar int unchanged: the number of existing files that already had the
+    rendered content and were left untouched
+    """
+
+    # Make instances of this class immutable
+    __slots__ = ()
+
+    @classmethod
+    def from_statuses(cls, statuses: Iterable[str]):
+        """
+        Creates a new :py:class:`BuildReport` by counting the :py:class:`WriteStatus`
+        values returned for each file.
+        """
+        counts = {
+            WriteStatus.CREATED: 0,
+            WriteStatus.WRITTEN: 0,
+            WriteStatus.UNCHANGED: 0,
+        }
+        for s in statuses:
+            counts[s] += 1
+        return cls(
+            created=counts[WriteStatus.CREATED],
+            written=counts[WriteStatus.WRITTEN],
+            unchanged=counts[WriteStatus.UNCHANGED],
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.created} created, {self.written} written, "
+            f"{self.unchanged} unchanged"
+        )
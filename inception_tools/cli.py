@@ -6,16 +6,29 @@ Main entry point commend line script.  See :py:func:`cli` for details of how to
 invoke this script.
 """
 
+import json
 import logging
 import pathlib
 from datetime import datetime
 from logging.config import fileConfig
+from typing import Iterable, List, Optional
 
 import click
 
+from inception_tools.archive_format import ArchiveFormat
+from inception_tools.archetype import Archetype
+from inception_tools.archetype_cache import ArchetypeCache
 from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.archetype_registry import ArchetypeRegistry, default_search_paths
+from inception_tools.build_observer import BuildObserver
+from inception_tools.build_profiler import BuildProfiler
+from inception_tools.constants import DEFAULT_HOST, DEFAULT_PORT
 from inception_tools.exception import LoggingConfigError
+from inception_tools.manifest_format import ManifestFormat
+from inception_tools.size_distribution import SizeDistribution
 from inception_tools.standard_archetype import StandardArchetype
+from inception_tools.template_archetype import TemplateArchetype
+from inception_tools.template_cache import TemplateCache
 
 __author__ = "Andrew van Herick"
 __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
@@ -32,16 +45,70 @@ def _incept(
     author: str,
     author_email: str,
     archetype_name: str,
+    jobs: int = 1,
+    plan: bool = False,
+    incremental: bool = False,
+    output_archive: Optional[str] = None,
+    archive_format: Optional[str] = None,
+    profile: Optional[str] = None,
+    profile_top: int = BuildProfiler.DEFAULT_TOP,
 ) -> None:
-    archetype = StandardArchetype.from_string(archetype_name)
-    params = ArchetypeParameters(
-        package_name=package_name,
-        author=author,
-        author_email=author_email,
-        date=datetime.now(),
-    )
-    root_dir = project_root or package_name
-    archetype.build(root_dir=root_dir, params=params)
+    observers = []
+    if profile:
+        profiler = BuildProfiler()
+        observers.append(profiler)
+    archetype = _find_archetype(archetype_name, observers)
+    try:
+        params = ArchetypeParameters(
+            package_name=package_name,
+            author=author,
+            author_email=author_email,
+            date=datetime.now(),
+        )
+        root_dir = project_root or package_name
+        if plan:
+            for record in archetype.plan(root_dir=root_dir, params=params):
+                click.echo(json.dumps(record.to_json()))
+            return
+        if output_archive:
+            from inception_tools.archive_sink import open_archive_sink
+
+            with open_archive_sink(output_archive, archive_format) as sink:
+                archetype.build(root_dir=root_dir, params=params, sink=sink)
+        else:
+            report = archetype.build(
+                root_dir=root_dir, params=params, jobs=jobs, incremental=incremental
+            )
+            if incremental:
+                click.echo(str(report))
+        if profile:
+            with click.open_file(profile, "w") as f:
+                json.dump(profiler.to_json(profile_top), f, indent=2)
+    finally:
+        if isinstance(archetype, TemplateArchetype):
+            archetype.close()
+
+
+def _find_archetype(archetype_name: str, observers: List[BuildObserver]) -> Archetype:
+    # Returns the standard archetype with the given name or, failing that, the
+    # archetype found by ArchetypeRegistry with the given identifier, optionally
+    # followed by ':' and a version identifier.  New archetypes are returned, rather
+    # than the shared delegates of standard archetypes, when there are observers, so
+    # that their loads are observed too.
+    try:
+        standard = StandardArchetype.from_string(archetype_name)
+    except KeyError:
+        archetype_id, _, version_id = archetype_name.partition(":")
+        try:
+            found = ArchetypeRegistry().resolve(archetype_id, version_id or None)
+        except KeyError as e:
+            raise click.BadParameter(e.args[0], param_hint="'--archetype'")
+        location = found.location
+    else:
+        if not observers:
+            return standard
+        location = standard.dir_path
+    return TemplateArchetype(location, observers=observers)
 
 
 @click.command()
@@ -71,14 +138,84 @@ def _incept(
 @click.option(
     "--archetype",
     default=StandardArchetype.CLI.canonical_name,
-    type=click.Choice(StandardArchetype.canonical_names(), case_sensitive=False),
+    type=str,
+    help="The archetype to build: one of the standard archetypes "
+    f"({', '.join(StandardArchetype.canonical_names())}), or the identifier of an "
+    "archetype listed by 'it archetypes', optionally followed by ':' and a version "
+    "identifier, without which its latest version is built.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="The number of threads used to create directories and to render and write "
+    "files concurrently. Defaults to 1, i.e., the project is built serially.",
+)
+@click.option(
+    "--plan",
+    is_flag=True,
+    default=False,
+    help="Instead of building the project, print a JSON object (one per line) for "
+    "each file and directory that would be created, giving its path, kind, rendered "
+    "size in bytes, SHA-256 digest and whether the path already exists.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Only write files whose rendered content differs from that of the existing "
+    "file, leaving unchanged files (and their modification times) untouched, and "
+    "print the number of files created, written and unchanged.",
+)
+@click.option(
+    "--output-archive",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    default=None,
+    help="Instead of building the project in a directory, stream it into an archive "
+    "at this path, or to standard output if '-'. Entries are named relative to the "
+    "parent of PROJECT_ROOT and are written in a deterministic order, with the "
+    "modification time given by the SOURCE_DATE_EPOCH environment variable, or "
+    "1980-01-01 if that is not set.",
+)
+@click.option(
+    "--archive-format",
+    type=click.Choice(ArchiveFormat.ALL, case_sensitive=False),
+    default=None,
+    help="The format of the archive written by --output-archive. Defaults to the "
+    "format given by the file name extension, or to 'tar.gz' for standard output.",
 )
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    default=None,
+    help="Write a JSON profile of the build to this path, or to standard output if "
+    "'-': the time spent loading the archetype and building the project, the total "
+    "time spent resolving paths, rendering, creating directories and writing files, "
+    "the bytes written and the slowest resources, with the time spent on each.",
+)
+@click.option(
+    "--profile-top",
+    type=click.IntRange(min=0),
+    default=BuildProfiler.DEFAULT_TOP,
+    help="The number of slowest resources listed by --profile. Defaults to "
+    f"{BuildProfiler.DEFAULT_TOP}.",
+)
+@click.pass_context
 def incept(
+    ctx: click.Context,
     package_name: str,
     project_root: str,
     author_name: str,
     author_email: str,
     archetype: str,
+    jobs: int,
+    plan: bool,
+    incremental: bool,
+    output_archive: str,
+    archive_format: str,
+    profile: str,
+    profile_top: int,
 ) -> None:
     """
     Builds a new project structure with the given package name.  Command line
@@ -128,8 +265,38 @@ def incept(
     will be created automatically. Any preexisting files and/or subdirectories matching
     those created by this command will be overwritten.
     """
+    if output_archive and (jobs != 1 or incremental):
+        raise click.UsageError(
+            "--output-archive can't be combined with --jobs or --incremental.", ctx
+        )
+    if plan and profile:
+        raise click.UsageError("--plan can't be combined with --profile.", ctx)
+    if output_archive and not archive_format:
+        try:
+            ArchiveFormat.from_path(output_archive)
+        except ValueError as e:
+            raise click.BadParameter(
+                f"{e.args[0]}, or an explicit --archive-format.",
+                ctx,
+                param_hint="'--output-archive'",
+            )
     try:
-        _incept(package_name, project_root, author_name, author_email, archetype)
+        _incept(
+            package_name,
+            project_root,
+            author_name,
+            author_email,
+            archetype,
+            jobs,
+            plan,
+            incremental,
+            output_archive,
+            archive_format,
+            profile,
+            profile_top,
+        )
+    except click.ClickException:
+        raise
     except Exception:
         msg = (
             f"Unexpected exception: "
@@ -140,6 +307,375 @@ def incept(
         raise
 
 
+def _incept_batch(
+    manifest: str, manifest_format: Optional[str], jobs: Optional[int]
+) -> int:
+    from inception_tools import batch
+
+    rows = batch.read_manifest(manifest, manifest_format)
+    failures = 0
+    for result in batch.incept_batch(rows, jobs):
+        row = result.row
+        if result.succeeded:
+            click.echo(f"OK   line {row.line_number}: {row.project_root}")
+        else:
+            failures += 1
+            click.echo(f"FAIL line {row.line_number}: {result.error}")
+    click.echo(f"{len(rows) - failures} succeeded, {failures} failed")
+    return failures
+
+
+@click.command("incept-batch")
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "manifest_format",
+    type=click.Choice((ManifestFormat.CSV, ManifestFormat.JSONL), case_sensitive=False),
+    default=None,
+    help="The format of the manifest. Defaults to 'csv' for files ending in '.csv' "
+    "and to 'jsonl' otherwise.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The number of worker processes used to build projects. Defaults to the "
+    "number of CPUs.",
+)
+@click.pass_context
+def incept_batch(
+    ctx: click.Context, manifest: str, manifest_format: str, jobs: int
+) -> None:
+    """
+    Builds a new project structure for each row of a manifest file.  Command line
+    syntax:
+
+        it incept-batch <manifest>
+
+    The manifest is either a CSV file, with a header row, or a JSONL file, with one
+    JSON object per line.  Each row may have the following columns (CSV) or keys
+    (JSONL), of which only 'package_name' is required:
+
+    \b
+        package_name
+        project_root (defaults to package_name)
+        author
+        author_email
+        archetype (defaults to 'cli')
+
+    Projects are built by a pool of worker processes.  A line is printed for each
+    row, reporting whether its project was built successfully, followed by a
+    summary.  A row which fails doesn't stop the others from being built, but the
+    command exits with status 1 if any row fails.
+
+    MANIFEST: the path to the manifest file.
+    """
+    try:
+        failures = _incept_batch(manifest, manifest_format, jobs)
+    except Exception:
+        msg = f"Unexpected exception: manifest={manifest!r}, jobs={jobs!r}"
+        _logger().exception(msg)
+        raise
+    if failures:
+        ctx.exit(1)
+
+
+def _warm(archetype_dirs: Iterable[str], cache_dir: Optional[str]) -> TemplateCache:
+    template_cache = TemplateCache(cache_dir)
+    archetype_cache = ArchetypeCache(cache_dir)
+    dir_paths = [sa.dir_path for sa in StandardArchetype]
+    dir_paths.extend(archetype_dirs)
+    for dir_path in dir_paths:
+        with TemplateArchetype(dir_path, template_cache, archetype_cache) as archetype:
+            archetype.load()
+    return template_cache
+
+
+@click.command()
+@click.argument(
+    "archetype_dirs",
+    nargs=-1,
+    type=click.Path(),
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="The root directory of the compiled template cache. Defaults to the "
+    "value of the INCEPTION_TOOLS_CACHE_DIR environment variable or, if that is not "
+    "set, to 'inception_tools' under the user's cache directory.",
+)
+def warm(archetype_dirs: Iterable[str], cache_dir: str) -> None:
+    """
+    Compiles the templates of every standard archetype, along with those of any
+    additional archetype directories given, and stores the compiled code, along with
+    the parsed archetype metadata and descriptors, in the on-disk cache.  Subsequent
+    commands load them from the cache instead of parsing and compiling them again.
+    Command line syntax:
+
+        it warm [ARCHETYPE_DIRS]...
+
+    ARCHETYPE_DIRS (optional): additional archetype directories whose templates
+    should be cached.  Archetypes stored in zip archives, e.g. 'archetype.zip' or
+    'dist/my_package.whl/my_package/archetypes/cli', may also be given.
+    """
+    try:
+        template_cache = _warm(archetype_dirs, cache_dir)
+    except Exception:
+        msg = (
+            f"Unexpected exception: "
+            f"archetype_dirs={archetype_dirs!r}, cache_dir={cache_dir!r}"
+        )
+        _logger().exception(msg)
+        raise
+    count = template_cache.hits + template_cache.misses
+    click.echo(
+        f"Cached {count} templates ({template_cache.misses} newly compiled) in "
+        f"{template_cache.dir_path}"
+    )
+
+
+def _archetypes(
+    search_paths: Iterable[str], archetype_id: Optional[str], latest: bool
+) -> None:
+    registry = ArchetypeRegistry(default_search_paths() + tuple(search_paths))
+    if archetype_id:
+        found = (
+            (registry.latest(archetype_id),)
+            if latest
+            else registry.versions(archetype_id)
+        )
+    else:
+        found = registry.archetypes()
+    for a in found:
+        m = a.metadata
+        click.echo(f"{m.group_id}\t{m.archetype_id}\t{m.version_id}\t{a.location}")
+
+
+@click.command()
+@click.argument(
+    "search_paths",
+    nargs=-1,
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--id",
+    "archetype_id",
+    type=str,
+    default=None,
+    help="Only list the versions of the archetype with this identifier.",
+)
+@click.option(
+    "--latest",
+    is_flag=True,
+    default=False,
+    help="Together with --id, only list the latest version of the archetype.",
+)
+def archetypes(search_paths: Iterable[str], archetype_id: str, latest: bool) -> None:
+    """
+    Lists the archetypes found in the standard archetype directory, the directories
+    listed by the INCEPTION_TOOLS_ARCHETYPE_PATH environment variable, any
+    additional SEARCH_PATHS given and the 'inception_tools.archetypes' entry points
+    of installed distributions.  A tab-separated line giving the group, archetype
+    and version identifiers and the location is printed for each archetype.
+    Command line syntax:
+
+        it archetypes [SEARCH_PATHS]...
+
+    Archetype metadata is kept in an index in the cache directory, so archetype
+    files are only read when they have changed.
+
+    SEARCH_PATHS (optional): additional paths to search, each either an archetype
+    directory or zip archive, or a directory containing them.
+    """
+    try:
+        _archetypes(search_paths, archetype_id, latest)
+    except KeyError as e:
+        raise click.ClickException(e.args[0])
+    except Exception:
+        msg = f"Unexpected exception: search_paths={search_paths!r}"
+        _logger().exception(msg)
+        raise
+
+
+def _serve(
+    archetype_dirs: Iterable[str], host: str, port: int, jobs: Optional[int]
+) -> None:
+    import asyncio
+
+    from inception_tools.server import ArchetypeServer
+
+    server = ArchetypeServer.load(archetype_dirs, jobs)
+    try:
+        click.echo(
+            f"Serving {len(server.archetype_names)} archetypes "
+            f"({', '.join(server.archetype_names)}) on http://{host}:{port}"
+        )
+        asyncio.run(server.serve_forever(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+@click.command()
+@click.argument(
+    "archetype_dirs",
+    nargs=-1,
+    type=click.Path(),
+)
+@click.option(
+    "--host",
+    type=str,
+    default=DEFAULT_HOST,
+    help=f"The host name or address to listen on. Defaults to {DEFAULT_HOST}.",
+)
+@click.option(
+    "--port",
+    type=click.IntRange(min=0, max=65535),
+    default=DEFAULT_PORT,
+    help=f"The port to listen on. Defaults to {DEFAULT_PORT}.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The number of threads used to render projects. Defaults to a number "
+    "based on the number of CPUs.",
+)
+def serve(archetype_dirs: Iterable[str], host: str, port: int, jobs: int) -> None:
+    """
+    Runs a local HTTP service which builds projects on request.  The standard
+    archetypes, along with those in any additional archetype directories given, are
+    loaded once, when the service starts, and kept in memory.  Command line syntax:
+
+        it serve [ARCHETYPE_DIRS]...
+
+    \b
+    The following endpoints are provided:
+        GET  /archetypes  lists the names of the archetypes served
+        POST /incept      builds a project and responds with an archive of it
+
+    The body of a POST to /incept is a JSON object with the keys 'package_name'
+    (required), 'author', 'author_email', 'archetype' (defaults to 'cli') and
+    'format' ('tar', 'tar.gz' or 'zip', defaults to 'tar.gz').  The archive is
+    streamed back as the project is rendered, e.g.:
+
+    \b
+        curl -d '{"package_name": "my_package"}' \\
+            http://127.0.0.1:8080/incept > my_package.tar.gz
+
+    ARCHETYPE_DIRS (optional): additional archetype directories, or archetypes
+    stored in zip archives, to serve, each under the 'archetype_id' given by its
+    metadata.
+    """
+    try:
+        _serve(archetype_dirs, host, port, jobs)
+    except Exception:
+        msg = (
+            f"Unexpected exception: archetype_dirs={archetype_dirs!r}, "
+            f"host={host!r}, port={port!r}"
+        )
+        _logger().exception(msg)
+        raise
+
+
+@click.command()
+@click.argument(
+    "dir_path",
+    type=click.Path(file_okay=False),
+)
+@click.option(
+    "-n",
+    "--files",
+    "file_count",
+    type=click.IntRange(min=0),
+    default=100,
+    help="The number of files. Defaults to 100.",
+)
+@click.option(
+    "--depth",
+    type=click.IntRange(min=0),
+    default=2,
+    help="The depth of the directory tree holding the files. Defaults to 2.",
+)
+@click.option(
+    "--fan-out",
+    type=click.IntRange(min=1),
+    default=4,
+    help="The number of subdirectories of each directory in the tree. Defaults to 4.",
+)
+@click.option(
+    "--prototype-size",
+    type=click.IntRange(min=0),
+    default=512,
+    help="The mean size of the prototypes, in characters. Defaults to 512.",
+)
+@click.option(
+    "--size-distribution",
+    type=click.Choice(SizeDistribution.ALL),
+    default=SizeDistribution.FIXED,
+    help="The distribution of prototype sizes. Defaults to 'fixed'.",
+)
+@click.option(
+    "--variable-density",
+    type=click.FloatRange(min=0, max=1),
+    default=0.25,
+    help="The fraction of prototype lines referencing a template variable. "
+    "Defaults to 0.25.",
+)
+@click.option(
+    "--path-density",
+    type=click.FloatRange(min=0, max=1),
+    default=0.1,
+    help="The fraction of directory and file names which are templated. Defaults "
+    "to 0.1.",
+)
+@click.option(
+    "--seed",
+    type=int,
+    default=0,
+    help="The seed of the random choices made. Defaults to 0.",
+)
+@click.option(
+    "--archetype-id",
+    type=str,
+    default="synthetic",
+    help="The archetype identifier written to the metadata. Defaults to 'synthetic'.",
+)
+def gen_synthetic(dir_path: str, **kwargs) -> None:
+    """
+    Writes a synthetic archetype, of any size, for scale testing.  The archetype's
+    files are spread over the leaves of a directory tree, each rendered from its own
+    prototype.  The same options always produce the same archetype.  Command line
+    syntax:
+
+        it gen-synthetic DIR_PATH [OPTIONS]
+
+    DIR_PATH (required): the directory to write the archetype to, which must not
+    exist or be empty.
+    """
+    from inception_tools.synthetic_archetype import (
+        SyntheticArchetypeSpec,
+        write_synthetic_archetype,
+    )
+
+    try:
+        spec = SyntheticArchetypeSpec(**kwargs)
+        descriptor = write_synthetic_archetype(dir_path, spec)
+    except FileExistsError as e:
+        raise click.ClickException(e.args[0])
+    except Exception:
+        msg = f"Unexpected exception: dir_path={dir_path!r}, options={kwargs!r}"
+        _logger().exception(msg)
+        raise
+    click.echo(
+        f"Wrote a synthetic archetype of {len(descriptor.files)} files to {dir_path}"
+    )
+
+
 @click.group()
 @click.option(
     "-l", "--logging-config", default=None, type=click.Path(exists=True, dir_okay=False)
@@ -174,6 +710,11 @@ def cli(logging_config: str) -> None:
 
 
 cli.add_command(incept)
+cli.add_command(incept_batch)
+cli.add_command(warm)
+cli.add_command(serve)
+cli.add_command(archetypes)
+cli.add_command(gen_synthetic)
 
 if __name__ == "__main__":
     cli()
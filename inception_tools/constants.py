@@ -16,3 +16,15 @@ UNIMPLEMENTED_ABSTRACT_METHOD_ERROR = NotImplementedError(
 The error raised by unimplemented abstract methods declared in :py:class:`ABC`
 subclasses.
 """
+
+DEFAULT_HOST = "127.0.0.1"
+"""
+The host name or address on which :py:class:`inception_tools.server.ArchetypeServer`
+listens by default.
+"""
+
+DEFAULT_PORT = 8080
+"""
+The port on which :py:class:`inception_tools.server.ArchetypeServer` listens by
+default.
+"""
@@ -48,9 +48,18 @@ class DirectoryBuilder(ArchetypeResourceBuilder, ABC):
         ..:note: this method has dependencies on the implementations of
         :py:meth:`subpath`
         """
-        p = self._path(root_dir, params)
+        self.build_at(self._path(root_dir, params))
+
+    def build_at(self, path: str) -> None:
+        """
+        Creates the directory at ``path``, which must be the return value of
+        :py:meth:`path`.  This allows callers which have already resolved the path,
+        e.g., :py:class:`inception_tools.ArchetypeBase`, to avoid doing so again.
+        :param path: the path of the directory to be created
+        :return: :py:const:`None`
+        """
         try:
-            os.makedirs(p)
+            os.makedirs(path)
         except OSError as exc:
             if exc.errno != errno.EEXIST:
                 raise
@@ -11,13 +11,76 @@ __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Re
 __license__ = "Apache Software License 2.0"
 
 import errno
+import hashlib
 import os
+import stat
+import tempfile
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Iterable, Iterator, Optional
 
 from inception_tools.archetype_parameters import ArchetypeParameters
 from inception_tools.archetype_resource_builder import ArchetypeResourceBuilder
+from inception_tools.build_report import WriteStatus
 from inception_tools.constants import UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
 
+_DIGEST_ALGORITHM = "sha256"
+_READ_CHUNK_SIZE = 1 << 16
+_NEWLINE = os.linesep.encode("ascii")
+
+
+def _file_digest(path: str) -> bytes:
+    h = hashlib.new(_DIGEST_ALGORITHM)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def _has_content(path: str, st: os.stat_result, content: bytes) -> bool:
+    # Whether the existing file at path, whose stat result is st, is a regular file
+    # with exactly the given content.  Sizes are compared first, so that most
+    # changed files cost a single stat.
+    if not stat.S_ISREG(st.st_mode) or st.st_size != len(content):
+        return False
+    return _file_digest(path) == hashlib.new(_DIGEST_ALGORITHM, content).digest()
+
+
+@contextmanager
+def open_replacement(
+    path: str, st: Optional[os.stat_result] = None, buffering: int = -1
+) -> Iterator[BinaryIO]:
+    """
+    Opens a temporary file, in the directory of ``path``, which replaces the file at
+    ``path`` once successfully written, i.e., when the context exits without error.
+    The existing file is thus left intact should writing fail, and the temporary file
+    is removed.
+    :param path: the path of the existing file
+    :param st: the stat result of the existing file, whose permission bits are
+    given to the new file, or :py:const:`None` to stat it
+    :param buffering: the ``buffering`` argument of :py:func:`open`
+    :return: a context manager giving the temporary file, open for writing
+    """
+    st = os.stat(path) if st is None else st
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or os.curdir, prefix=".", suffix=".tmp"
+    )
+    try:
+        with open(fd, "wb", buffering=buffering) as f:
+            yield f
+        os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 
 class FileBuilder(ArchetypeResourceBuilder, ABC):
     """
@@ -29,6 +92,24 @@ class FileBuilder(ArchetypeResourceBuilder, ABC):
     :py:class:`inception_tools.ArchetypeParameters`.
     """
 
+    ENCODING = "utf-8"
+    """
+    The encoding used to convert the content generated by :py:meth:`render` to the
+    bytes saved by :py:meth:`build`.
+    """
+
+    TRANSLATE_NEWLINES = True
+    """
+    Whether :py:meth:`build_at` translates each ``\\n`` in the rendered content
+    to :py:data:`os.linesep`, as writing the content in text mode would.
+    """
+
+    WRITE_BUFFER_SIZE = 1 << 16
+    """
+    The size of the buffer through which :py:meth:`build_at` writes the chunks
+    produced by :py:meth:`iter_render_bytes`.
+    """
+
     def _path(self, root_dir, params):
         return os.path.join(root_dir, self.subpath(params))
 
@@ -43,19 +124,21 @@ class FileBuilder(ArchetypeResourceBuilder, ABC):
         """
         return self._path(root_dir, params)
 
-    def build(self, root_dir: str, params: ArchetypeParameters) -> None:
+    def build(
+        self, root_dir: str, params: ArchetypeParameters, incremental: bool = False
+    ) -> str:
         """
         Renders and saves the content generated by :py:meth:`render` to the location
         under `root_dir` determined by the _result of :py:meth:``subpath``.
         :param root_dir: the root directory under which the file should be saved
         :param params: the parameters used to determine the saved file content and
         possibly the subpath under the root directory
-        :return: :py:const:`None`
+        :param incremental: whether to leave an existing file untouched when its
+        content is identical to the rendered content (see :py:meth:`build_at`)
+        :return: the :py:class:`WriteStatus` of the file
         ..:note: this method has dependencies on the implementations of
         :py:meth:`render` and :py:meth:`subpath`
         """
-        content = self.render(params)
-
         p = self._path(root_dir, params)
         try:
             os.makedirs(os.path.dirname(p))
@@ -63,8 +146,119 @@ class FileBuilder(ArchetypeResourceBuilder, ABC):
             if exc.errno != errno.EEXIST:
                 raise
 
-        with open(p, "w") as f:
-            f.write(content)
+        return self.build_at(p, params, incremental)
+
+    def build_at(
+        self, path: str, params: ArchetypeParameters, incremental: bool = False
+    ) -> str:
+        """
+        Renders and saves the content generated by :py:meth:`render` to ``path``,
+        which must be the return value of :py:meth:`path` for the same ``params``.
+        Unlike :py:meth:`build`, this method doesn't create the parent directory of
+        ``path``, which must already exist.  This allows callers which have already
+        resolved the path and created the directory, e.g.,
+        :py:class:`inception_tools.ArchetypeBase`, to avoid doing so again.
+
+        The content is written chunk by chunk, as produced by
+        :py:meth:`iter_render_bytes`, so that large files needn't be held in memory
+        at once.  An existing file is replaced by a file written alongside it (see
+        :py:func:`open_replacement`), so that it is left intact should rendering fail,
+        while a file created by this call is removed.
+
+        As in text mode, each ``\\n`` is written as :py:data:`os.linesep`, unless
+        :py:attr:`TRANSLATE_NEWLINES` is false.
+
+        In ``incremental`` mode, an existing file is only overwritten when its content
+        differs from the rendered content.  Sizes are compared first, and digests of
+        the two contents only when the sizes match, so that an unchanged file keeps
+        its modification time.  The whole content is then rendered before anything
+        is written.
+        :param path: the path of the file to be saved
+        :param params: the parameters used to determine the saved file content
+        :param incremental: whether to leave an existing file untouched when its
+        content is identical to the rendered content
+        :return: the :py:class:`WriteStatus` of the file
+        """
+        if incremental:
+            content = b"".join(self.translate_newlines((self.render_bytes(params),)))
+            st = _stat(path)
+            if st is not None and _has_content(path, st, content):
+                return WriteStatus.UNCHANGED
+            chunks = iter((content,))
+        else:
+            chunks = self.translate_newlines(self.iter_render_bytes(params))
+            st = None
+        # Most failures happen before the first chunk is produced, before anything
+        # is written
+        first = next(chunks, b"")
+
+        buffering = self.WRITE_BUFFER_SIZE
+        if st is None:
+            try:
+                f = open(path, "xb", buffering=buffering)
+            except FileExistsError:
+                pass
+            else:
+                try:
+                    with f:
+                        f.write(first)
+                        for chunk in chunks:
+                            f.write(chunk)
+                except BaseException:
+                    os.unlink(path)
+                    raise
+                return WriteStatus.CREATED
+        with open_replacement(path, st, buffering) as f:
+            f.write(first)
+            for chunk in chunks:
+                f.write(chunk)
+        return WriteStatus.WRITTEN
+
+    def translate_newlines(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Returns the chunks of rendered content as written by :py:meth:`build_at`,
+        i.e., with each ``\\n`` translated to :py:data:`os.linesep` unless
+        :py:attr:`TRANSLATE_NEWLINES` is false.
+        :param chunks: the chunks, e.g., those yielded by :py:meth:`iter_render_bytes`
+        :return: an iterator over the translated chunks
+        """
+        # A newline is a single byte, so it is never split across chunks
+        if not self.TRANSLATE_NEWLINES or _NEWLINE == b"\n":
+            return iter(chunks)
+        return (c.replace(b"\n", _NEWLINE) for c in chunks)
+
+    def render_bytes(self, params: ArchetypeParameters) -> bytes:
+        """
+        Returns the bytes saved by :py:meth:`build`, i.e., the content generated by
+        :py:meth:`render` encoded using :py:attr:`ENCODING`.
+        :param params: the :py:class:`ArchetypeParameters` to use as context when
+        building the content
+        :return: the encoded content
+        """
+        return self.render(params).encode(self.ENCODING)
+
+    def iter_render_bytes(self, params: ArchetypeParameters) -> Iterator[bytes]:
+        """
+        Yields the bytes saved by :py:meth:`build` in consecutive chunks.  The default
+        implementation yields the result of :py:meth:`render_bytes` as a single
+        chunk; subclasses which can produce their content incrementally should
+        override this method, so that large files are written without being held in
+        memory at once.
+        :param params: the :py:class:`ArchetypeParameters` to use as context when
+        building the content
+        :return: an iterator over the chunks of the encoded content
+        """
+        yield self.render_bytes(params)
+
+    def size_hint(self) -> int:
+        """
+        Returns a rough estimate of the size of the content generated by
+        :py:meth:`render`, used to schedule larger files first when files are built
+        concurrently.  The default implementation returns ``0``; subclasses which can
+        cheaply estimate their content size should override this method.
+        :return: the estimated content size
+        """
+        return 0
 
     @abstractmethod
     def subpath(self, params: ArchetypeParameters) -> str:
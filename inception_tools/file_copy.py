@@ -0,0 +1,153 @@
+"""
+file_copy
+~~~~~~~~~
+
+Houses the declaration of :py:func:`copy_fileobj`, which copies files using the
+fastest means the platform offers, along with supporting classes, functions, and
+attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import errno
+import io
+import os
+import shutil
+import sys
+from typing import BinaryIO, Optional
+
+REFLINK_ENV_VAR = "INCEPTION_TOOLS_REFLINK"
+"""
+The name of the environment variable that, when set to a non-empty value, makes
+:py:func:`copy_fileobj` try to clone files (see :py:func:`default_reflink`).
+"""
+
+COPY_CHUNK_SIZE = 1 << 20
+"""
+The number of bytes requested by each ``copy_file_range`` or ``sendfile`` call, and
+the buffer size used by the fallback copy.
+"""
+
+# The FICLONE ioctl of Linux, which makes the destination share the extents of the
+# source on file systems supporting it (btrfs, XFS, ...).  Exposed by fcntl as of
+# Python 3.12.
+_FICLONE = 0x40049409
+
+# Errors meaning that a means of copying isn't supported for the given files, so
+# that the next one should be tried
+_UNSUPPORTED_ERRNOS = frozenset(
+    getattr(errno, name)
+    for name in (
+        "EBADF",
+        "EINVAL",
+        "ENOSYS",
+        "ENOTSOCK",
+        "ENOTSUP",
+        "EOPNOTSUPP",
+        "ETXTBSY",
+        "EXDEV",
+        "ENOTTY",
+    )
+    if hasattr(errno, name)
+)
+
+
+def default_reflink() -> bool:
+    """
+    Returns whether files are cloned by default, i.e., whether the
+    :py:const:`REFLINK_ENV_VAR` environment variable is set.
+    """
+    return bool(os.environ.get(REFLINK_ENV_VAR))
+
+
+def _fileno(f: BinaryIO) -> Optional[int]:
+    try:
+        return f.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst_fd, getattr(fcntl, "FICLONE", _FICLONE), src_fd)
+    except OSError as exc:
+        if exc.errno in _UNSUPPORTED_ERRNOS:
+            return False
+        raise
+    return True
+
+
+def _copy_range(copy, src_fd: int, dst_fd: int) -> Optional[int]:
+    # Copies from the current offset of src_fd to its end using copy(src_fd, dst_fd,
+    # count), which returns the number of bytes copied.  Returns the total number of
+    # bytes copied, or None if copy isn't supported for these files before anything
+    # was copied.
+    total = 0
+    while True:
+        try:
+            n = copy(src_fd, dst_fd, COPY_CHUNK_SIZE)
+        except OSError as exc:
+            if total == 0 and exc.errno in _UNSUPPORTED_ERRNOS:
+                return None
+            raise
+        if n == 0:
+            return total
+        total += n
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, count: int) -> int:
+    return os.copy_file_range(src_fd, dst_fd, count)
+
+
+def _sendfile(src_fd: int, dst_fd: int, count: int) -> int:
+    # With offset None, sendfile reads from, and advances, the offset of src_fd
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+
+def copy_fileobj(fsrc: BinaryIO, fdst: BinaryIO, reflink: bool = False) -> str:
+    """
+    Copies the content of ``fsrc``, from its current position, to ``fdst``, without
+    decoding it.  When both are backed by file descriptors, the copy is done within
+    the kernel, trying in order:
+
+    - when ``reflink`` is set, cloning the source (``FICLONE``, on Linux), so that
+      the destination shares its storage until either is modified, for an empty
+      destination whose file system supports it;
+    - :py:func:`os.copy_file_range`;
+    - :py:func:`os.sendfile`;
+
+    and falling back to :py:func:`shutil.copyfileobj`.
+    :param fsrc: the binary file object to copy from
+    :param fdst: the binary file object to copy to
+    :param reflink: whether to try cloning the source first
+    :return: the means by which the content was copied: ``'reflink'``,
+    ``'copy_file_range'``, ``'sendfile'`` or ``'copyfileobj'``
+    """
+    src_fd, dst_fd = _fileno(fsrc), _fileno(fdst)
+    if src_fd is not None and dst_fd is not None:
+        # Anything buffered must reach the file descriptors first
+        fdst.flush()
+        src_fd_offset = fsrc.tell()
+        os.lseek(src_fd, src_fd_offset, os.SEEK_SET)
+        if reflink and src_fd_offset == 0 and _reflink(src_fd, dst_fd):
+            return "reflink"
+        for method, copy in (
+            (
+                "copy_file_range",
+                getattr(os, "copy_file_range", None) and _copy_file_range,
+            ),
+            ("sendfile", getattr(os, "sendfile", None) and _sendfile),
+        ):
+            if copy and _copy_range(copy, src_fd, dst_fd) is not None:
+                # Keep the buffered objects consistent with their descriptors
+                fsrc.seek(0, os.SEEK_END)
+                fdst.seek(0, os.SEEK_END)
+                return method
+    shutil.copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE)
+    return "copyfileobj"
@@ -0,0 +1,285 @@
+"""
+json_schema
+~~~~~~~~~~~
+
+Houses the declaration of :py:class:`SubsetValidator`, a dependency-free validator
+for a small subset of `JSON schema`_, along with supporting classes, functions, and
+attributes.  Schemas outside the subset are validated with :py:mod:`jsonschema`,
+which is only imported when such a schema is first used.
+
+.. _`JSON schema`: https://json-schema.org/
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+from typing import Any, Iterator, List, Optional, Tuple
+
+SUPPORTED_KEYWORDS = frozenset(
+    (
+        "$comment",
+        "$defs",
+        "$ref",
+        "additionalProperties",
+        "definitions",
+        "description",
+        "enum",
+        "items",
+        "properties",
+        "required",
+        "title",
+        "type",
+    )
+)
+"""
+The schema keywords understood by :py:class:`SubsetValidator`.  ``items`` must be a
+single schema, ``enum`` a list and ``$ref`` a local JSON pointer, e.g.,
+``'#/definitions/file'``.
+"""
+
+_TYPE_CHECKS = {
+    "array": lambda o: isinstance(o, list),
+    "boolean": lambda o: isinstance(o, bool),
+    "integer": lambda o: isinstance(o, int) and not isinstance(o, bool),
+    "null": lambda o: o is None,
+    "number": lambda o: isinstance(o, (int, float)) and not isinstance(o, bool),
+    "object": lambda o: isinstance(o, dict),
+    "string": lambda o: isinstance(o, str),
+}
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    # Whether two JSON values are equal, telling booleans apart from the numbers
+    # they equal in Python, as JSON schema does
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(map(_json_equal, a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    return a == b
+
+
+# The keywords whose values are schemas, or mappings from names to schemas
+_SUBSCHEMA_KEYWORDS = ("items", "additionalProperties")
+_SUBSCHEMA_MAP_KEYWORDS = ("properties", "definitions", "$defs")
+
+
+class SchemaValidationError(ValueError):
+    """
+    Raised by the validators returned by :py:func:`create_validator` when an instance
+    doesn't adhere to their schema.
+
+    :ivar str message: the reason the instance is invalid, phrased as
+    :py:mod:`jsonschema` would
+    :ivar tuple path: the keys and indices leading from the root of the instance to
+    the invalid element
+    """
+
+    def __init__(self, message: str, path: Tuple = ()) -> None:
+        super().__init__(message)
+        self.message = message
+        self.path = tuple(path)
+
+
+def _resolve_pointer(root: dict, ref: str) -> Any:
+    # Resolves a local JSON pointer such as '#/definitions/file' against root
+    if not ref.startswith("#"):
+        raise KeyError(ref)
+    target = root
+    for token in ref[1:].split("/")[1:]:
+        token = token.replace("~1", "/").replace("~0", "~")
+        target = target[int(token)] if isinstance(target, list) else target[token]
+    return target
+
+
+def _subschemas(schema: dict) -> Iterator[Any]:
+    for k in _SUBSCHEMA_KEYWORDS:
+        if isinstance(schema.get(k), dict):
+            yield schema[k]
+    for k in _SUBSCHEMA_MAP_KEYWORDS:
+        yield from schema.get(k, {}).values()
+
+
+def is_supported(schema: Any) -> bool:
+    """
+    Returns whether :py:class:`SubsetValidator` can validate against a schema, i.e.,
+    whether the schema and all of its subschemas only use
+    :py:const:`SUPPORTED_KEYWORDS`, and every ``$ref`` resolves locally.
+    :param schema: the schema
+    :return: whether the schema is supported
+    """
+    pending, seen = [schema], set()
+    while pending:
+        s = pending.pop()
+        if not isinstance(s, dict):
+            return False
+        if id(s) in seen:
+            continue
+        seen.add(id(s))
+        if not SUPPORTED_KEYWORDS.issuperset(s):
+            return False
+        types = s.get("type", [])
+        types = [types] if isinstance(types, str) else types
+        if not isinstance(types, list) or not all(t in _TYPE_CHECKS for t in types):
+            return False
+        if "$ref" in s:
+            try:
+                pending.append(_resolve_pointer(schema, s["$ref"]))
+            except (KeyError, IndexError, ValueError, TypeError):
+                return False
+        if not isinstance(s.get("additionalProperties", True), (bool, dict)):
+            return False
+        if not isinstance(s.get("items", {}), dict):
+            return False
+        if not all(isinstance(s.get(k, {}), dict) for k in _SUBSCHEMA_MAP_KEYWORDS):
+            return False
+        if not isinstance(s.get("required", []), list):
+            return False
+        if not isinstance(s.get("enum", []), list):
+            return False
+        pending.extend(_subschemas(s))
+    return True
+
+
+class SubsetValidator(object):
+    """
+    Validates instances against a schema which only uses the
+    :py:const:`SUPPORTED_KEYWORDS`, producing the same error messages as
+    :py:mod:`jsonschema` without importing it.
+    """
+
+    def __init__(self, schema: dict) -> None:
+        """
+        Initializes a new :py:class:`SubsetValidator` instance.
+        :param schema: the schema, for which :py:func:`is_supported` must be true
+        :raise ValueError: if the schema isn't supported
+        """
+        super().__init__()
+        if not is_supported(schema):
+            raise ValueError(f"Unsupported schema: {schema!r}")
+        self._schema = schema
+
+    @property
+    def schema(self) -> dict:
+        return self._schema
+
+    def iter_errors(self, instance: Any) -> Iterator[SchemaValidationError]:
+        """
+        Yields an error for each way in which an instance doesn't adhere to the
+        schema.
+        :param instance: the JSON-like Python object
+        :return: the errors, in depth-first order
+        """
+        return self._iter_errors(self._schema, instance, [])
+
+    def validate(self, instance: Any) -> None:
+        """
+        Validates an instance against the schema.
+        :param instance: the JSON-like Python object
+        :return: :py:const:`None`
+        :raise SchemaValidationError: for the first error found
+        """
+        for error in self.iter_errors(instance):
+            raise error
+
+    def _iter_errors(
+        self, schema: dict, instance: Any, path: List
+    ) -> Iterator[SchemaValidationError]:
+        if "$ref" in schema:
+            target = _resolve_pointer(self._schema, schema["$ref"])
+            yield from self._iter_errors(target, instance, path)
+
+        types = schema.get("type")
+        if types is not None:
+            types = [types] if isinstance(types, str) else types
+            if not any(_TYPE_CHECKS[t](instance) for t in types):
+                expected = ", ".join(repr(t) for t in types)
+                yield SchemaValidationError(
+                    f"{instance!r} is not of type {expected}", path
+                )
+                return
+
+        if "enum" in schema:
+            enum = schema["enum"]
+            if not any(_json_equal(instance, e) for e in enum):
+                yield SchemaValidationError(
+                    f"{instance!r} is not one of {enum!r}", path
+                )
+
+        if isinstance(instance, dict):
+            for name in schema.get("required", ()):
+                if name not in instance:
+                    yield SchemaValidationError(
+                        f"{name!r} is a required property", path
+                    )
+            properties = schema.get("properties", {})
+            additional = schema.get("additionalProperties", True)
+            extras = []
+            for name, value in instance.items():
+                if name in properties:
+                    subschema = properties[name]
+                elif additional is False:
+                    extras.append(name)
+                    continue
+                elif isinstance(additional, dict):
+                    subschema = additional
+                else:
+                    continue
+                yield from self._iter_errors(subschema, value, path + [name])
+            if extras:
+                names = ", ".join(repr(n) for n in sorted(extras, key=str))
+                verb = "was" if len(extras) == 1 else "were"
+                yield SchemaValidationError(
+                    f"Additional properties are not allowed ({names} {verb} "
+                    f"unexpected)",
+                    path,
+                )
+
+        if isinstance(instance, list) and "items" in schema:
+            for i, item in enumerate(instance):
+                yield from self._iter_errors(schema["items"], item, path + [i])
+
+
+class _JsonSchemaValidator(object):
+    # Adapts a jsonschema validator to raise SchemaValidationError
+
+    def __init__(self, schema: dict) -> None:
+        from jsonschema.validators import validator_for
+
+        super().__init__()
+        validator_cls = validator_for(schema)
+        validator_cls.check_schema(schema)
+        self._validator = validator_cls(schema)
+
+    @property
+    def schema(self) -> dict:
+        return self._validator.schema
+
+    def validate(self, instance: Any) -> None:
+        from jsonschema import ValidationError
+
+        try:
+            self._validator.validate(instance)
+        except ValidationError as e:
+            raise SchemaValidationError(e.message, e.absolute_path) from e
+
+
+def create_validator(schema: dict, subset_only: Optional[bool] = None):
+    """
+    Creates a validator for a schema: a :py:class:`SubsetValidator` if the schema is
+    supported by it, and otherwise one backed by :py:mod:`jsonschema`, which is
+    imported at that point.  The ``validate`` method of either raises
+    :py:class:`SchemaValidationError`.
+    :param schema: the schema
+    :param subset_only: :py:const:`True` to require a :py:class:`SubsetValidator`,
+    :py:const:`False` to always use :py:mod:`jsonschema`, or :py:const:`None` to
+    choose automatically
+    :return: the validator
+    :raise ValueError: if ``subset_only`` is :py:const:`True` and the schema isn't
+    supported by :py:class:`SubsetValidator`
+    """
+    if subset_only or (subset_only is None and is_supported(schema)):
+        return SubsetValidator(schema)
+    return _JsonSchemaValidator(schema)
@@ -10,11 +10,13 @@ __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Re
 __license__ = "Apache Software License 2.0"
 
 import json
+import threading
 from abc import ABC, abstractmethod
 from io import TextIOBase
-from typing import Union
+from typing import Any, Dict, Optional, Union
 
 from inception_tools.constants import UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+from inception_tools.json_schema import create_validator, SchemaValidationError
 from inception_tools.serializable import Serializable, SerializationError
 
 JSON_OBJ_TYPE = Union[dict, list, str, int, float, bool]
@@ -31,6 +33,10 @@ class JsonSerializationError(SerializationError):
     """
 
 
+_validators: Dict[type, Any] = {}
+_validators_lock = threading.Lock()
+
+
 class JsonSerializable(Serializable, ABC):
     """
     Provides an interface by which classes can make themselves
@@ -47,28 +53,79 @@ class JsonSerializable(Serializable, ABC):
     - ``int``
     - ``float``
     - ``None``
+
+    Subclasses may declare a :py:attr:`JSON_SCHEMA`, against which
+    :py:meth:`validate_json` checks JSON-like Python objects.
+    """
+
+    JSON_SCHEMA: Optional[dict] = None
+    """
+    The `JSON schema`_ that JSON-like Python representations of instances must
+    adhere to, or :py:const:`None` if they aren't validated.
+
+    .. _`JSON schema`: https://json-schema.org/
     """
 
     ##############################
     # Static / class methods
 
     @classmethod
-    def from_text_io(cls, fp: TextIOBase):
+    def json_validator(cls):
+        """
+        Returns the validator for :py:attr:`JSON_SCHEMA` (see
+        :py:func:`inception_tools.json_schema.create_validator`).  The validator is
+        created the first time this method is called for ``cls``, and reused
+        thereafter.
+        :return: the validator, or :py:const:`None` if ``cls`` has no
+        :py:attr:`JSON_SCHEMA`
+        """
+        validator = _validators.get(cls)
+        if validator is None and cls.JSON_SCHEMA is not None:
+            with _validators_lock:
+                validator = _validators.get(cls)
+                if validator is None:
+                    validator = _validators[cls] = create_validator(cls.JSON_SCHEMA)
+        return validator
+
+    @classmethod
+    def validate_json(cls, json_obj: JSON_OBJ_TYPE) -> None:
+        """
+        Validates a JSON-like Python object against :py:attr:`JSON_SCHEMA`, if any.
+        :param json_obj: the JSON-like Python object
+        :return: :py:const:`None`
+        :raises JsonSerializationError: if ``json_obj`` doesn't adhere to the schema
+        """
+        validator = cls.json_validator()
+        if validator is None:
+            return
+        try:
+            validator.validate(json_obj)
+        except SchemaValidationError as e:
+            to_raise = JsonSerializationError(f"Invalid JSON format: {json_obj}")
+            raise to_raise from e
+
+    @classmethod
+    def from_text_io(cls, fp: TextIOBase, validate: bool = True):
         """
         Deserializes a JSON-formatted text-based input stream by first converting it
         to a JSON-like Python object using the :py:mod:`json` package and delegating
         responsibility for unmarshalling the JSON representation to
         :py:meth:`from_json`.
+        :param fp: the input stream
+        :param validate: passed on to :py:meth:`from_json`
         """
         json_obj = json.load(fp)
-        return cls.from_json(json_obj)
+        return cls.from_json(json_obj, validate=validate)
 
     @classmethod
     @abstractmethod
-    def from_json(cls, json_obj: JSON_OBJ_TYPE):
+    def from_json(cls, json_obj: JSON_OBJ_TYPE, validate: bool = True):
         """
         Unmarshals a new ``cls`` instance from JSON-like Python object.
         :param json_obj: the JSON-like Python object
+        :param validate: whether to check ``json_obj`` using :py:meth:`validate_json`;
+        pass :py:const:`False` only for objects from a trusted source which have
+        already been validated
         :return: the new ``cls`` instance
         :raises SerializationError: if a problem occurs during execution of this method
         .. seealso:: modules :py:class:`JsonSerializable`
@@ -0,0 +1,35 @@
+"""
+manifest_format
+~~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`ManifestFormat` along with supporting classes,
+functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+
+class ManifestFormat(object):
+    """
+    Enumerates the manifest formats understood by :py:func:`read_manifest`.
+    """
+
+    CSV = "csv"
+    """
+    Comma-separated values with a header row naming the columns.
+    """
+
+    JSONL = "jsonl"
+    """
+    One JSON object per line.
+    """
+
+    @classmethod
+    def from_path(cls, path: str) -> str:
+        """
+        Determines the manifest format from the file name extension of ``path``.
+        Files ending in ``.csv`` are :py:attr:`CSV`, all others :py:attr:`JSONL`.
+        """
+        return cls.CSV if path.lower().endswith(".csv") else cls.JSONL
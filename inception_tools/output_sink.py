@@ -0,0 +1,133 @@
+"""
+output_sink
+~~~~~~~~~~~
+
+Houses the declaration of :py:class:`OutputSink` and :py:class:`DirectorySink` along
+with supporting classes, functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import errno
+import os
+from abc import ABC, abstractmethod
+
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.constants import UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+from inception_tools.file_builder import FileBuilder
+
+
+class OutputSink(ABC):
+    """
+    Receives the directories and files of a project structure built by
+    :py:meth:`inception_tools.ArchetypeBase.build`, and determines where and how they
+    are stored.  Resources are added in build order: the root directory first,
+    then every directory, parents before children, and finally every file.
+
+    Instances may be used as context managers, in which case :py:meth:`close` is
+    called on exit, or :py:meth:`abort` if the block raised an exception.
+    """
+
+    THREAD_SAFE = False
+    """
+    Whether :py:meth:`add_directory` and :py:meth:`add_file` may be called from
+    several threads at once.  Builds only run concurrently into thread-safe sinks.
+    """
+
+    @abstractmethod
+    def add_root(self, root_dir: str) -> None:
+        """
+        Adds the root directory of the project structure.
+        :param root_dir: the root directory
+        :return: :py:const:`None`
+        """
+        raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+    @abstractmethod
+    def add_directory(self, path: str) -> None:
+        """
+        Adds a directory, whose parent has already been added.
+        :param path: the path of the directory
+        :return: :py:const:`None`
+        """
+        raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+    @abstractmethod
+    def add_file(
+        self, path: str, builder: FileBuilder, params: ArchetypeParameters
+    ) -> str:
+        """
+        Adds a file, whose parent directory has already been added, with the content
+        produced by ``builder``.
+        :param path: the path of the file
+        :param builder: the :py:class:`FileBuilder` producing the content
+        :param params: the parameters used to produce the content
+        :return: the :py:class:`inception_tools.WriteStatus` of the file
+        """
+        raise UNIMPLEMENTED_ABSTRACT_METHOD_ERROR
+
+    def close(self) -> None:
+        """
+        Releases any resources held by this instance.  The default implementation
+        does nothing.
+        :return: :py:const:`None`
+        """
+
+    def abort(self) -> None:
+        """
+        Releases any resources held by this instance after a failed build, without
+        completing the output, e.g., so that a partial archive isn't mistaken for a
+        complete one.  The default implementation calls :py:meth:`close`.
+        :return: :py:const:`None`
+        """
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class DirectorySink(OutputSink):
+    """
+    The default :py:class:`OutputSink`, which creates directories and saves files
+    directly on the file system.
+    """
+
+    THREAD_SAFE = True
+
+    def __init__(self, incremental: bool = False) -> None:
+        """
+        Initializes a new :py:class:`DirectorySink` instance.
+        :param incremental: whether to leave existing files whose content is
+        identical to the rendered content untouched (see
+        :py:meth:`FileBuilder.build_at`)
+        """
+        super().__init__()
+        self._incremental = incremental
+
+    def add_root(self, root_dir: str) -> None:
+        if root_dir:
+            try:
+                os.makedirs(root_dir)
+            except OSError as exc:
+                if exc.errno != errno.EEXIST:
+                    raise
+
+    def add_directory(self, path: str) -> None:
+        try:
+            os.mkdir(path)
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                raise
+
+    def add_file(
+        self, path: str, builder: FileBuilder, params: ArchetypeParameters
+    ) -> str:
+        return builder.build_at(path, params, self._incremental)
@@ -0,0 +1,65 @@
+"""
+plan_record
+~~~~~~~~~~~
+
+Houses the declaration of :py:class:`PlanRecord` along with supporting classes,
+functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+from collections import namedtuple
+
+
+class ResourceKind(object):
+    """
+    Enumerates the kinds of resource created by an :py:class:`Archetype`.
+    """
+
+    FILE = "file"
+    DIRECTORY = "directory"
+
+
+class PlanRecord(
+    namedtuple("PlanRecordBase", ("path", "kind", "size", "digest", "exists"))
+):
+    """
+    Describes a single resource that :py:meth:`Archetype.build` would create, as
+    reported by :py:meth:`Archetype.plan`.
+
+    Instances of this class are immutable.
+
+    :ivar str path: the path of the resource
+    :ivar str kind: one of the :py:class:`ResourceKind` values
+    :ivar int size: the size, in bytes, of the rendered file content, as written by
+    :py:meth:`Archetype.build`, or :py:const:`None` for directories
+    :ivar str digest: the hexadecimal SHA-256 digest of the rendered file content,
+    as written, or :py:const:`None` for directories
+    :ivar bool exists: whether something already exists at ``path``
+    """
+
+    # Make instances of this class immutable
+    __slots__ = ()
+
+    DIGEST_ALGORITHM = "sha256"
+    """
+    The :py:mod:`hashlib` algorithm used to compute :py:attr:`digest`.
+    """
+
+    def to_json(self) -> dict:
+        """
+        Returns a JSON-like Python object of the form:
+
+        .. code-block::
+
+            {
+                'path': <path-string>,
+                'kind': <kind-string>,
+                'size': <size-int-or-null>,
+                'digest': <digest-string-or-null>,
+                'exists': <exists-bool>,
+            }
+        """
+        return self._asdict()
@@ -0,0 +1,416 @@
+"""
+server
+~~~~~~
+
+Houses the declaration of :py:class:`ArchetypeServer`, a local HTTP service which
+builds projects on request and streams them back as archives, along with supporting
+classes, functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import asyncio
+import io
+import json
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+from http import HTTPStatus
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from inception_tools.archetype import Archetype
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.archive_sink import ArchiveFormat, create_archive_sink
+from inception_tools.batch import DEFAULT_AUTHOR, DEFAULT_AUTHOR_EMAIL
+from inception_tools.constants import DEFAULT_HOST, DEFAULT_PORT
+from inception_tools.standard_archetype import StandardArchetype
+from inception_tools.template_archetype import TemplateArchetype
+
+INCEPT_PATH = "/incept"
+ARCHETYPES_PATH = "/archetypes"
+
+MAX_BODY_SIZE = 1 << 16
+"""
+The largest request body, in bytes, accepted by :py:class:`ArchetypeServer`.
+"""
+
+CHUNK_SIZE = 1 << 16
+"""
+The size, in bytes, of the chunks in which archives are streamed to clients.
+"""
+
+_QUEUE_SIZE = 8
+
+# The interval, in seconds, at which a rendering thread blocked on a full queue
+# checks whether it should give up, e.g., because the event loop has stopped
+_PUT_POLL_INTERVAL = 1.0
+
+_END = object()
+
+
+def _logger() -> logging.Logger:
+    return logging.getLogger(__name__)
+
+
+class _HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _Aborted(Exception):
+    # Raised in the rendering thread once the client has gone away
+    pass
+
+
+class _Request(namedtuple("_RequestBase", ("method", "path", "headers", "body"))):
+    __slots__ = ()
+
+
+class _QueueWriter(io.RawIOBase):
+    # A write-only, unseekable stream passing what is written, in chunks of at least
+    # chunk_size bytes, to a callable, used to hand the archive written by a
+    # rendering thread over to the event loop.  Once discarded, e.g., after a failed
+    # build, nothing more is passed on, even when flushed or closed.
+
+    def __init__(self, put, chunk_size: int = CHUNK_SIZE) -> None:
+        super().__init__()
+        self._put = put
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._discarded = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        if not self._discarded:
+            self._buffer += b
+            if len(self._buffer) >= self._chunk_size:
+                self.flush()
+        return len(b)
+
+    def flush(self) -> None:
+        if self._buffer and not self._discarded:
+            chunk, self._buffer = bytes(self._buffer), bytearray()
+            self._put(chunk)
+
+    def discard(self) -> None:
+        self._discarded = True
+        self._buffer = bytearray()
+
+
+def _put_threadsafe(
+    loop: asyncio.AbstractEventLoop,
+    queue: asyncio.Queue,
+    item,
+    aborted: threading.Event,
+) -> None:
+    # Puts an item on a queue of the event loop from another thread, blocking while
+    # the queue is full, so that a slow client holds back rendering rather than
+    # buffering the whole archive.  Raises _Aborted once the client has gone away or
+    # the loop has stopped, rather than blocking forever.
+    if aborted.is_set() or loop.is_closed():
+        raise _Aborted()
+    future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+    while True:
+        try:
+            return future.result(_PUT_POLL_INTERVAL)
+        except FutureTimeoutError:
+            if aborted.is_set() or not loop.is_running():
+                future.cancel()
+                raise _Aborted() from None
+
+
+async def _read_request(reader: asyncio.StreamReader) -> _Request:
+    request_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+    parts = request_line.split()
+    if len(parts) != 3:
+        raise _HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    method, path, _ = parts
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+        if not line:
+            break
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, f"Malformed header: {line!r}")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise _HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from None
+    if length > MAX_BODY_SIZE:
+        raise _HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request too large")
+    body = await reader.readexactly(length) if length else b""
+    return _Request(method.upper(), path.split("?", 1)[0], headers, body)
+
+
+def _response_head(status: HTTPStatus, headers: Mapping[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    lines.extend(f"{k}: {v}" for k, v in headers.items())
+    lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _json_response(status: HTTPStatus, obj) -> bytes:
+    body = json.dumps(obj).encode("utf-8")
+    headers = {"Content-Type": "application/json", "Content-Length": str(len(body))}
+    return _response_head(status, headers) + body
+
+
+class ArchetypeServer(object):
+    """
+    A local HTTP service which loads its archetypes, and compiles their templates,
+    once, and keeps them in memory for every request it serves.  Two endpoints are
+    provided:
+
+    - ``GET /archetypes`` responds with a JSON object, ``{"archetypes": [...]}``,
+      listing the names of the archetypes served.
+    - ``POST /incept`` accepts a JSON object with the keys ``package_name``
+      (required), ``author``, ``author_email``, ``archetype`` (defaults to 'cli')
+      and ``format`` (one of the :py:class:`ArchiveFormat` values, defaults to
+      'tar.gz'), and responds with an archive of the project, streamed in chunks as
+      it is rendered.
+
+    Projects are rendered by a pool of worker threads, so the event loop never blocks
+    on rendering.  Errors are reported with a JSON object, ``{"error": ...}``, and an
+    appropriate status code, including a project which fails to render before any of
+    its archive has been sent.  Should it fail later, the response is ended without
+    its final chunk, so that the partial archive can't be mistaken for a complete
+    one.
+    """
+
+    def __init__(
+        self, archetypes: Mapping[str, Archetype], jobs: Optional[int] = None
+    ) -> None:
+        """
+        Initializes a new :py:class:`ArchetypeServer` instance.
+        :param archetypes: the archetypes served, keyed by the name used to request
+        them, which is matched regardless of case
+        :param jobs: the number of worker threads used to render projects, or
+        :py:const:`None` to use the :py:class:`ThreadPoolExecutor` default
+        """
+        super().__init__()
+        self._archetypes = dict(archetypes)
+        # Names are looked up regardless of case
+        self._by_name = {}
+        for name, archetype in self._archetypes.items():
+            key = name.lower()
+            if key in self._by_name:
+                raise ValueError(f"Duplicate archetype name {name!r}")
+            self._by_name[key] = archetype
+        self._executor = ThreadPoolExecutor(max_workers=jobs)
+        # The archetypes opened by load, which close closes
+        self._loaded: Tuple[TemplateArchetype, ...] = ()
+
+    @classmethod
+    def load(
+        cls, archetype_dirs: Iterable[str] = (), jobs: Optional[int] = None
+    ) -> "ArchetypeServer":
+        """
+        Creates a new :py:class:`ArchetypeServer` serving every
+        :py:class:`StandardArchetype`, under its canonical name, along with the
+        :py:class:`TemplateArchetype` in each of the given directories, under its
+        :py:attr:`ArchetypeMetadata.archetype_id`.  Every archetype is loaded
+        immediately, and those in the given directories are closed by
+        :py:meth:`close`.
+        :param archetype_dirs: additional archetype directories to serve
+        :param jobs: the number of worker threads used to render projects
+        :return: the new instance
+        """
+        archetypes: Dict[str, Archetype] = {}
+        for sa in StandardArchetype:
+            sa.delegate
+            archetypes[sa.canonical_name] = sa
+        loaded = []
+        try:
+            for dir_path in archetype_dirs:
+                archetype = TemplateArchetype(dir_path)
+                loaded.append(archetype)
+                name = archetype.metadata.archetype_id
+                if name.lower() in (n.lower() for n in archetypes):
+                    raise ValueError(
+                        f"Duplicate archetype name {name!r} for directory {dir_path!r}"
+                    )
+                archetypes[name] = archetype
+            server = cls(archetypes, jobs)
+        except BaseException:
+            for archetype in loaded:
+                archetype.close()
+            raise
+        server._loaded = tuple(loaded)
+        return server
+
+    @property
+    def archetype_names(self) -> Iterable[str]:
+        return tuple(sorted(self._archetypes))
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """
+        Starts listening for connections on the given address.
+        :param host: the host name or address to listen on
+        :param port: the port to listen on, or ``0`` to pick any free port
+        :return: the :py:class:`asyncio.Server`
+        """
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def serve_forever(
+        self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+    ) -> None:
+        """
+        Listens for and serves connections on the given address until cancelled.
+        """
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker threads, once any rendering in progress has finished,
+        and closes the archetypes opened by :py:meth:`load`.
+        """
+        self._executor.shutdown()
+        for archetype in self._loaded:
+            archetype.close()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            try:
+                request = await _read_request(reader)
+                await self._dispatch(request, writer)
+            except _HttpError as e:
+                writer.write(_json_response(e.status, {"error": str(e)}))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            except Exception as e:
+                _logger().exception("Unexpected exception handling request")
+                status = HTTPStatus.INTERNAL_SERVER_ERROR
+                writer.write(_json_response(status, {"error": str(e)}))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: _Request, writer: asyncio.StreamWriter):
+        if request.path == ARCHETYPES_PATH:
+            if request.method != "GET":
+                raise _HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET")
+            obj = {"archetypes": list(self.archetype_names)}
+            writer.write(_json_response(HTTPStatus.OK, obj))
+        elif request.path == INCEPT_PATH:
+            if request.method != "POST":
+                raise _HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+            await self._incept(request, writer)
+        else:
+            raise _HttpError(HTTPStatus.NOT_FOUND, f"Not found: {request.path}")
+
+    def _parse_incept(self, body: bytes):
+        try:
+            fields = json.loads(body)
+        except ValueError as e:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}") from None
+        if not isinstance(fields, dict):
+            raise _HttpError(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+
+        package_name = fields.get("package_name")
+        if not isinstance(package_name, str) or not package_name.isidentifier():
+            raise _HttpError(
+                HTTPStatus.BAD_REQUEST,
+                f"'package_name' must be a valid Python identifier: {package_name!r}",
+            )
+        name = fields.get("archetype") or StandardArchetype.CLI.canonical_name
+        archetype = self._by_name.get(str(name).lower())
+        if archetype is None:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, f"Unknown archetype: {name!r}")
+        archive_format = fields.get("format") or ArchiveFormat.TAR_GZ
+        if archive_format not in ArchiveFormat.ALL:
+            raise _HttpError(
+                HTTPStatus.BAD_REQUEST, f"Unknown archive format: {archive_format!r}"
+            )
+
+        params = ArchetypeParameters(
+            package_name=package_name,
+            author=fields.get("author") or DEFAULT_AUTHOR,
+            author_email=fields.get("author_email") or DEFAULT_AUTHOR_EMAIL,
+            date=datetime.now(),
+        )
+        return archetype, params, archive_format
+
+    async def _incept(self, request: _Request, writer: asyncio.StreamWriter):
+        archetype, params, archive_format = self._parse_incept(request.body)
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        aborted = threading.Event()
+
+        def put(item):
+            _put_threadsafe(loop, queue, item, aborted)
+
+        def render():
+            out = _QueueWriter(put)
+            try:
+                # A failed build aborts the sink, leaving the archive unfinished
+                with create_archive_sink(out, archive_format) as sink:
+                    archetype.build(params.package_name, params, sink=sink)
+            except _Aborted:
+                return
+            except Exception as e:
+                # Whatever is still buffered is part of an archive which can't be
+                # completed.  Unless some of it has already been sent, the client
+                # gets an error response instead of the archive.
+                out.discard()
+                item = e
+            else:
+                item = _END
+            try:
+                put(item)
+            except _Aborted:
+                pass
+
+        future = loop.run_in_executor(self._executor, render)
+        try:
+            item = await queue.get()
+            if isinstance(item, Exception):
+                raise item
+            headers = {
+                "Content-Type": ArchiveFormat.MEDIA_TYPES[archive_format],
+                "Content-Disposition": (
+                    f'attachment; filename="{params.package_name}.{archive_format}"'
+                ),
+                "Transfer-Encoding": "chunked",
+            }
+            writer.write(_response_head(HTTPStatus.OK, headers))
+            while item is not _END:
+                if isinstance(item, Exception):
+                    # The status has already been sent, so the best that can be done
+                    # is to end the response without its final chunk.
+                    _logger().error("Rendering failed mid-stream", exc_info=item)
+                    return
+                writer.write(b"%X\r\n%s\r\n" % (len(item), item))
+                await writer.drain()
+                item = await queue.get()
+            writer.write(b"0\r\n\r\n")
+        finally:
+            if not future.done():
+                aborted.set()
+                await self._drain(queue, future)
+
+    @staticmethod
+    async def _drain(queue: asyncio.Queue, future: asyncio.Future) -> None:
+        # Unblocks the rendering thread, which stops at its next write
+        while not future.done():
+            get = asyncio.ensure_future(queue.get())
+            await asyncio.wait({get, future}, return_when=asyncio.FIRST_COMPLETED)
+            get.cancel()
@@ -0,0 +1,36 @@
+"""
+size_distribution
+~~~~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`SizeDistribution` along with supporting
+classes, functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+
+class SizeDistribution(object):
+    """
+    The distributions from which :py:func:`write_synthetic_archetype` draws the size
+    of each prototype, given a mean size.
+    """
+
+    FIXED = "fixed"
+    """
+    Every prototype has the mean size.
+    """
+
+    UNIFORM = "uniform"
+    """
+    Sizes are drawn uniformly between zero and twice the mean size.
+    """
+
+    EXPONENTIAL = "exponential"
+    """
+    Sizes are drawn from an exponential distribution, i.e., most prototypes are small
+    and a few are several times the mean size.
+    """
+
+    ALL = (FIXED, UNIFORM, EXPONENTIAL)
@@ -11,12 +11,17 @@ __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Re
 __license__ = "Apache Software License 2.0"
 
 import os
+import threading
 from abc import ABCMeta
 from enum import Enum, EnumMeta
-from typing import Iterable, Tuple
+from typing import Iterable, Iterator, Optional, Tuple
 
 from inception_tools.archetype import Archetype
 from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.build_observer import BuildObserver
+from inception_tools.build_report import BuildReport
+from inception_tools.output_sink import OutputSink
+from inception_tools.plan_record import PlanRecord
 from inception_tools.template_archetype import TemplateArchetype
 
 ARCHETYPE_DIR = os.path.abspath(os.path.join(__file__, os.pardir, "data", "archetypes"))
@@ -116,31 +121,72 @@ class StandardArchetype(Archetype, Enum, metaclass=_ABCEnumMeta):
     """
 
     def __init__(self, archetype_resource_id) -> None:
-        dir_path = os.path.join(ARCHETYPE_DIR, archetype_resource_id)
         self._archetype_resource_id = archetype_resource_id
-        self._delegate = TemplateArchetype(dir_path)
+        # The delegate is created on first use (see :py:attr:`delegate`) so that
+        # importing this module doesn't load and compile every standard archetype.
+        self._delegate = None
+        self._delegate_lock = threading.Lock()
 
     @property
     def archetype_resource_id(self) -> str:
         return self._archetype_resource_id
 
+    @property
+    def dir_path(self) -> str:
+        """
+        The path to the directory containing the archetype's template files.
+        """
+        return os.path.join(ARCHETYPE_DIR, self._archetype_resource_id)
+
+    @property
+    def delegate(self) -> TemplateArchetype:
+        """
+        The :py:class:`TemplateArchetype` to which this instance delegates.  The
+        delegate is loaded the first time this property is accessed and cached
+        thereafter.
+        """
+        if self._delegate is None:
+            with self._delegate_lock:
+                if self._delegate is None:
+                    self._delegate = TemplateArchetype(self.dir_path)
+        return self._delegate
+
     @property
     def canonical_name(self) -> str:
         return self.name.lower()
 
     def file_paths(self, root_path: str, params: ArchetypeParameters) -> Iterable[str]:
-        return self._delegate.file_paths(root_path, params)
+        return self.delegate.file_paths(root_path, params)
 
     def dir_paths(self, root_path: str, params: ArchetypeParameters) -> Iterable[str]:
-        return self._delegate.dir_paths(root_path, params)
-
-    def build(self, root_dir: str, params: ArchetypeParameters) -> None:
-        return self._delegate.build(root_dir, params)
+        return self.delegate.dir_paths(root_path, params)
+
+    def plan(self, root_dir: str, params: ArchetypeParameters) -> Iterator[PlanRecord]:
+        return self.delegate.plan(root_dir, params)
+
+    def iter_render(
+        self, root_dir: str, params: ArchetypeParameters
+    ) -> Iterator[Tuple[str, Optional[bytes]]]:
+        return self.delegate.iter_render(root_dir, params)
+
+    def build(
+        self,
+        root_dir: str,
+        params: ArchetypeParameters,
+        jobs: Optional[int] = None,
+        incremental: bool = False,
+        sink: Optional[OutputSink] = None,
+        observers: Optional[Iterable[BuildObserver]] = None,
+    ) -> BuildReport:
+        return self.delegate.build(root_dir, params, jobs, incremental, sink, observers)
 
     @classmethod
     def from_string(cls, s: str):
-        return {sa.canonical_name: sa for sa in StandardArchetype}[s.lower()]
+        return _BY_CANONICAL_NAME[s.lower()]
 
     @classmethod
     def canonical_names(cls) -> Tuple[str]:
         return tuple(sa.canonical_name for sa in StandardArchetype)
+
+
+_BY_CANONICAL_NAME = {sa.canonical_name: sa for sa in StandardArchetype}
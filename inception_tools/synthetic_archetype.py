@@ -0,0 +1,203 @@
+"""
+synthetic_archetype
+~~~~~~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`SyntheticArchetypeSpec` and
+:py:func:`write_synthetic_archetype`, which generate archetype directories of
+arbitrary size for scale testing, along with supporting classes, functions, and
+attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import itertools
+import json
+import os
+import random
+from collections import namedtuple
+from typing import List
+
+from inception_tools.archetype_descriptor import ArchetypeDescriptor
+from inception_tools.archetype_metadata import ArchetypeMetadata
+from inception_tools.archetype_source import DESCRIPTOR_FILE_NAME, METADATA_FILE_NAME
+from inception_tools.size_distribution import SizeDistribution
+
+PROTOTYPE_DIR = "prototypes"
+"""
+The directory, within a synthetic archetype, holding its prototype files.
+"""
+
+_VARIABLES = ("package_name", "author", "author_email", "date.year")
+
+
+class SyntheticArchetypeSpec(
+    namedtuple(
+        "SyntheticArchetypeSpecBase",
+        (
+            "file_count",
+            "depth",
+            "fan_out",
+            "prototype_size",
+            "size_distribution",
+            "variable_density",
+            "path_density",
+            "seed",
+            "archetype_id",
+        ),
+    )
+):
+    """
+    Describes a synthetic archetype.  The files of the archetype are spread evenly
+    over the leaves of a directory tree of the given ``depth``, in which each
+    directory has ``fan_out`` subdirectories.
+
+    Instances of this class are immutable.
+
+    :ivar int file_count: the number of files
+    :ivar int depth: the depth of the directory tree, ``0`` placing every file
+    directly under the project root
+    :ivar int fan_out: the number of subdirectories of each directory in the tree
+    :ivar int prototype_size: the mean size of the prototypes, in characters
+    :ivar str size_distribution: the :py:class:`SizeDistribution` of prototype sizes
+    :ivar float variable_density: the fraction, between ``0`` and ``1``, of prototype
+    lines which reference a template variable
+    :ivar float path_density: the fraction, between ``0`` and ``1``, of directory and
+    file names which are templated, i.e., which reference ``package_name``
+    :ivar int seed: the seed of the random choices made, so that the same spec
+    always produces the same archetype
+    :ivar str archetype_id: the archetype identifier written to the metadata
+    """
+
+    # Make instances of this class immutable
+    __slots__ = ()
+
+    def __new__(
+        cls,
+        file_count: int = 100,
+        depth: int = 2,
+        fan_out: int = 4,
+        prototype_size: int = 512,
+        size_distribution: str = SizeDistribution.FIXED,
+        variable_density: float = 0.25,
+        path_density: float = 0.1,
+        seed: int = 0,
+        archetype_id: str = "synthetic",
+    ):
+        if file_count < 0 or depth < 0 or fan_out < 1 or prototype_size < 0:
+            raise ValueError(
+                f"Invalid synthetic archetype dimensions: file_count={file_count!r}, "
+                f"depth={depth!r}, fan_out={fan_out!r}, "
+                f"prototype_size={prototype_size!r}"
+            )
+        if size_distribution not in SizeDistribution.ALL:
+            raise ValueError(f"Unknown size distribution: {size_distribution!r}")
+        for name, density in (
+            ("variable_density", variable_density),
+            ("path_density", path_density),
+        ):
+            if not 0 <= density <= 1:
+                raise ValueError(f"Expected {name} between 0 and 1: {density!r}")
+        return super().__new__(
+            cls,
+            file_count,
+            depth,
+            fan_out,
+            prototype_size,
+            size_distribution,
+            variable_density,
+            path_density,
+            seed,
+            archetype_id,
+        )
+
+
+def _name(rng: random.Random, base: str, path_density: float) -> str:
+    if rng.random() < path_density:
+        return f"{{{{package_name}}}}_{base}"
+    return base
+
+
+def _leaf_dirs(spec: SyntheticArchetypeSpec, rng: random.Random) -> List[str]:
+    # Returns the subpath templates of the leaves of the directory tree, or [""]
+    # when the depth is 0
+    level = [""]
+    for d in range(spec.depth):
+        level = [
+            f"{parent}{_name(rng, f'd{d}_{i}', spec.path_density)}/"
+            for parent in level
+            for i in range(spec.fan_out)
+        ]
+    return level
+
+
+def _prototype_size(spec: SyntheticArchetypeSpec, rng: random.Random) -> int:
+    if spec.size_distribution == SizeDistribution.UNIFORM:
+        return int(rng.uniform(0, 2 * spec.prototype_size))
+    if spec.size_distribution == SizeDistribution.EXPONENTIAL:
+        return (
+            int(rng.expovariate(1 / spec.prototype_size)) if spec.prototype_size else 0
+        )
+    return spec.prototype_size
+
+
+def _prototype(spec: SyntheticArchetypeSpec, rng: random.Random, index: int) -> str:
+    size = _prototype_size(spec, rng)
+    lines, written = [], 0
+    for i in itertools.count():
+        if written >= size:
+            break
+        if rng.random() < spec.variable_density:
+            line = f"value_{index}_{i} = '{{{{ {rng.choice(_VARIABLES)} }}}}'\n"
+        else:
+            line = f"value_{index}_{i} = {rng.randrange(1 << 30)}\n"
+        lines.append(line)
+        written += len(line)
+    return "".join(lines)
+
+
+def write_synthetic_archetype(
+    dir_path: str, spec: SyntheticArchetypeSpec = SyntheticArchetypeSpec()
+) -> ArchetypeDescriptor:
+    """
+    Writes a synthetic archetype, i.e., its :py:const:`METADATA_FILE_NAME`,
+    :py:const:`DESCRIPTOR_FILE_NAME` and a prototype for each file under
+    :py:const:`PROTOTYPE_DIR`, to a new directory.
+    :param dir_path: the path to the directory, which must not exist or be empty
+    :param spec: the :py:class:`SyntheticArchetypeSpec` of the archetype
+    :return: the :py:class:`ArchetypeDescriptor` written
+    :raise FileExistsError: if ``dir_path`` exists and isn't an empty directory
+    """
+    if os.path.exists(dir_path) and (
+        not os.path.isdir(dir_path) or os.listdir(dir_path)
+    ):
+        raise FileExistsError(f"Expected a new or empty directory: {dir_path!r}")
+    os.makedirs(os.path.join(dir_path, PROTOTYPE_DIR), exist_ok=True)
+
+    rng = random.Random(spec.seed)
+    leaf_dirs = _leaf_dirs(spec, rng)
+    files = []
+    for i in range(spec.file_count):
+        prototype = f"{PROTOTYPE_DIR}/p{i}.py.jinja"
+        with open(os.path.join(dir_path, PROTOTYPE_DIR, f"p{i}.py.jinja"), "w") as f:
+            f.write(_prototype(spec, rng, i))
+        file_name = _name(rng, f"f{i}.py", spec.path_density)
+        subpath = leaf_dirs[i % len(leaf_dirs)] + file_name
+        files.append({"subpath": subpath, "prototype": prototype})
+    # Leaves without files are still created
+    directories = [
+        {"subpath": d.rstrip("/")} for d in leaf_dirs[spec.file_count :] if d
+    ]
+
+    descriptor = ArchetypeDescriptor.from_json(
+        {"directories": directories, "files": files}
+    )
+    metadata = ArchetypeMetadata("synthetic", spec.archetype_id, "1.0")
+    for name, obj in (
+        (METADATA_FILE_NAME, metadata),
+        (DESCRIPTOR_FILE_NAME, descriptor),
+    ):
+        with open(os.path.join(dir_path, name), "w") as f:
+            json.dump(obj.to_json(), f, indent=2)
+    return descriptor
@@ -10,13 +10,21 @@ __author__ = "Andrew van Herick"
 __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
 __license__ = "Apache Software License 2.0"
 
-import os
+import time
+from typing import Iterable, Optional, Union
 
+from inception_tools import archetype_source
 from inception_tools.archetype_base import ArchetypeBase
-from inception_tools.archetype_descriptor import ArchetypeDescriptor
+from inception_tools.archetype_cache import ArchetypeCache, default_archetype_cache
+from inception_tools.archetype_descriptor import FileKind
 from inception_tools.archetype_metadata import ArchetypeMetadata
+from inception_tools.archetype_source import ArchetypeSource, open_archetype_source
+from inception_tools.build_observer import BuildEvent, BuildEventType, BuildObserver
+from inception_tools.template_cache import TemplateCache
 from inception_tools.template_directory_builder import TemplateDirectoryBuilder
+from inception_tools.template_environment import TemplateEnvironment
 from inception_tools.template_file_builder import TemplateFileBuilder
+from inception_tools.verbatim_file_builder import VerbatimFileBuilder
 
 
 class TemplateArchetype(ArchetypeBase):
@@ -32,27 +40,45 @@ class TemplateArchetype(ArchetypeBase):
     any 'prototype' template files referenced by the descriptor JSON must also be
     present in the directory, at the subpath specified by the descriptor.
 
+    The directory may also be stored in a zip archive, such as a wheel, or as the
+    resources of an installed package; see :py:class:`ArchetypeSource`.  Instances
+    may be used as context managers, in which case :py:meth:`close` is called on
+    exit, releasing the source opened from a location, e.g., the open archive.
+
     Variables available to the template are the fields of
     :py:class:`ArchetypeParameters`.  Each field of :py:class:`Archetype` parameters
     is available as an unscoped variable.  For example, to reference the fields
     :py:attr:`ArchetypeParameters.author`, you would simply use the variable name
     'author' directly using double curly braces like so: ``{{author}}``.
+
+    Templates are compiled by a :py:class:`TemplateEnvironment` owned by the
+    archetype, whose loader reads the archetype's own members, so that prototypes may
+    ``{% include %}`` or ``{% import %}`` shared snippets, e.g.,
+    ``{% include "prototypes/header.jinja" %}``.  Included templates are read and
+    compiled once per archetype.
     """
 
-    METADATA_FILE_NAME = "archetype-metadata.json"
+    METADATA_FILE_NAME = archetype_source.METADATA_FILE_NAME
     """
     The name of the JSON file containing :py:class:`ArchetypeMetadata`. This file is
     used to determine what the canonical name of the archetype.
     """
 
-    DESCRIPTOR_FILE_NAME = "archetype-descriptor.json"
+    DESCRIPTOR_FILE_NAME = archetype_source.DESCRIPTOR_FILE_NAME
     """
     The name of the JSON file containing :py:class:`ArchetypeDescriptor` data. This
     file contains all of the information for mapping template files to sub-paths
     within the projects created by ``inception_tools``.
     """
 
-    def __init__(self, dir_path: str) -> None:
+    def __init__(
+        self,
+        dir_path: Union[str, ArchetypeSource],
+        template_cache: Optional[TemplateCache] = None,
+        archetype_cache: Optional[ArchetypeCache] = None,
+        observers: Iterable[BuildObserver] = (),
+        environment: Optional[TemplateEnvironment] = None,
+    ) -> None:
         """
         Initializes a new :py:class:`Archetype` instance from an directory assumed to
         contain an :py:class:`ArchetypeMetadata` JSON file,
@@ -60,49 +86,139 @@ class TemplateArchetype(ArchetypeBase):
         the descriptor.
 
         :param dir_path: the path to the directory containing the :py:class:`Archetype`
-        files
+        files, a location within a zip archive accepted by
+        :py:func:`open_archetype_source`, or an :py:class:`ArchetypeSource`, which
+        remains the caller's to close
+        :param template_cache: the :py:class:`TemplateCache` used to compile the
+        archetype's templates, or :py:const:`None` to use the default cache
+        :param archetype_cache: the :py:class:`ArchetypeCache` holding the parsed
+        metadata and descriptor, or :py:const:`None` to use the default cache
+        :param observers: the :py:class:`BuildObserver` instances initially
+        registered, which are also notified once the archetype is loaded
+        :param environment: the :py:class:`TemplateEnvironment` compiling the
+        archetype's templates, or :py:const:`None` to create one with
+        :py:meth:`TemplateEnvironment.create`, loading templates from the archetype
+        """
+        start = time.perf_counter()
+        if isinstance(dir_path, ArchetypeSource):
+            source, self._close_source = dir_path, False
+        else:
+            source, self._close_source = open_archetype_source(dir_path), True
+        self._source = source
+
+        try:
+            archetype_cache = archetype_cache or default_archetype_cache()
+            metadata, descriptor = archetype_cache.load(source)
+            self._metadata = metadata
+            self._descriptor = descriptor
+
+            environment = environment or TemplateEnvironment.create(source)
+            self._environment = environment
+
+            file_builders = self._get_file_builders(
+                source, descriptor, template_cache, environment
+            )
+            dir_builders = self._get_directory_builders(
+                descriptor, template_cache, environment
+            )
+        except BaseException:
+            self.close()
+            raise
+
+        super().__init__(file_builders, dir_builders, observers)
+
+        event = BuildEvent(
+            BuildEventType.ARCHETYPE_LOAD,
+            source.location,
+            None,
+            time.perf_counter() - start,
+            None,
+            None,
+        )
+        for o in self._observers:
+            o.archetype_loaded(event)
+
+    @property
+    def dir_path(self) -> str:
         """
-        self._dir_path = dir_path
+        The location of the archetype files, i.e., :py:attr:`ArchetypeSource.location`.
+        """
+        return self._source.location
 
-        with open(self._metadata_path(dir_path)) as metadata_f:
-            metadata = ArchetypeMetadata.from_text_io(metadata_f)
-        self._metadata = metadata
+    @property
+    def source(self) -> ArchetypeSource:
+        """
+        The :py:class:`ArchetypeSource` from which the archetype files are read.
+        """
+        return self._source
 
-        with open(self._descriptor_path(dir_path)) as descriptor_f:
-            descriptor = ArchetypeDescriptor.from_text_io(descriptor_f)
-        self._descriptor = descriptor
+    @property
+    def environment(self) -> TemplateEnvironment:
+        """
+        The :py:class:`TemplateEnvironment` compiling the archetype's templates.
+        """
+        return self._environment
 
-        file_builders = self._get_file_builders(dir_path, descriptor)
-        dir_builders = self._get_directory_builders(dir_path, descriptor)
+    @property
+    def metadata(self) -> ArchetypeMetadata:
+        """
+        The :py:class:`ArchetypeMetadata` read from :py:attr:`METADATA_FILE_NAME`.
+        """
+        return self._metadata
 
-        super().__init__(file_builders, dir_builders)
+    def close(self) -> None:
+        """
+        Closes the :py:attr:`source` if this instance opened it from a location, so
+        that, e.g., its zip archive is closed.  Prototypes which haven't been read
+        yet can't be rendered afterwards.
+        :return: :py:const:`None`
+        """
+        if self._close_source:
+            self._source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def load(self) -> None:
+        """
+        Reads and compiles every prototype now.  Prototypes are otherwise read and
+        compiled the first time each file is rendered, so that loading an archetype
+        only costs its metadata, descriptor and subpath templates.  Loading them ahead
+        of time fills the :py:class:`TemplateCache` and surfaces missing or invalid
+        prototypes before any file is built.
+        :return: :py:const:`None`
+        """
+        for fb in self._file_builders:
+            fb.load()
 
     @classmethod
-    def _get_file_builders(cls, dir_path, descriptor):
+    def _get_file_builders(
+        cls, source, descriptor, template_cache=None, environment=None
+    ):
 
         file_builders = []
         for f in descriptor.files:
-            f_path = os.path.join(dir_path, f.prototype)
-            with open(f_path) as fin:
-                prototype_content = fin.read()
-            fb = TemplateFileBuilder.from_strings(f.subpath, prototype_content)
+            if f.kind == FileKind.VERBATIM:
+                builder_cls = VerbatimFileBuilder
+            else:
+                builder_cls = TemplateFileBuilder
+            fb = builder_cls.from_source(
+                f.subpath, source, f.prototype, template_cache, environment
+            )
             file_builders.append(fb)
 
         return tuple(file_builders)
 
     @classmethod
-    def _get_directory_builders(cls, dir_path, descriptor):
+    def _get_directory_builders(cls, descriptor, template_cache=None, environment=None):
         result = []
         for d in descriptor.directories:
-            dd = TemplateDirectoryBuilder.from_string(d.subpath)
+            dd = TemplateDirectoryBuilder.from_string(
+                d.subpath, template_cache, environment
+            )
             result.append(dd)
 
         return tuple(result)
-
-    @classmethod
-    def _metadata_path(cls, dir_path):
-        return os.path.join(dir_path, cls.METADATA_FILE_NAME)
-
-    @classmethod
-    def _descriptor_path(cls, dir_path):
-        return os.path.join(dir_path, cls.DESCRIPTOR_FILE_NAME)
@@ -0,0 +1,453 @@
+"""
+template_cache
+~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`TemplateCache` along with supporting classes,
+functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import hashlib
+import logging
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from collections import namedtuple
+from types import CodeType
+from typing import Optional, Tuple, Union
+
+import jinja2
+from jinja2 import Environment, Template, meta, nodes
+from jinja2.compiler import CodeGenerator
+from jinja2.defaults import DEFAULT_FILTERS, DEFAULT_NAMESPACE, DEFAULT_TESTS
+
+CACHE_DIR_ENV_VAR = "INCEPTION_TOOLS_CACHE_DIR"
+"""
+The name of the environment variable that, when set, overrides the directory
+returned by :py:func:`default_cache_dir`.
+"""
+
+SUBPATH_ENVIRONMENT = Environment()
+"""
+The :py:class:`jinja2.Environment` used to compile ``subpath`` templates.  It uses
+the same settings as a bare :py:class:`jinja2.Template`.
+"""
+
+PROTOTYPE_ENVIRONMENT = Environment(keep_trailing_newline=True)
+"""
+The :py:class:`jinja2.Environment` used to compile prototype templates.
+"""
+
+# Environment settings which change the code produced by Environment.compile, or the
+# output of folded templates, and whose values can be fingerprinted (see
+# _environment_fingerprint).  Those which can't, e.g., a finalize function, are
+# checked by _is_fingerprintable.
+_COMPILE_SETTINGS = (
+    "block_start_string",
+    "block_end_string",
+    "variable_start_string",
+    "variable_end_string",
+    "comment_start_string",
+    "comment_end_string",
+    "line_statement_prefix",
+    "line_comment_prefix",
+    "trim_blocks",
+    "lstrip_blocks",
+    "newline_sequence",
+    "keep_trailing_newline",
+    "optimized",
+    "autoescape",
+    "is_async",
+)
+
+
+def _logger() -> logging.Logger:
+    return logging.getLogger(__name__)
+
+
+def default_cache_dir() -> str:
+    """
+    Returns the root directory used by :py:class:`TemplateCache` instances created
+    without an explicit ``cache_dir``.  This is the value of the
+    :py:const:`CACHE_DIR_ENV_VAR` environment variable, if set, and otherwise
+    ``inception_tools`` under the user's cache directory (``$XDG_CACHE_HOME`` or
+    ``~/.cache``).
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if cache_dir:
+        return cache_dir
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "inception_tools")
+
+
+def prune_cache_entries(dir_path: str, suffix: str, max_entries: int) -> int:
+    """
+    Removes the least recently stored entries, i.e., the files with the oldest
+    modification times whose names end with ``suffix``, from a cache directory, so
+    that at most ``max_entries`` remain.  Failures are ignored, since another
+    process may be pruning the same directory.
+    :param dir_path: the cache directory
+    :param suffix: the file name suffix of the cache entries
+    :param max_entries: the number of entries kept
+    :return: the number of entries removed
+    """
+    entries = []
+    try:
+        with os.scandir(dir_path) as it:
+            for e in it:
+                if e.name.endswith(suffix):
+                    try:
+                        entries.append((e.stat().st_mtime, e.path))
+                    except OSError:
+                        pass
+    except OSError:
+        return 0
+    excess = len(entries) - max_entries
+    if excess <= 0:
+        return 0
+    entries.sort()
+    removed = 0
+    for _, path in entries[:excess]:
+        try:
+            os.unlink(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# Filters whose output differs from one call to the next, so that templates using
+# them can't be folded
+_NONDETERMINISTIC_FILTERS = frozenset(("random",))
+
+
+_Variables = Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...]
+
+
+def _referenced_variables(
+    environment: Environment, ast: nodes.Template
+) -> Optional[_Variables]:
+    # Returns the variables on which the output of the template depends, as
+    # (name, attributes) pairs sorted by name, where attributes are the only
+    # attributes of the variable used by the template, e.g., ('date', ('year',)), or
+    # None when the variable is used as a whole.  Returns None when the output also
+    # depends on something other than its variables: a global (e.g., lipsum),
+    # another template or a nondeterministic filter.
+    if any(True for _ in meta.find_referenced_templates(ast)):
+        return None
+    for f in ast.find_all(nodes.Filter):
+        if f.name in _NONDETERMINISTIC_FILTERS:
+            return None
+    names = meta.find_undeclared_variables(ast)
+    loads = {}
+    for n in ast.find_all(nodes.Name):
+        if n.ctx != "load":
+            continue
+        if n.name in names:
+            loads[n.name] = loads.get(n.name, 0) + 1
+        elif n.name in environment.globals:
+            return None
+
+    attributes = {name: set() for name in names}
+    attribute_loads = dict.fromkeys(names, 0)
+    for g in ast.find_all(nodes.Getattr):
+        n = g.node
+        if isinstance(n, nodes.Name) and n.ctx == "load" and n.name in names:
+            attributes[n.name].add(g.attr)
+            attribute_loads[n.name] += 1
+    return tuple(
+        (
+            name,
+            tuple(sorted(attributes[name]))
+            if attribute_loads[name] == loads.get(name)
+            else None,
+        )
+        for name in sorted(names)
+    )
+
+
+class CompiledTemplate(
+    namedtuple("CompiledTemplateBase", ("template", "constant", "variables"))
+):
+    """
+    A template compiled by :py:meth:`TemplateCache.load`, along with what was found
+    by analyzing it.
+
+    Instances of this class are immutable.
+
+    :ivar jinja2.Template template: the template, or :py:const:`None` when it
+    references no variables, since its output is then given by ``constant``
+    :ivar str constant: the output of the template, when it references no
+    variables, and :py:const:`None` otherwise
+    :ivar tuple variables: the variables on which the output of the template
+    depends, as ``(name, attributes)`` pairs sorted by name, where ``attributes``
+    are the names of the only attributes of the variable used by the template, e.g.,
+    ``("date", ("year",))``, or :py:const:`None` when the variable is used as a
+    whole; or :py:const:`None` when the output depends on more than its variables,
+    e.g., on a random filter
+    """
+
+    # Make instances of this class immutable
+    __slots__ = ()
+
+
+def _is_fingerprintable(environment: Environment) -> bool:
+    # Whether everything about the environment which changes the code it generates,
+    # or the output of the templates it folds, is captured by
+    # _environment_fingerprint.  Functions, e.g., a finalize function or custom
+    # filters, tests and globals (the code generated for a filter depends on its
+    # signature), can't be told apart across processes, nor can classes local to a
+    # function, e.g., an undefined class, which share their qualified names.
+    return (
+        environment.finalize is None
+        and "<locals>" not in environment.undefined.__qualname__
+        and not callable(environment.autoescape)
+        and environment.code_generator_class is CodeGenerator
+        and environment.filters == DEFAULT_FILTERS
+        and environment.tests == DEFAULT_TESTS
+        and environment.globals == DEFAULT_NAMESPACE
+    )
+
+
+def _environment_fingerprint(environment: Environment) -> str:
+    settings = tuple(
+        (name, repr(getattr(environment, name))) for name in _COMPILE_SETTINGS
+    )
+    undefined = environment.undefined
+    undefined_name = f"{undefined.__module__}.{undefined.__qualname__}"
+    extensions = tuple(sorted(environment.extensions))
+    return repr((settings, undefined_name, extensions))
+
+
+class TemplateCache(object):
+    """
+    A persistent, on-disk cache of compiled :py:mod:`jinja2` template code.  Each
+    entry is keyed by a hash of the template source and of the settings of the
+    :py:class:`jinja2.Environment` that compiled it, including its ``undefined``
+    class, and entries are stored under a
+    directory specific to the running :py:mod:`jinja2` and Python versions.  A
+    template found in the cache is created directly from the stored code, skipping
+    lexing, parsing and code generation altogether.
+
+    Templates whose output doesn't depend on their context, i.e., which reference no
+    variables, can also be folded (see :py:meth:`fold`): their output is rendered
+    once, when compiled, and stored along with their code.
+
+    Templates compiled by environments with settings that can't be captured by the
+    key, i.e., a ``finalize`` function, an ``autoescape`` function, a custom code
+    generator, an ``undefined`` class local to a function, or filters, tests or
+    globals other than the defaults, are compiled in
+    memory and never stored, since their code or output may differ from that of
+    other environments with the same key.
+
+    At most about :py:attr:`MAX_ENTRIES` entries are kept: the least recently
+    stored entries are removed as new ones are added, so that entries for templates
+    which have been changed or deleted don't accumulate.
+
+    Failures to read or write cache entries are never fatal: a missing or corrupt
+    entry is treated as a miss and the template is simply compiled again.
+    """
+
+    CACHE_FILE_SUFFIX = ".jinja2c"
+    """
+    The file name suffix of the cache entries stored by this class.
+    """
+
+    MAX_ENTRIES = 4096
+    """
+    The number of entries kept by the cache.  Entries are pruned when the first
+    entry is stored by an instance, and then every :py:attr:`PRUNE_INTERVAL`
+    entries, so that the cache may briefly hold up to :py:attr:`PRUNE_INTERVAL`
+    more.
+    """
+
+    PRUNE_INTERVAL = 256
+    """
+    The number of entries stored by an instance between two prunings of the cache.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        """
+        Initializes a new :py:class:`TemplateCache` instance.
+        :param cache_dir: the root directory under which entries are stored, or
+        :py:const:`None` to use :py:func:`default_cache_dir`
+        """
+        version_tag = f"jinja2-{jinja2.__version__}-{sys.implementation.cache_tag}"
+        self._dir = os.path.join(cache_dir or default_cache_dir(), version_tag)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    @property
+    def dir_path(self) -> str:
+        """
+        The directory in which this instance stores its entries.
+        """
+        return self._dir
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of templates that have been loaded from the cache by this instance.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        The number of templates that have been compiled by this instance.
+        """
+        return self._misses
+
+    def key(self, environment: Environment, source: str) -> str:
+        """
+        Returns the key under which the code compiled from ``source`` by
+        ``environment`` is stored.
+        """
+        h = hashlib.sha256()
+        h.update(_environment_fingerprint(environment).encode("utf-8"))
+        h.update(b"\0")
+        h.update(source.encode("utf-8"))
+        return h.hexdigest()
+
+    def compile(self, environment: Environment, source: str) -> Template:
+        """
+        Returns a :py:class:`jinja2.Template` for ``source``, created from cached
+        code when available and compiled (and added to the cache) otherwise.
+        :param environment: the environment that owns the template
+        :param source: the template source
+        :return: the template
+        """
+        code, _, _ = self._entry(environment, source)
+        return self._template(environment, code)
+
+    def fold(self, environment: Environment, source: str) -> Union[Template, str]:
+        """
+        Like :py:meth:`compile`, except that the output of templates which reference
+        no variables is returned instead of the template itself.  Such templates
+        render the same output whatever the context, so that their output can be
+        used as a constant.
+        :param environment: the environment that owns the template
+        :param source: the template source
+        :return: the template, or its output when it references no variables
+        """
+        code, constant, _ = self._entry(environment, source)
+        return self._template(environment, code) if constant is None else constant
+
+    def load(self, environment: Environment, source: str) -> CompiledTemplate:
+        """
+        Like :py:meth:`compile`, except that the template is returned along with the
+        variables it references and, when it references none, its output.  Templates
+        are analyzed when they are compiled, and the results stored with their code,
+        so that loading a cached template doesn't parse it.
+        :param environment: the environment that owns the template
+        :param source: the template source
+        :return: the :py:class:`CompiledTemplate`
+        """
+        code, constant, variables = self._entry(environment, source)
+        if constant is not None:
+            return CompiledTemplate(None, constant, variables)
+        return CompiledTemplate(self._template(environment, code), None, variables)
+
+    @staticmethod
+    def _template(environment: Environment, code: CodeType) -> Template:
+        return environment.template_class.from_code(
+            environment, code, environment.make_globals(None)
+        )
+
+    def _entry(self, environment: Environment, source: str) -> tuple:
+        # Returns the code of the template, its output if it references no variables
+        # and the variables it references.  The template is parsed once, both to
+        # generate its code and to find the variables it references.
+        cacheable = _is_fingerprintable(environment)
+        key = self.key(environment, source) if cacheable else None
+        entry = self._load_entry(key) if cacheable else None
+        if entry is None:
+            ast = environment.parse(source)
+            code = environment.compile(ast)
+            variables = _referenced_variables(environment, ast)
+            constant = None
+            if variables == ():
+                try:
+                    constant = self._template(environment, code).render()
+                except Exception:
+                    # Left for the template to raise when it is rendered
+                    constant = None
+            entry = (code, constant, variables)
+            if cacheable:
+                self._store_entry(key, entry)
+            with self._lock:
+                self._misses += 1
+        else:
+            with self._lock:
+                self._hits += 1
+        return entry
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._dir, key + self.CACHE_FILE_SUFFIX)
+
+    def _load_entry(self, key: str) -> Optional[tuple]:
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                entry = marshal.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError):
+            _logger().debug(f"Ignoring unreadable template cache entry: {key!r}")
+            return None
+        # Entries written by earlier versions hold the code alone, or the code and
+        # output without the variables
+        if (
+            not isinstance(entry, tuple)
+            or len(entry) != 3
+            or not isinstance(entry[0], CodeType)
+        ):
+            _logger().debug(f"Ignoring outdated template cache entry: {key!r}")
+            return None
+        return entry
+
+    def _store_entry(self, key: str, entry: tuple) -> None:
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    marshal.dump(entry, f)
+                os.replace(tmp_path, self._entry_path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            _logger().debug(f"Could not write template cache entry: {key!r}")
+            return
+        with self._lock:
+            prune = self._stores % self.PRUNE_INTERVAL == 0
+            self._stores += 1
+        if prune:
+            prune_cache_entries(self._dir, self.CACHE_FILE_SUFFIX, self.MAX_ENTRIES)
+
+
+_default_template_cache = None
+_default_template_cache_lock = threading.Lock()
+
+
+def default_template_cache() -> TemplateCache:
+    """
+    Returns the process-wide :py:class:`TemplateCache`, rooted at
+    :py:func:`default_cache_dir`, used by template builders which aren't given a
+    cache of their own.
+    """
+    global _default_template_cache
+    if _default_template_cache is None:
+        with _default_template_cache_lock:
+            if _default_template_cache is None:
+                _default_template_cache = TemplateCache()
+    return _default_template_cache
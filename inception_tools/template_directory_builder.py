@@ -11,11 +11,14 @@ __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Re
 __license__ = "Apache Software License 2.0"
 
 import os
+from typing import Optional, Union
 
 from jinja2 import Template
 
 from inception_tools.archetype_parameters import ArchetypeParameters
 from inception_tools.directory_builder import DirectoryBuilder
+from inception_tools.template_cache import default_template_cache, TemplateCache
+from inception_tools.template_environment import TemplateEnvironment
 
 
 class TemplateDirectoryBuilder(DirectoryBuilder):
@@ -31,32 +34,51 @@ class TemplateDirectoryBuilder(DirectoryBuilder):
     """
 
     @classmethod
-    def from_string(cls, subpath: str) -> DirectoryBuilder:
+    def from_string(
+        cls,
+        subpath: str,
+        template_cache: Optional[TemplateCache] = None,
+        environment: Optional[TemplateEnvironment] = None,
+    ) -> DirectoryBuilder:
         """
         Factory method that builds a new :py:class:`TemplateDirectoryBuilder`
         instance from a :py:class:`jinja2.Template` source ``string``, which will be
         used to create the return value of :py:meth:`subpath` from the ``params``
-        argument.
+        argument.  Templates which reference no variables are rendered once, here,
+        rather than by every call to :py:meth:`subpath`.
 
         :param subpath: the subpath template string
+        :param template_cache: the :py:class:`TemplateCache` used to compile the
+        template, or :py:const:`None` to use the default cache
+        :param environment: the :py:class:`TemplateEnvironment` compiling the
+        template, or :py:const:`None` to use :py:meth:`TemplateEnvironment.default`
         :return: the new instance
         .. seealso:: :py:meth:`__init__`
         """
-        t = Template(subpath)
+        template_cache = template_cache or default_template_cache()
+        environment = environment or TemplateEnvironment.default()
+        t = template_cache.fold(environment.subpath, subpath)
         return cls(t)
 
-    def __init__(self, template: Template) -> None:
+    def __init__(self, template: Union[Template, str]) -> None:
         """
-        Initializes a new :py:class:`TemplateDirectoryBuilder` instance. :param
-        template: a :py:class:`jinja2.Template` to be used with the ``params``
-        argument of :py:meth:`subpath`.
+        Initializes a new :py:class:`TemplateDirectoryBuilder` instance.
+        :param template: a :py:class:`jinja2.Template` to be used with the ``params``
+        argument of :py:meth:`subpath`, or the rendered subpath itself, separated by
+        :py:attr:`PATH_SEP`, for subpaths which reference no variables
         """
         self._template = template
+        # Constant subpaths are converted to OS paths once and for all
+        self._subpath = self._os_path(template) if isinstance(template, str) else None
+
+    @classmethod
+    def _os_path(cls, subpath_raw: str) -> str:
+        return os.path.join(*subpath_raw.split(cls.PATH_SEP))
 
     def subpath(self, params: ArchetypeParameters) -> str:
         """
         Renders the template held by using ``params`` dictionary representation.
         """
-        subpath_raw = self._template.render(**params.as_dict())
-        subpath_split = subpath_raw.split(self.PATH_SEP)
-        return os.path.join(*subpath_split)
+        if self._subpath is not None:
+            return self._subpath
+        return self._os_path(self._template.render(**params.as_dict()))
@@ -0,0 +1,127 @@
+"""
+template_environment
+~~~~~~~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`TemplateEnvironment` and
+:py:class:`ArchetypeSourceLoader` along with supporting classes, functions, and
+attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+from collections import namedtuple
+from typing import Callable, Optional, Tuple
+
+from jinja2 import BaseLoader, Environment, TemplateNotFound
+from jinja2.loaders import split_template_path
+
+from inception_tools.archetype_source import ArchetypeSource
+from inception_tools.template_cache import PROTOTYPE_ENVIRONMENT, SUBPATH_ENVIRONMENT
+
+
+class ArchetypeSourceLoader(BaseLoader):
+    """
+    A :py:class:`jinja2.BaseLoader` reading templates from an
+    :py:class:`ArchetypeSource`, so that prototypes can ``{% include %}``,
+    ``{% import %}`` or ``{% extends %}`` other members of their archetype.  Template
+    names are the names of members, relative to the archetype root and separated by
+    ``/``, e.g., ``prototypes/header.jinja``.
+    """
+
+    def __init__(self, source: ArchetypeSource) -> None:
+        """
+        Initializes a new :py:class:`ArchetypeSourceLoader` instance.
+        :param source: the :py:class:`ArchetypeSource` from which templates are read
+        """
+        super().__init__()
+        self._source = source
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> Tuple[str, Optional[str], Optional[Callable[[], bool]]]:
+        name = "/".join(split_template_path(template))
+        try:
+            signature = self._source.signature(name)
+            text = self._source.read_text(name)
+        except (OSError, KeyError):
+            raise TemplateNotFound(template)
+
+        def uptodate():
+            # Sources without signatures can't tell, so their members are assumed
+            # to have changed
+            try:
+                current = self._source.signature(name)
+            except (OSError, KeyError):
+                return False
+            return signature is not None and signature == current
+
+        return text, f"{self._source.location}/{name}", uptodate
+
+
+class TemplateEnvironment(
+    namedtuple("TemplateEnvironmentBase", ("prototype", "subpath"))
+):
+    """
+    The pair of :py:class:`jinja2.Environment` instances compiling the templates of
+    an archetype.  Each :py:class:`inception_tools.TemplateArchetype` owns an
+    instance (see :py:meth:`create`), so that its templates share the same settings,
+    e.g., the ``undefined`` class or extensions, and the same loader and cache of
+    included templates.
+
+    Instances of this class are immutable.
+
+    :ivar jinja2.Environment prototype: the environment compiling prototypes
+    :ivar jinja2.Environment subpath: the environment compiling the subpaths of
+    files and directories
+    """
+
+    # Make instances of this class immutable
+    __slots__ = ()
+
+    DEFAULT_OPTIONS = {"auto_reload": False}
+    """
+    The :py:class:`jinja2.Environment` options used by :py:meth:`create` unless
+    overridden.  Archetype members rarely change while an archetype is loaded, so
+    included templates aren't checked for changes each time they are used.
+    """
+
+    @classmethod
+    def create(
+        cls, source: Optional[ArchetypeSource] = None, **options
+    ) -> "TemplateEnvironment":
+        """
+        Creates a new instance, whose subpath environment is an overlay of its
+        prototype environment.
+        :param source: the :py:class:`ArchetypeSource` from which templates included
+        by prototypes are loaded, or :py:const:`None` if prototypes can't include
+        other templates
+        :param options: additional keyword arguments of :py:class:`jinja2.Environment`,
+        e.g., ``undefined=jinja2.StrictUndefined`` or ``cache_size=1000``.
+        ``keep_trailing_newline`` is always set for prototypes and never for subpaths,
+        as by :py:const:`PROTOTYPE_ENVIRONMENT` and :py:const:`SUBPATH_ENVIRONMENT`.
+        Templates compiled with a ``finalize`` function, custom filters, tests or
+        globals, or similar options, aren't stored in the :py:class:`TemplateCache`.
+        :return: the new instance
+        """
+        options = {**cls.DEFAULT_OPTIONS, **options}
+        options["keep_trailing_newline"] = True
+        if source is not None:
+            options["loader"] = ArchetypeSourceLoader(source)
+        prototype = Environment(**options)
+        return cls(prototype, prototype.overlay(keep_trailing_newline=False))
+
+    @classmethod
+    def default(cls) -> "TemplateEnvironment":
+        """
+        Returns the instance used by template builders created without an
+        environment, made of :py:const:`PROTOTYPE_ENVIRONMENT` and
+        :py:const:`SUBPATH_ENVIRONMENT`.
+        """
+        return _DEFAULT_TEMPLATE_ENVIRONMENT
+
+
+_DEFAULT_TEMPLATE_ENVIRONMENT = TemplateEnvironment(
+    PROTOTYPE_ENVIRONMENT, SUBPATH_ENVIRONMENT
+)
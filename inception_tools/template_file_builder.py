@@ -11,17 +11,151 @@ __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Re
 __license__ = "Apache Software License 2.0"
 
 import os
+import threading
+from collections import OrderedDict
+from typing import Iterator, Optional, Union
 
-from jinja2 import Template
+from jinja2 import Environment, Template
 
 from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.archetype_source import ArchetypeSource
 from inception_tools.file_builder import FileBuilder
+from inception_tools.template_cache import (
+    CompiledTemplate,
+    default_template_cache,
+    TemplateCache,
+)
+from inception_tools.template_environment import TemplateEnvironment
+
+_MISSING = object()
+
+
+def _render_key(variables: tuple, context: dict) -> tuple:
+    # Returns the values, in the context, of the variables referenced by a template
+    # (see CompiledTemplate.variables), so that contexts with the same key render
+    # the same output.  Variables used only through their attributes contribute the
+    # values of those attributes, e.g., date.year rather than date.
+    key = []
+    for name, attributes in variables:
+        value = context.get(name, _MISSING)
+        if attributes is not None:
+            values = tuple(getattr(value, a, _MISSING) for a in attributes)
+            if not any(v is _MISSING for v in values):
+                key.append((True, values))
+                continue
+        key.append((False, value))
+    return tuple(key)
+
+
+class _RenderCache(object):
+    # A bounded, thread-safe LRU mapping of render keys to rendered content, holding
+    # at most max_size bytes of content.
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__()
+        self._max_size = max_size
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: tuple, content: bytes) -> None:
+        if len(content) > self._max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = content
+            self._size += len(content)
+            while self._size > self._max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+class _LazyPrototype(object):
+    # Reads and compiles (see TemplateCache.load) a prototype from an
+    # ArchetypeSource the first time it is rendered.  Compilation is guarded by a
+    # lock, since an archetype may be built by several threads at once.
+
+    def __init__(
+        self,
+        source: ArchetypeSource,
+        name: str,
+        template_cache: TemplateCache,
+        environment: Environment,
+    ) -> None:
+        super().__init__()
+        self._source = source
+        self._name = name
+        self._template_cache = template_cache
+        self._environment = environment
+        self._template = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._template is not None
+
+    def size(self) -> int:
+        return self._source.size(self._name)
+
+    def compiled(self) -> CompiledTemplate:
+        if self._template is None:
+            with self._lock:
+                if self._template is None:
+                    content = self._source.read_text(self._name)
+                    self._template = self._template_cache.load(
+                        self._environment, content
+                    )
+        return self._template
 
 
 class TemplateFileBuilder(FileBuilder):
     """
     This class uses :py:class:jinja2.Template` instances to create both the subpath
     and content of a file.
+
+    Templates which reference no variables, such as literal subpaths or empty
+    ``__init__.py`` prototypes, are folded into constants when they are compiled
+    (see :py:meth:`TemplateCache.fold`), so that rendering them costs nothing.
+
+    Other prototypes keep the content they render, in a bounded LRU cache shared by
+    every instance, keyed on the template and the values of the only variables it
+    references (see :py:attr:`CompiledTemplate.variables`).  When many projects are
+    built with the same archetype, e.g., by
+    :py:func:`inception_tools.batch.incept_batch`, files which depend only on
+    parameters the projects share, such as a ``LICENSE`` referencing ``author`` and
+    ``date.year``, are then rendered once.
+    """
+
+    RENDER_CACHE_SIZE = 1 << 22
+    """
+    The total size, in bytes, of the rendered contents kept by all instances
+    together, ``0`` disabling the cache.  The cache is created, with this size, when
+    the first instance is; set this attribute beforehand to change it.  Contents
+    larger than :py:attr:`RENDER_CACHE_ENTRY_SIZE` are never kept.
+    """
+
+    RENDER_CACHE_ENTRY_SIZE = 1 << 20
+    """
+    The size, in bytes, of the largest rendered content kept in the render cache.
+    """
+
+    STREAM_CHUNK_SIZE = 1 << 16
+    """
+    The approximate size, in characters, of the chunks yielded by
+    :py:meth:`iter_render_bytes` when streaming.
     """
 
     PATH_SEP = "/"
@@ -31,7 +165,13 @@ class TemplateFileBuilder(FileBuilder):
     """
 
     @classmethod
-    def from_strings(cls, subpath: str, prototype: str) -> FileBuilder:
+    def from_strings(
+        cls,
+        subpath: str,
+        prototype: str,
+        template_cache: Optional[TemplateCache] = None,
+        environment: Optional[TemplateEnvironment] = None,
+    ) -> FileBuilder:
         """
         Factory method that builds a new :py:class:`TemplateDirectoryBuilder`
         instance from :py:class:`jinja2.Template` source ``string``s, which will be
@@ -39,25 +179,114 @@ class TemplateFileBuilder(FileBuilder):
         from the ``params`` argument.
         :param subpath: the subpath template string
         :param prototype: the prototype template string
+        :param template_cache: the :py:class:`TemplateCache` used to compile the
+        templates, or :py:const:`None` to use the default cache
+        :param environment: the :py:class:`TemplateEnvironment` compiling the
+        templates, or :py:const:`None` to use :py:meth:`TemplateEnvironment.default`
         :return: the new instance
         .. seealso:: :py:meth:`__init__`
         """
-        s = Template(subpath)
-        p = Template(prototype, keep_trailing_newline=True)
-        return cls(s, p)
+        template_cache = template_cache or default_template_cache()
+        environment = environment or TemplateEnvironment.default()
+        s = template_cache.fold(environment.subpath, subpath)
+        p = template_cache.load(environment.prototype, prototype)
+        return cls(s, p, size_hint=len(prototype))
+
+    @classmethod
+    def from_source(
+        cls,
+        subpath: str,
+        source: ArchetypeSource,
+        prototype_name: str,
+        template_cache: Optional[TemplateCache] = None,
+        environment: Optional[TemplateEnvironment] = None,
+    ) -> FileBuilder:
+        """
+        Factory method like :py:meth:`from_strings`, except that the prototype is only
+        read from ``source`` and compiled the first time the instance renders, so that
+        prototypes which are never rendered cost nothing.  The subpath template is
+        compiled immediately.
+        :param subpath: the subpath template string
+        :param source: the :py:class:`ArchetypeSource` containing the prototype
+        :param prototype_name: the name of the prototype within ``source``
+        :param template_cache: the :py:class:`TemplateCache` used to compile the
+        templates, or :py:const:`None` to use the default cache
+        :param environment: the :py:class:`TemplateEnvironment` compiling the
+        templates, or :py:const:`None` to use :py:meth:`TemplateEnvironment.default`
+        :return: the new instance
+        """
+        template_cache = template_cache or default_template_cache()
+        environment = environment or TemplateEnvironment.default()
+        s = template_cache.fold(environment.subpath, subpath)
+        p = _LazyPrototype(
+            source, prototype_name, template_cache, environment.prototype
+        )
+        return cls(s, p, size_hint=None)
 
-    def __init__(self, subpath: Template, prototype: Template) -> None:
+    def __init__(
+        self,
+        subpath: Union[Template, str],
+        prototype: Union[Template, str, CompiledTemplate, _LazyPrototype],
+        size_hint: Optional[int] = 0,
+    ) -> None:
         """
         Initializes a new :py:class:`TemplateFileBuilder` instance.
         :param subpath: the template used to produce the return value of
-        :py:meth:`subpath`
+        :py:meth:`subpath`, or the rendered subpath itself, separated by
+        :py:attr:`PATH_SEP`, for subpaths which reference no variables
         :param prototype: the template used to produce the return value of
-        :py:meth:`subpath`
+        :py:meth:`render`, the rendered content itself, for prototypes which
+        reference no variables, or a :py:class:`CompiledTemplate`; only the latter
+        allows rendered content to be cached
+        :param size_hint: the return value of :py:meth:`size_hint`, typically the
+        length of the prototype source, or :py:const:`None` to take it from the
+        prototype's source the first time it is needed
         .. seealso:: :py:attr:`PATH_SET`, :py:meth:`subpath`, :py:meth:`render`
         """
         super().__init__()
         self._subpath = subpath
+        # Constant subpaths are converted to OS paths once and for all
+        self._os_subpath = self._os_path(subpath) if isinstance(subpath, str) else None
+        if isinstance(prototype, Template):
+            prototype = CompiledTemplate(prototype, None, None)
+        elif isinstance(prototype, str):
+            prototype = CompiledTemplate(None, prototype, ())
         self._prototype = prototype
+        self._size_hint = size_hint
+        # The encoded content of a constant prototype, set when first rendered
+        self._content = None
+        self._render_cache = _shared_render_cache()
+
+    def size_hint(self) -> int:
+        """
+        Returns the ``size_hint`` used to initialize this instance.
+        """
+        if self._size_hint is None:
+            self._size_hint = self._prototype.size()
+        return self._size_hint
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether the prototype template has been compiled.  Only instances created by
+        :py:meth:`from_source` compile it lazily.
+        """
+        return not isinstance(self._prototype, _LazyPrototype) or self._prototype.loaded
+
+    def load(self) -> None:
+        """
+        Reads and compiles the prototype template now, if it hasn't been already.
+        :return: :py:const:`None`
+        """
+        self._compiled_prototype()
+
+    def _compiled_prototype(self) -> CompiledTemplate:
+        p = self._prototype
+        return p.compiled() if isinstance(p, _LazyPrototype) else p
+
+    @classmethod
+    def _os_path(cls, subpath_raw: str) -> str:
+        return os.path.join(*subpath_raw.split(cls.PATH_SEP))
 
     def subpath(self, params: ArchetypeParameters) -> str:
         """
@@ -66,9 +295,9 @@ class TemplateFileBuilder(FileBuilder):
         replace any template variables.  The path, once rendered, is split using
         :py:attr:`PATH_SEP` and rejoined using the OS-specific path separator.
         """
-        subpath_raw = self._subpath.render(**params.as_dict())
-        subpath_split = subpath_raw.split(self.PATH_SEP)
-        return os.path.join(*subpath_split)
+        if self._os_subpath is not None:
+            return self._os_subpath
+        return self._os_path(self._subpath.render(**params.as_dict()))
 
     def render(self, params: ArchetypeParameters) -> str:
         """
@@ -76,4 +305,112 @@ class TemplateFileBuilder(FileBuilder):
         used to initialize this instance, using the named
         :py:class:`ArchetypeParameters` to replace any template variables.
         """
-        return self._prototype.render(**params.as_dict())
+        p = self._compiled_prototype()
+        if p.constant is not None:
+            return p.constant
+        return p.template.render(**params.as_dict())
+
+    def render_bytes(self, params: ArchetypeParameters) -> bytes:
+        """
+        Like :py:meth:`FileBuilder.render_bytes`, except that the content of
+        prototypes which reference no variables is only encoded once, and that
+        content rendered for the same values of the variables referenced is reused
+        (see :py:attr:`RENDER_CACHE_SIZE`).
+        """
+        p = self._compiled_prototype()
+        if p.constant is not None:
+            if self._content is None:
+                self._content = p.constant.encode(self.ENCODING)
+            return self._content
+
+        context = params.as_dict()
+        key = self._render_key(p, context)
+        if key is None:
+            return p.template.render(**context).encode(self.ENCODING)
+        content = self._render_cache.get(key)
+        if content is None:
+            content = p.template.render(**context).encode(self.ENCODING)
+            if len(content) <= self.RENDER_CACHE_ENTRY_SIZE:
+                self._render_cache.put(key, content)
+        return content
+
+    def iter_render_bytes(self, params: ArchetypeParameters) -> Iterator[bytes]:
+        """
+        Like :py:meth:`FileBuilder.iter_render_bytes`, except that the content of
+        prototypes which reference variables is produced incrementally, using
+        :py:meth:`jinja2.Template.generate`, in chunks of about
+        :py:attr:`STREAM_CHUNK_SIZE`, so that the memory used is bounded by the
+        chunk size rather than by the size of the content.  Content is still taken
+        from, and added to, the render cache when it fits (see
+        :py:attr:`RENDER_CACHE_ENTRY_SIZE`).
+        """
+        p = self._compiled_prototype()
+        if p.constant is not None:
+            yield self.render_bytes(params)
+            return
+
+        context = params.as_dict()
+        key = self._render_key(p, context)
+        content = None if key is None else self._render_cache.get(key)
+        if content is not None:
+            yield content
+            return
+
+        encoding, chunk_size = self.ENCODING, self.STREAM_CHUNK_SIZE
+        # The chunks yielded so far, kept while they fit in the render cache
+        cached, cached_size = ([], 0) if key is not None else (None, 0)
+        parts, size = [], 0
+        for s in p.template.generate(**context):
+            # Long runs of literal text are generated as a single string
+            for i in range(0, len(s), chunk_size):
+                part = s[i : i + chunk_size]
+                parts.append(part)
+                size += len(part)
+                if size >= chunk_size:
+                    chunk = "".join(parts).encode(encoding)
+                    parts, size = [], 0
+                    if cached is not None:
+                        cached.append(chunk)
+                        cached_size += len(chunk)
+                        if cached_size > self.RENDER_CACHE_ENTRY_SIZE:
+                            cached = None
+                    yield chunk
+        chunk = "".join(parts).encode(encoding)
+        if cached is not None and cached_size + len(chunk) <= (
+            self.RENDER_CACHE_ENTRY_SIZE
+        ):
+            cached.append(chunk)
+            self._render_cache.put(key, b"".join(cached))
+        if chunk:
+            yield chunk
+
+    def _render_key(self, p: CompiledTemplate, context: dict) -> Optional[tuple]:
+        # Returns the key of the content rendered in the context, or None when the
+        # content can't be cached
+        if p.variables is None or self.RENDER_CACHE_SIZE <= 0:
+            return None
+        # The template tells apart the contents of every instance sharing the cache
+        key = (p.template, _render_key(p.variables, context))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+
+_default_render_cache = None
+_default_render_cache_lock = threading.Lock()
+
+
+def _shared_render_cache() -> _RenderCache:
+    # Returns the process-wide _RenderCache shared by every TemplateFileBuilder, so
+    # that the memory it uses is bounded by TemplateFileBuilder.RENDER_CACHE_SIZE
+    # whatever the number of prototypes
+    global _default_render_cache
+    if _default_render_cache is None:
+        with _default_render_cache_lock:
+            if _default_render_cache is None:
+                _default_render_cache = _RenderCache(
+                    TemplateFileBuilder.RENDER_CACHE_SIZE
+                )
+    return _default_render_cache
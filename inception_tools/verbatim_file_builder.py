@@ -0,0 +1,183 @@
+"""
+verbatim_file_builder
+~~~~~~~~~~~~~~~~~~~~~
+
+Houses the declaration of :py:class:`VerbatimFileBuilder` along with supporting
+classes, functions, and attributes.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import os
+from typing import Iterator, Optional, Union
+
+from jinja2 import Template
+
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.archetype_source import ArchetypeSource
+from inception_tools.build_report import WriteStatus
+from inception_tools.file_builder import FileBuilder, open_replacement
+from inception_tools.file_copy import copy_fileobj, default_reflink
+from inception_tools.template_cache import default_template_cache, TemplateCache
+from inception_tools.template_environment import TemplateEnvironment
+from inception_tools.template_file_builder import TemplateFileBuilder
+
+
+class VerbatimFileBuilder(FileBuilder):
+    """
+    This class copies a member of an :py:class:`ArchetypeSource` as is, e.g., an
+    image or other binary asset, to a subpath created from a
+    :py:class:`jinja2.Template`.  The content is never decoded nor held in memory at
+    once: :py:meth:`build_at` copies it within the kernel when the platform allows
+    it (see :py:func:`inception_tools.file_copy.copy_fileobj`).
+    """
+
+    READ_CHUNK_SIZE = 1 << 16
+    """
+    The size of the chunks yielded by :py:meth:`iter_render_bytes`.
+    """
+
+    TRANSLATE_NEWLINES = False
+    """
+    Verbatim files are copied byte for byte, so their newlines are never translated.
+    """
+
+    PATH_SEP = TemplateFileBuilder.PATH_SEP
+    """
+    The path separator to use to write ``subpath`` templates (see
+    :py:attr:`TemplateFileBuilder.PATH_SEP`).
+    """
+
+    @classmethod
+    def from_source(
+        cls,
+        subpath: str,
+        source: ArchetypeSource,
+        name: str,
+        template_cache: Optional[TemplateCache] = None,
+        environment: Optional[TemplateEnvironment] = None,
+    ) -> FileBuilder:
+        """
+        Factory method that builds a new :py:class:`VerbatimFileBuilder` instance.
+        :param subpath: the subpath template string
+        :param source: the :py:class:`ArchetypeSource` containing the file to copy
+        :param name: the name of the file to copy within ``source``
+        :param template_cache: the :py:class:`TemplateCache` used to compile the
+        subpath template, or :py:const:`None` to use the default cache
+        :param environment: the :py:class:`TemplateEnvironment` compiling the subpath
+        template, or :py:const:`None` to use :py:meth:`TemplateEnvironment.default`
+        :return: the new instance
+        """
+        template_cache = template_cache or default_template_cache()
+        environment = environment or TemplateEnvironment.default()
+        s = template_cache.fold(environment.subpath, subpath)
+        return cls(s, source, name)
+
+    def __init__(
+        self,
+        subpath: Union[Template, str],
+        source: ArchetypeSource,
+        name: str,
+        reflink: Optional[bool] = None,
+    ) -> None:
+        """
+        Initializes a new :py:class:`VerbatimFileBuilder` instance.
+        :param subpath: the template used to produce the return value of
+        :py:meth:`subpath`, or the rendered subpath itself, separated by
+        :py:attr:`PATH_SEP`, for subpaths which reference no variables
+        :param source: the :py:class:`ArchetypeSource` containing the file to copy
+        :param name: the name of the file to copy within ``source``
+        :param reflink: whether to try cloning the file rather than copying it, or
+        :py:const:`None` to use
+        :py:func:`inception_tools.file_copy.default_reflink`
+        """
+        super().__init__()
+        self._subpath = subpath
+        self._os_subpath = self._os_path(subpath) if isinstance(subpath, str) else None
+        self._source = source
+        self._name = name
+        self._reflink = default_reflink() if reflink is None else reflink
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Always :py:const:`True`, since there is nothing to compile.
+        """
+        return True
+
+    def load(self) -> None:
+        """
+        Does nothing, since there is nothing to compile.
+        :return: :py:const:`None`
+        """
+
+    def size_hint(self) -> int:
+        """
+        Returns the size of the file to copy.
+        """
+        return self._source.size(self._name)
+
+    @classmethod
+    def _os_path(cls, subpath_raw: str) -> str:
+        return os.path.join(*subpath_raw.split(cls.PATH_SEP))
+
+    def subpath(self, params: ArchetypeParameters) -> str:
+        """
+        Creates the subpath like :py:meth:`TemplateFileBuilder.subpath`.
+        """
+        if self._os_subpath is not None:
+            return self._os_subpath
+        return self._os_path(self._subpath.render(**params.as_dict()))
+
+    def render(self, params: ArchetypeParameters) -> str:
+        """
+        Returns the content of the file decoded using :py:attr:`ENCODING`, which
+        fails for binary files.  Prefer :py:meth:`render_bytes`.
+        """
+        return self.render_bytes(params).decode(self.ENCODING)
+
+    def render_bytes(self, params: ArchetypeParameters) -> bytes:
+        """
+        Returns the content of the file, unchanged.
+        """
+        with self._source.open_binary(self._name) as f:
+            return f.read()
+
+    def iter_render_bytes(self, params: ArchetypeParameters) -> Iterator[bytes]:
+        """
+        Yields the content of the file, unchanged, in chunks of
+        :py:attr:`READ_CHUNK_SIZE`.
+        """
+        with self._source.open_binary(self._name) as f:
+            yield from iter(lambda: f.read(self.READ_CHUNK_SIZE), b"")
+
+    def build_at(
+        self, path: str, params: ArchetypeParameters, incremental: bool = False
+    ) -> str:
+        """
+        Like :py:meth:`FileBuilder.build_at`, except that, unless ``incremental``, the
+        file is copied to ``path`` with
+        :py:func:`inception_tools.file_copy.copy_fileobj`, without passing through
+        user space when both files are plain files.  An existing file is replaced
+        rather than overwritten, as by :py:meth:`FileBuilder.build_at`.
+        """
+        if incremental:
+            return super().build_at(path, params, incremental)
+
+        with self._source.open_binary(self._name) as src:
+            try:
+                dst = open(path, "xb")
+            except FileExistsError:
+                # Replaced, so that it is left intact should copying fail
+                with open_replacement(path) as dst:
+                    copy_fileobj(src, dst, self._reflink)
+                return WriteStatus.WRITTEN
+            try:
+                with dst:
+                    copy_fileobj(src, dst, self._reflink)
+            except BaseException:
+                os.unlink(path)
+                raise
+        return WriteStatus.CREATED
@@ -0,0 +1,31 @@
+"""
+    conftest
+    ~~~~~~~~
+
+    Houses the :py:mod:`pytest` fixtures shared by all test cases.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import pytest
+
+from inception_tools import archetype_cache, template_cache, template_file_builder
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """
+    Points :py:func:`inception_tools.template_cache.default_cache_dir` at a
+    temporary directory for each test case, so that tests neither read nor write
+    the user's cache, and depend on no state left by earlier runs.  The process-wide
+    default caches are reset, so that they are created anew under that directory, as is
+    the render cache shared by template file builders.
+    """
+    cache_dir = tmp_path / "inception_tools_cache"
+    monkeypatch.setenv(template_cache.CACHE_DIR_ENV_VAR, str(cache_dir))
+    monkeypatch.setattr(template_cache, "_default_template_cache", None)
+    monkeypatch.setattr(archetype_cache, "_default_archetype_cache", None)
+    monkeypatch.setattr(template_file_builder, "_default_render_cache", None)
+    return str(cache_dir)
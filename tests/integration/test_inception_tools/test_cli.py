@@ -9,7 +9,10 @@ __author__ = "Andrew van Herick"
 __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
 __license__ = "Apache Software License 2.0"
 
+import io
+import json
 import os
+import tarfile
 from unittest import mock
 
 from click.testing import CliRunner
@@ -109,7 +112,7 @@ class TestIncept(ArchetypeOutputTestBase):
 
     # Instance methods
 
-    def _validate_incept_for_archetype(self, archetype):
+    def _validate_incept_for_archetype(self, archetype, *args):
         result = CliRunner().invoke(
             cli.cli,
             (
@@ -122,7 +125,8 @@ class TestIncept(ArchetypeOutputTestBase):
                 self._AUTHOR_EMAIL,
                 "--archetype",
                 archetype.canonical_name,
-            ),
+            )
+            + args,
         )
         assert_that(result.output.strip(), is_(""))
         self._validate_archetype_files(self._ROOT_DIR, self._expected_files(archetype))
@@ -155,6 +159,66 @@ class TestIncept(ArchetypeOutputTestBase):
         mock_datetime.now.return_value = self._DATE
         self._validate_incept_for_archetype(StandardArchetype.SIMPLE)
 
+    @mock.patch("inception_tools.cli.datetime")
+    def test_incept_builds_concurrently(self, mock_datetime):
+        """
+        Unit test case for :py:func:`inception_tools.cli.incept`.
+        """
+        mock_datetime.now.return_value = self._DATE
+        self._validate_incept_for_archetype(StandardArchetype.CLI, "--jobs", "4")
+
+    def test_incept_plans_without_building(self):
+        """
+        Unit test case for :py:func:`inception_tools.cli.incept`.
+        """
+        result = CliRunner().invoke(
+            cli.cli,
+            (
+                "incept",
+                self._PACKAGE_NAME,
+                self._ROOT_DIR,
+                "--archetype",
+                StandardArchetype.SIMPLE.canonical_name,
+                "--plan",
+            ),
+        )
+        records = [json.loads(line) for line in result.output.splitlines()]
+        actual = [r["path"] for r in records if r["kind"] == "directory"]
+        assert_that(actual, is_([os.path.join(self._ROOT_DIR, "tests")]))
+        assert_that(records[0]["kind"], is_("directory"))
+        actual = sorted(r["path"] for r in records if r["kind"] == "file")
+        expected = sorted(
+            os.path.join(self._ROOT_DIR, *s)
+            for s in self._EXPECTED_FILES[StandardArchetype.SIMPLE]
+        )
+        assert_that(actual, is_(expected))
+        self._validate_path_doesnt_exist(self._ROOT_DIR)
+
+    def test_incept_streams_output_archive(self):
+        """
+        Unit test case for :py:func:`inception_tools.cli.incept`.
+        """
+        result = CliRunner().invoke(
+            cli.cli,
+            (
+                "incept",
+                self._PACKAGE_NAME,
+                self._ROOT_DIR,
+                "--archetype",
+                StandardArchetype.SIMPLE.canonical_name,
+                "--output-archive",
+                "-",
+            ),
+        )
+        with tarfile.open(fileobj=io.BytesIO(result.stdout_bytes), mode="r:gz") as tar:
+            actual = sorted(m.name for m in tar.getmembers() if m.isfile())
+        expected = sorted(
+            "/".join((self._ROOT_DIR,) + s)
+            for s in self._EXPECTED_FILES[StandardArchetype.SIMPLE]
+        )
+        assert_that(actual, is_(expected))
+        self._validate_path_doesnt_exist(self._ROOT_DIR)
+
     def test_incept_uses_custom_logging_config(self):
         """
         Unit test case for :py:func:`inception_tools.cli.incept`.
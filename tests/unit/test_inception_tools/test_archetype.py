@@ -0,0 +1,131 @@
+"""
+    test_archetype
+    ~~~~~~~~~~~~~~
+
+    Unit test cases for the :py:mod:`archetype` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import datetime
+import hashlib
+import os
+from unittest import mock
+
+from hamcrest import assert_that, is_
+
+from inception_tools import file_builder
+from inception_tools.archetype import Archetype
+from inception_tools.archetype_base import ArchetypeBase
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.plan_record import PlanRecord, ResourceKind
+from inception_tools.template_directory_builder import TemplateDirectoryBuilder
+from inception_tools.template_file_builder import TemplateFileBuilder
+from tests.file_matcher import not_exists
+
+
+class _DelegatingArchetype(Archetype):
+    # Implements only the abstract methods of Archetype, so that the default
+    # implementations of the others are used
+    def __init__(self, archetype: Archetype) -> None:
+        super().__init__()
+        self._archetype = archetype
+
+    def file_paths(self, root_path, params):
+        return self._archetype.file_paths(root_path, params)
+
+    def dir_paths(self, root_path, params):
+        return self._archetype.dir_paths(root_path, params)
+
+    def build(
+        self, root_dir, params, jobs=None, incremental=False, sink=None, observers=None
+    ):
+        return self._archetype.build(
+            root_dir, params, jobs, incremental, sink, observers
+        )
+
+
+class TestArchetype(object):
+    """
+    Unit test for class :py:class:`Archetype`.
+    """
+
+    ##############################
+    # Class attributes
+
+    _ROOT_DIR = "some_root_dir"
+
+    _PARAMS = ArchetypeParameters(
+        "some_package", "some_author", "some_email", datetime.date(2000, 1, 1)
+    )
+
+    _ARCHETYPE = _DelegatingArchetype(
+        ArchetypeBase(
+            (
+                TemplateFileBuilder.from_strings(
+                    "{{package_name}}/some_file", "{{author}}\n"
+                ),
+            ),
+            (TemplateDirectoryBuilder("some_dir"),),
+        )
+    )
+
+    # Test cases
+
+    def test_iter_render(self):
+        """
+        Unit test case for :py:method:`Archetype.iter_render`.
+        """
+        actual = tuple(self._ARCHETYPE.iter_render(self._ROOT_DIR, self._PARAMS))
+        expected = (
+            (os.path.join("some_root_dir", "some_dir"), None),
+            (os.path.join("some_root_dir", "some_package"), None),
+            (
+                os.path.join("some_root_dir", "some_package", "some_file"),
+                b"some_author\n",
+            ),
+        )
+        assert_that(actual, is_(expected))
+        assert_that(self._ROOT_DIR, not_exists())
+
+    def test_plan(self):
+        """
+        Unit test case for :py:method:`Archetype.plan`.
+        """
+        actual = tuple(self._ARCHETYPE.plan(self._ROOT_DIR, self._PARAMS))
+        expected = (
+            PlanRecord(
+                os.path.join("some_root_dir", "some_dir"),
+                ResourceKind.DIRECTORY,
+                None,
+                None,
+                False,
+            ),
+            PlanRecord(
+                os.path.join("some_root_dir", "some_package"),
+                ResourceKind.DIRECTORY,
+                None,
+                None,
+                False,
+            ),
+            PlanRecord(
+                os.path.join("some_root_dir", "some_package", "some_file"),
+                ResourceKind.FILE,
+                len(b"some_author\n"),
+                hashlib.sha256(b"some_author\n").hexdigest(),
+                False,
+            ),
+        )
+        assert_that(actual, is_(expected))
+
+    @mock.patch.object(file_builder, "_NEWLINE", b"\r\n")
+    def test_plan_translates_newlines(self):
+        """
+        Unit test case for :py:method:`Archetype.plan`.
+        """
+        actual = tuple(self._ARCHETYPE.plan(self._ROOT_DIR, self._PARAMS))[-1]
+        assert_that(actual.size, is_(len(b"some_author\r\n")))
+        expected = hashlib.sha256(b"some_author\r\n").hexdigest()
+        assert_that(actual.digest, is_(expected))
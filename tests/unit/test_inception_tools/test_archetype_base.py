@@ -9,17 +9,27 @@ __author__ = "Andrew van Herick"
 __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
 __license__ = "Apache Software License 2.0"
 
+import hashlib
+import io
 import os
 import shutil
+from unittest import mock
 
 from hamcrest import assert_that, is_
+from pytest import raises
 
+from inception_tools import file_builder
 from inception_tools.archetype_base import ArchetypeBase
 from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.archetype_source import ArchetypeSource
+from inception_tools.build_observer import BuildEventType, BuildObserver, BuildPhase
+from inception_tools.build_report import BuildReport
 from inception_tools.directory_builder import DirectoryBuilder
 from inception_tools.file_builder import FileBuilder
+from inception_tools.plan_record import PlanRecord, ResourceKind
+from inception_tools.verbatim_file_builder import VerbatimFileBuilder
 from tests.archetype_output_test_base import ArchetypeOutputTestBase
-from tests.file_matcher import exists, is_dir, is_file
+from tests.file_matcher import exists, is_dir, is_file, not_exists
 
 
 class _MockFileBuilder(FileBuilder):
@@ -35,6 +45,15 @@ class _MockFileBuilder(FileBuilder):
         return self.render_value
 
 
+class _FailingFileBuilder(_MockFileBuilder):
+    def __init__(self, subpath, exception) -> None:
+        super().__init__(subpath, None)
+        self.exception = exception
+
+    def render(self, params: ArchetypeParameters) -> str:
+        raise self.exception
+
+
 class _MockDirBuilder(DirectoryBuilder):
     def __init__(self, subpath) -> None:
         super().__init__()
@@ -44,6 +63,43 @@ class _MockDirBuilder(DirectoryBuilder):
         return self.subpath_value
 
 
+class _CountingFileBuilder(_MockFileBuilder):
+    def __init__(self, subpath, render_content) -> None:
+        super().__init__(subpath, render_content)
+        self.subpath_calls = 0
+
+    def subpath(self, params: ArchetypeParameters) -> str:
+        self.subpath_calls += 1
+        return super().subpath(params)
+
+
+class _CountingDirBuilder(_MockDirBuilder):
+    def __init__(self, subpath) -> None:
+        super().__init__(subpath)
+        self.subpath_calls = 0
+
+    def subpath(self, params: ArchetypeParameters) -> str:
+        self.subpath_calls += 1
+        return super().subpath(params)
+
+
+class _RecordingObserver(BuildObserver):
+    def __init__(self) -> None:
+        self.events = []
+
+    def build_started(self, event):
+        self.events.append(event)
+
+    def resource_started(self, event):
+        self.events.append(event)
+
+    def resource_ended(self, event):
+        self.events.append(event)
+
+    def build_ended(self, event):
+        self.events.append(event)
+
+
 class TestArchetypeBase(object):
     """
     Unit test for class :py:class:`ArchetypeBase`.
@@ -122,6 +178,240 @@ class TestArchetypeBase(object):
             assert_that(path, exists())
             assert_that(path, is_dir())
 
+    def test_build_concurrently_creates_files(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        self._archetype.build(self._ROOT_DIR, self._PARAMS, jobs=4)
+
+        file_paths = (
+            os.path.join("some_root_dir", "some_file"),
+            os.path.join("some_root_dir", "some_other_file"),
+        )
+        contents = ("some_content", "some_other_content")
+        for path, expected in zip(file_paths, contents):
+            assert_that(path, is_file())
+            with open(path) as f:
+                actual = f.read()
+            assert_that(actual, is_(expected))
+
+    def test_build_concurrently_creates_directories(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        archetype = ArchetypeBase(
+            (_MockFileBuilder(os.path.join("a", "b", "some_file"), "some_content"),),
+            (_MockDirBuilder(os.path.join("a", "b", "c")), _MockDirBuilder("a")),
+        )
+        archetype.build(self._ROOT_DIR, self._PARAMS, jobs=4)
+
+        for path in ("a", os.path.join("a", "b"), os.path.join("a", "b", "c")):
+            assert_that(os.path.join(self._ROOT_DIR, path), is_dir())
+
+    def test_build_concurrently_raises_first_error(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        first_error = ValueError("some_error")
+        archetype = ArchetypeBase(
+            (
+                _MockFileBuilder("some_file", "some_content"),
+                _FailingFileBuilder("some_failing_file", first_error),
+                _FailingFileBuilder("some_other_file", KeyError("some_other_error")),
+            ),
+            (),
+        )
+        with raises(ValueError) as exc_info:
+            archetype.build(self._ROOT_DIR, self._PARAMS, jobs=4)
+        assert_that(exc_info.value, is_(first_error))
+
+    def test_build_reports_created_files(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        actual = self._archetype.build(self._ROOT_DIR, self._PARAMS)
+        assert_that(actual, is_(BuildReport(created=2, written=0, unchanged=0)))
+
+    def test_build_incremental_reports_unchanged_files(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        self._archetype.build(self._ROOT_DIR, self._PARAMS)
+        with open(os.path.join(self._ROOT_DIR, "some_file"), "w") as f:
+            f.write("some_changed_content")
+
+        actual = self._archetype.build(self._ROOT_DIR, self._PARAMS, incremental=True)
+
+        assert_that(actual, is_(BuildReport(created=0, written=1, unchanged=1)))
+
+    def test_build_concurrently_reports_files(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        self._archetype.build(self._ROOT_DIR, self._PARAMS)
+        actual = self._archetype.build(
+            self._ROOT_DIR, self._PARAMS, jobs=4, incremental=True
+        )
+        assert_that(actual, is_(BuildReport(created=0, written=0, unchanged=2)))
+
+    def test_plan(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.plan`.
+        """
+        actual = tuple(self._archetype.plan(self._ROOT_DIR, self._PARAMS))
+        expected = (
+            PlanRecord(
+                os.path.join("some_root_dir", "some_dir"),
+                ResourceKind.DIRECTORY,
+                None,
+                None,
+                False,
+            ),
+            PlanRecord(
+                os.path.join("some_root_dir", "some_other_dir"),
+                ResourceKind.DIRECTORY,
+                None,
+                None,
+                False,
+            ),
+            PlanRecord(
+                os.path.join("some_root_dir", "some_file"),
+                ResourceKind.FILE,
+                len(b"some_content"),
+                hashlib.sha256(b"some_content").hexdigest(),
+                False,
+            ),
+            PlanRecord(
+                os.path.join("some_root_dir", "some_other_file"),
+                ResourceKind.FILE,
+                len(b"some_other_content"),
+                hashlib.sha256(b"some_other_content").hexdigest(),
+                False,
+            ),
+        )
+        assert_that(actual, is_(expected))
+        assert_that(self._ROOT_DIR, not_exists())
+
+    @mock.patch.object(file_builder, "_NEWLINE", b"\r\n")
+    def test_plan_matches_built_files(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.plan`.
+        """
+        archetype = ArchetypeBase(
+            (_MockFileBuilder("some_file", "some\ncontent\n"),), ()
+        )
+        (actual,) = archetype.plan(self._ROOT_DIR, self._PARAMS)
+        archetype.build(self._ROOT_DIR, self._PARAMS)
+        with open(actual.path, "rb") as f:
+            content = f.read()
+        assert_that(content, is_(b"some\r\ncontent\r\n"))
+        assert_that(actual.size, is_(len(content)))
+        assert_that(actual.digest, is_(hashlib.sha256(content).hexdigest()))
+
+    def test_plan_reports_existing_paths(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.plan`.
+        """
+        self._archetype.build(self._ROOT_DIR, self._PARAMS)
+        actual = [r.exists for r in self._archetype.plan(self._ROOT_DIR, self._PARAMS)]
+        assert_that(actual, is_([True, True, True, True]))
+
+    def test_plan_lists_implicit_directories_first(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.plan`.
+        """
+        archetype = ArchetypeBase(
+            (_MockFileBuilder(os.path.join("a", "b", "some_file"), "some_content"),),
+            (_MockDirBuilder(os.path.join("a", "c")),),
+        )
+        actual = [
+            (r.path, r.kind) for r in archetype.plan(self._ROOT_DIR, self._PARAMS)
+        ]
+        expected = [
+            (os.path.join("some_root_dir", "a"), ResourceKind.DIRECTORY),
+            (os.path.join("some_root_dir", "a", "b"), ResourceKind.DIRECTORY),
+            (os.path.join("some_root_dir", "a", "c"), ResourceKind.DIRECTORY),
+            (os.path.join("some_root_dir", "a", "b", "some_file"), ResourceKind.FILE),
+        ]
+        assert_that(actual, is_(expected))
+
+    def test_iter_render(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.iter_render`.
+        """
+        archetype = ArchetypeBase(
+            (_MockFileBuilder(os.path.join("some_dir", "some_file"), "some_content"),),
+            (_MockDirBuilder("some_other_dir"),),
+        )
+        actual = tuple(archetype.iter_render(self._ROOT_DIR, self._PARAMS))
+        expected = (
+            (os.path.join("some_root_dir", "some_dir"), None),
+            (os.path.join("some_root_dir", "some_other_dir"), None),
+            (os.path.join("some_root_dir", "some_dir", "some_file"), b"some_content"),
+        )
+        assert_that(actual, is_(expected))
+        assert_that(self._ROOT_DIR, not_exists())
+
+    def test_render_to_mapping(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.render_to_mapping`.
+        """
+        with mock.patch("builtins.open") as mock_open, mock.patch(
+            "os.mkdir"
+        ) as mock_mkdir:
+            actual = self._archetype.render_to_mapping(self._ROOT_DIR, self._PARAMS)
+        expected = {
+            os.path.join("some_root_dir", "some_dir"): None,
+            os.path.join("some_root_dir", "some_other_dir"): None,
+            os.path.join("some_root_dir", "some_file"): b"some_content",
+            os.path.join("some_root_dir", "some_other_file"): b"some_other_content",
+        }
+        assert_that(actual, is_(expected))
+        assert_that(mock_open.called, is_(False))
+        assert_that(mock_mkdir.called, is_(False))
+
+    def test_build_creates_each_directory_once(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        file_builders = tuple(
+            _MockFileBuilder(os.path.join(f"dir_{i % 2}", "sub", f"file_{i}"), "")
+            for i in range(10)
+        )
+        dir_builders = (_MockDirBuilder("dir_0"), _MockDirBuilder("empty_dir"))
+        archetype = ArchetypeBase(file_builders, dir_builders)
+
+        with mock.patch("os.mkdir", wraps=os.mkdir) as mock_mkdir:
+            archetype.build(self._ROOT_DIR, self._PARAMS)
+
+        actual = [c.args[0] for c in mock_mkdir.call_args_list]
+        expected = [
+            os.path.join(self._ROOT_DIR, "dir_0"),
+            os.path.join(self._ROOT_DIR, "dir_1"),
+            os.path.join(self._ROOT_DIR, "empty_dir"),
+            os.path.join(self._ROOT_DIR, "dir_0", "sub"),
+            os.path.join(self._ROOT_DIR, "dir_1", "sub"),
+        ]
+        # The root directory itself is created first, by os.makedirs
+        assert_that(actual[1:], is_(expected))
+        for p in file_builders:
+            assert_that(p.path(self._ROOT_DIR, self._PARAMS), is_file())
+
+    def test_build_resolves_each_path_once(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        file_builder = _CountingFileBuilder("some_file", "some_content")
+        dir_builder = _CountingDirBuilder("some_dir")
+        archetype = ArchetypeBase((file_builder,), (dir_builder,))
+
+        archetype.file_paths(self._ROOT_DIR, self._PARAMS)
+        archetype.dir_paths(self._ROOT_DIR, self._PARAMS)
+        archetype.build(self._ROOT_DIR, self._PARAMS)
+
+        assert_that(file_builder.subpath_calls, is_(1))
+        assert_that(dir_builder.subpath_calls, is_(1))
+
     def test_file_paths(self):
         """
         Unit test case for :py:method:`ArchetypeBase.file_paths`.
@@ -143,3 +433,86 @@ class TestArchetypeBase(object):
             os.path.join("some_root_dir", "some_other_dir"),
         )
         assert_that(actual, is_(expected))
+
+    def test_build_notifies_observers(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        observer = _RecordingObserver()
+        self._archetype.build(self._ROOT_DIR, self._PARAMS, observers=[observer])
+
+        actual = [(e.event_type, e.path, e.kind, e.size) for e in observer.events]
+        expected = [
+            (BuildEventType.BUILD_START, self._ROOT_DIR, None, None),
+        ]
+        for kind, subpath, size in (
+            (ResourceKind.DIRECTORY, "some_dir", 0),
+            (ResourceKind.DIRECTORY, "some_other_dir", 0),
+            (ResourceKind.FILE, "some_file", 12),
+            (ResourceKind.FILE, "some_other_file", 18),
+        ):
+            path = os.path.join(self._ROOT_DIR, subpath)
+            expected.append((BuildEventType.RESOURCE_START, path, kind, None))
+            expected.append((BuildEventType.RESOURCE_END, path, kind, size))
+        expected.append((BuildEventType.BUILD_END, self._ROOT_DIR, None, 30))
+        assert_that(actual, is_(expected))
+
+        for e in observer.events:
+            if e.event_type == BuildEventType.RESOURCE_END:
+                assert_that(set(e.phases), is_(set(BuildPhase.ALL)))
+                assert_that(e.duration, is_(sum(e.phases.values())))
+
+    def test_build_observed_uses_builders_build_at(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        content = b"\x89PNG\r\n\x1a\n\xff"
+        source = mock.Mock(spec=ArchetypeSource)
+        source.open_binary.side_effect = lambda name: io.BytesIO(content)
+        source.size.return_value = len(content)
+        archetype = ArchetypeBase(
+            (VerbatimFileBuilder("some_file.png", source, "logo.png", False),), ()
+        )
+        observer = _RecordingObserver()
+        with mock.patch.object(file_builder, "_NEWLINE", b"\r\n"):
+            with mock.patch.object(
+                VerbatimFileBuilder,
+                "build_at",
+                autospec=True,
+                side_effect=VerbatimFileBuilder.build_at,
+            ) as mock_build_at:
+                archetype.build(self._ROOT_DIR, self._PARAMS, observers=[observer])
+
+        assert_that(mock_build_at.call_count, is_(1))
+        with open(os.path.join(self._ROOT_DIR, "some_file.png"), "rb") as f:
+            assert_that(f.read(), is_(content))
+        actual = observer.events[-2]
+        assert_that(actual.event_type, is_(BuildEventType.RESOURCE_END))
+        assert_that(actual.size, is_(len(content)))
+
+    def test_build_notifies_registered_observers(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.add_observer` and
+        :py:method:`ArchetypeBase.remove_observer`.
+        """
+        observer = _RecordingObserver()
+        self._archetype.add_observer(observer)
+        self._archetype.build(self._ROOT_DIR, self._PARAMS, jobs=4)
+        assert_that(len(observer.events), is_(10))
+
+        self._archetype.remove_observer(observer)
+        self._archetype.build(self._ROOT_DIR, self._PARAMS, jobs=4)
+        assert_that(len(observer.events), is_(10))
+        assert_that(self._archetype.observers, is_(()))
+
+    def test_build_without_observers_creates_no_events(self):
+        """
+        Unit test case for :py:method:`ArchetypeBase.build`.
+        """
+        with mock.patch(
+            "inception_tools.archetype_base.BuildEvent"
+        ) as mock_build_event:
+            self._archetype.build(self._ROOT_DIR, self._PARAMS)
+        assert_that(mock_build_event.called, is_(False))
+        for p in self._archetype.file_paths(self._ROOT_DIR, self._PARAMS):
+            assert_that(p, is_file())
@@ -0,0 +1,137 @@
+"""
+test_archetype_cache
+~~~~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`archetype_cache` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from hamcrest import assert_that, is_
+
+from inception_tools.archetype_cache import ArchetypeCache
+from inception_tools.archetype_metadata import ArchetypeMetadata
+from inception_tools.archetype_source import (
+    DirectorySource,
+    METADATA_FILE_NAME,
+    PackageSource,
+)
+from inception_tools.standard_archetype import StandardArchetype
+
+
+class TestArchetypeCache(object):
+    """
+    Unit test for class :py:class:`ArchetypeCache`.
+    """
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._tmp_dir = tempfile.mkdtemp()
+        self._cache_dir = os.path.join(self._tmp_dir, "cache")
+        self._dir_path = os.path.join(self._tmp_dir, "archetype")
+        shutil.copytree(StandardArchetype.SIMPLE.dir_path, self._dir_path)
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._tmp_dir)
+
+    def _write_metadata(self, archetype_id, keep_stat=False):
+        path = os.path.join(self._dir_path, METADATA_FILE_NAME)
+        st = os.stat(path)
+        metadata = ArchetypeMetadata("some_group", archetype_id, "1.0")
+        with open(path, "w") as f:
+            json.dump(metadata.to_json(), f)
+        if keep_stat:
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return metadata
+
+    def _load(self, verify_content=False):
+        cache = ArchetypeCache(self._cache_dir, verify_content)
+        return cache, cache.load(DirectorySource(self._dir_path))
+
+    # Test cases
+
+    def test_load(self):
+        """
+        Unit test case for :py:meth:`ArchetypeCache.load`.
+        """
+        cache, expected = self._load()
+        assert_that((cache.hits, cache.misses), is_((0, 1)))
+
+        with mock.patch.object(ArchetypeMetadata, "from_text_io") as mock_from_text_io:
+            cache, actual = self._load()
+        assert_that(actual, is_(expected))
+        assert_that((cache.hits, cache.misses), is_((1, 0)))
+        assert_that(mock_from_text_io.called, is_(False))
+
+    def test_load_detects_changed_files(self):
+        """
+        Unit test case for :py:meth:`ArchetypeCache.load`.
+        """
+        self._load()
+        expected = self._write_metadata("some_longer_archetype_id")
+
+        cache, (actual, _) = self._load()
+        assert_that(actual, is_(expected))
+        assert_that(cache.misses, is_(1))
+
+    def test_load_verifies_content(self):
+        """
+        Unit test case for :py:meth:`ArchetypeCache.load`.
+        """
+        original = self._write_metadata("archetype_a")
+        self._load()
+        expected = self._write_metadata("archetype_b", keep_stat=True)
+
+        _, (actual, _) = self._load()
+        assert_that(actual, is_(original))
+        cache, (actual, _) = self._load(verify_content=True)
+        assert_that(actual, is_(expected))
+        assert_that(cache.misses, is_(1))
+
+    @mock.patch.object(ArchetypeCache, "MAX_ENTRIES", 1)
+    def test_load_prunes_oldest_entries(self):
+        """
+        Unit test case for :py:meth:`ArchetypeCache.load`.
+        """
+        cache = ArchetypeCache(self._cache_dir)
+        os.makedirs(cache.dir_path)
+        stale_path = os.path.join(cache.dir_path, "stale" + cache.CACHE_FILE_SUFFIX)
+        with open(stale_path, "wb"):
+            pass
+        os.utime(stale_path, (0, 0))
+
+        cache.load(DirectorySource(self._dir_path))
+        assert_that(os.path.exists(stale_path), is_(False))
+        assert_that(len(os.listdir(cache.dir_path)), is_(1))
+
+    def test_load_skips_sources_without_signatures(self):
+        """
+        Unit test case for :py:meth:`ArchetypeCache.load`.
+        """
+        resource_dir = "data/archetypes/" + os.path.basename(
+            StandardArchetype.SIMPLE.dir_path
+        )
+        cache = ArchetypeCache(self._cache_dir)
+        metadata, _ = cache.load(PackageSource("inception_tools", resource_dir))
+        assert_that(metadata.archetype_id, is_("simple"))
+        assert_that(os.path.exists(cache.dir_path), is_(False))
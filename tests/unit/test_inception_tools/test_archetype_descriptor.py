@@ -10,12 +10,15 @@ __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Re
 __license__ = "Apache Software License 2.0"
 
 from hamcrest import assert_that, is_
+from pytest import raises
 
 from inception_tools.archetype_descriptor import (
     ArchetypeDescriptor,
     DirectoryDescriptor,
     FileDescriptor,
+    FileKind,
 )
+from inception_tools.json_serializable import JsonSerializationError
 
 
 class TestArchetypeDescriptor(object):
@@ -36,6 +39,11 @@ class TestArchetypeDescriptor(object):
                 "subpath": "some_file_subpath_2",
                 "prototype": "some_prototype_2",
             },
+            {
+                "subpath": "some_file_subpath_3",
+                "prototype": "some_asset_3",
+                "kind": "verbatim",
+            },
         ],
         "directories": [
             {"subpath": "some_directory_subpath_1"},
@@ -47,6 +55,7 @@ class TestArchetypeDescriptor(object):
         (
             FileDescriptor("some_file_subpath_1", "some_prototype_1"),
             FileDescriptor("some_file_subpath_2", "some_prototype_2"),
+            FileDescriptor("some_file_subpath_3", "some_asset_3", FileKind.VERBATIM),
         ),
         (
             DirectoryDescriptor("some_directory_subpath_1"),
@@ -74,3 +83,25 @@ class TestArchetypeDescriptor(object):
         actual = self._ARCHETYPE_DESCRIPTOR.to_json()
         expected = self._JSON_OBJ
         assert_that(actual, is_(expected))
+
+    def test_from_json_explicit_template_kind(self):
+        """
+        Unit test case for :py:method:`ArchetypeDescriptor.from_json`.
+        """
+        json_obj = {
+            "files": [{"subpath": "s", "prototype": "p", "kind": "template"}],
+            "directories": [],
+        }
+        actual = ArchetypeDescriptor.from_json(json_obj)
+        assert_that(actual.files, is_((FileDescriptor("s", "p"),)))
+
+    def test_from_json_unknown_kind(self):
+        """
+        Unit test case for :py:method:`ArchetypeDescriptor.from_json`.
+        """
+        json_obj = {
+            "files": [{"subpath": "s", "prototype": "p", "kind": "some_kind"}],
+            "directories": [],
+        }
+        with raises(JsonSerializationError):
+            ArchetypeDescriptor.from_json(json_obj)
@@ -48,6 +48,23 @@ class TestArchetypeMetadata(object):
         with raises(JsonSerializationError):
             ArchetypeMetadata.from_json(json_obj)
 
+    def test_from_json_skips_validation(self):
+        """
+        Unit test case for :py:method:`ArchetypeMetadata.from_json`.
+        """
+        json_obj = dict(self._JSON_OBJ)
+        json_obj["archetype_id"] = 5
+        actual = ArchetypeMetadata.from_json(json_obj, validate=False)
+        assert_that(actual.archetype_id, is_(5))
+
+    def test_json_validator_is_reused(self):
+        """
+        Unit test case for :py:method:`ArchetypeMetadata.json_validator`.
+        """
+        actual = ArchetypeMetadata.json_validator()
+        assert_that(actual.schema, is_(ArchetypeMetadata.JSON_SCHEMA))
+        assert_that(ArchetypeMetadata.json_validator() is actual, is_(True))
+
     def test_from_json_allows_additional_keys(self):
         """
         Unit test case for :py:method:`ArchetypeMetadata.from_json`.
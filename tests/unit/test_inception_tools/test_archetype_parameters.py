@@ -13,6 +13,7 @@ __license__ = "Apache Software License 2.0"
 import datetime
 
 from hamcrest import assert_that, is_
+from pytest import raises
 
 from inception_tools.archetype_parameters import ArchetypeParameters
 
@@ -62,3 +63,30 @@ class TestArchetypeParameters(object):
         actual = self._DATE
         expected = self._PARAMS.date
         assert_that(actual, is_(expected))
+
+    def test_as_dict(self):
+        """
+        Unit test case for :py:method:`ArchetypeParameters.as_dict`.
+        """
+        actual = self._PARAMS.as_dict()
+        expected = {
+            "package_name": self._PACKAGE_NAME,
+            "author": self._AUTHOR,
+            "author_email": self._AUTHOR_EMAIL,
+            "date": self._DATE,
+        }
+        assert_that(actual, is_(expected))
+
+    def test_as_dict_is_computed_once(self):
+        """
+        Unit test case for :py:method:`ArchetypeParameters.as_dict`.
+        """
+        assert_that(self._PARAMS.as_dict() is self._PARAMS.as_dict(), is_(True))
+
+    def test_as_dict_is_read_only(self):
+        """
+        Unit test case for :py:method:`ArchetypeParameters.as_dict`.
+        """
+        with raises(TypeError):
+            self._PARAMS.as_dict()["author"] = "some_other_author"
+        assert_that(self._PARAMS.as_dict()["author"], is_(self._AUTHOR))
@@ -0,0 +1,194 @@
+"""
+test_archetype_registry
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`archetype_registry` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+
+from hamcrest import assert_that, is_
+from pytest import raises
+
+from inception_tools.archetype_metadata import ArchetypeMetadata
+from inception_tools.archetype_registry import (
+    ArchetypeRegistry,
+    RegisteredArchetype,
+    version_key,
+)
+from inception_tools.template_archetype import TemplateArchetype
+
+
+class TestArchetypeRegistry(object):
+    """
+    Unit test for class :py:class:`ArchetypeRegistry`.
+    """
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._tmp_dir = tempfile.mkdtemp()
+        self._search_path = os.path.join(self._tmp_dir, "archetypes")
+        self._index_path = os.path.join(self._tmp_dir, "cache", "index.json")
+        for version_id in ("1.9", "1.10", "1.2"):
+            self._write_metadata("some_group", "some_archetype", version_id)
+        self._write_metadata("other_group", "some_archetype", "0.1")
+        os.makedirs(os.path.join(self._search_path, "not_an_archetype"))
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._tmp_dir)
+
+    def _dir_path(self, group_id, archetype_id, version_id):
+        return os.path.join(
+            self._search_path, f"{group_id}-{archetype_id}-{version_id}"
+        )
+
+    def _write_metadata(self, group_id, archetype_id, version_id, dir_path=None):
+        dir_path = dir_path or self._dir_path(group_id, archetype_id, version_id)
+        os.makedirs(dir_path, exist_ok=True)
+        path = os.path.join(dir_path, TemplateArchetype.METADATA_FILE_NAME)
+        metadata = ArchetypeMetadata(group_id, archetype_id, version_id)
+        with open(path, "w") as f:
+            json.dump(metadata.to_json(), f)
+        return RegisteredArchetype(metadata, dir_path)
+
+    def _registry(self):
+        return ArchetypeRegistry(
+            (self._search_path,), use_entry_points=False, index_path=self._index_path
+        )
+
+    def _index_entries(self):
+        with open(self._index_path) as f:
+            return json.load(f)["archetypes"]
+
+    # Test cases
+
+    def test_archetypes(self):
+        """
+        Unit test case for :py:method:`ArchetypeRegistry.archetypes`.
+        """
+        actual = [a.metadata for a in self._registry().archetypes()]
+        expected = [
+            ArchetypeMetadata("other_group", "some_archetype", "0.1"),
+            ArchetypeMetadata("some_group", "some_archetype", "1.2"),
+            ArchetypeMetadata("some_group", "some_archetype", "1.9"),
+            ArchetypeMetadata("some_group", "some_archetype", "1.10"),
+        ]
+        assert_that(actual, is_(expected))
+
+    def test_resolve(self):
+        """
+        Unit test case for :py:method:`ArchetypeRegistry.resolve`.
+        """
+        registry = self._registry()
+
+        actual = registry.resolve("some_archetype", "1.9", "some_group")
+        expected_dir = self._dir_path("some_group", "some_archetype", "1.9")
+        assert_that(actual.location, is_(expected_dir))
+        with raises(KeyError):
+            registry.resolve("some_archetype", "9.9")
+        with raises(KeyError):
+            registry.resolve("unknown_archetype")
+
+    def test_latest(self):
+        """
+        Unit test case for :py:method:`ArchetypeRegistry.latest`.
+        """
+        registry = self._registry()
+
+        actual = registry.latest("some_archetype").metadata.version_id
+        assert_that(actual, is_("1.10"))
+        actual = registry.latest("some_archetype", "other_group").metadata.version_id
+        assert_that(actual, is_("0.1"))
+
+    def test_index_avoids_reading_metadata(self):
+        """
+        Unit test case for :py:class:`ArchetypeRegistry`.
+        """
+        expected = self._registry().archetypes()
+        assert_that(os.path.isfile(self._index_path), is_(True))
+
+        with mock.patch.object(ArchetypeMetadata, "from_text_io") as mock_from_text_io:
+            actual = self._registry().archetypes()
+        assert_that(actual, is_(expected))
+        assert_that(mock_from_text_io.called, is_(False))
+
+    def test_index_rereads_changed_metadata(self):
+        """
+        Unit test case for :py:class:`ArchetypeRegistry`.
+        """
+        self._registry().archetypes()
+        dir_path = self._dir_path("some_group", "some_archetype", "1.2")
+        expected = self._write_metadata(
+            "some_group", "renamed_archetype", "1.2", dir_path
+        )
+
+        actual = self._registry().resolve("renamed_archetype")
+        assert_that(actual, is_(expected))
+
+    def test_archetypes_in_zip_archives(self):
+        """
+        Unit test case for :py:class:`ArchetypeRegistry`.
+        """
+        path = os.path.join(self._search_path, "some_artifact.whl")
+        with zipfile.ZipFile(path, "w") as zf:
+            for archetype_id in ("zipped", "other_zipped"):
+                metadata = ArchetypeMetadata("zip_group", archetype_id, "2.0")
+                zf.writestr(
+                    f"some_package/{archetype_id}/"
+                    f"{TemplateArchetype.METADATA_FILE_NAME}",
+                    json.dumps(metadata.to_json()),
+                )
+
+        for registry in (self._registry(), self._registry()):
+            actual = registry.latest("zipped", "zip_group").location
+            assert_that(actual, is_(f"{path}/some_package/zipped"))
+            actual = registry.latest("other_zipped").location
+            assert_that(actual, is_(f"{path}/some_package/other_zipped"))
+
+    def test_index_prunes_paths_no_longer_searched(self):
+        """
+        Unit test case for :py:class:`ArchetypeRegistry`.
+        """
+        self._registry().archetypes()
+        removed_dir = self._dir_path("some_group", "some_archetype", "1.2")
+        shutil.rmtree(removed_dir)
+        self._registry().archetypes()
+        assert_that(removed_dir in self._index_entries(), is_(False))
+
+        other_path = os.path.join(self._tmp_dir, "other_archetypes")
+        kept = self._write_metadata(
+            "some_group", "other_archetype", "1.0", os.path.join(other_path, "other")
+        )
+        ArchetypeRegistry(
+            (other_path,), use_entry_points=False, index_path=self._index_path
+        ).archetypes()
+        assert_that(sorted(self._index_entries()), is_([kept.location]))
+
+    def test_version_key(self):
+        """
+        Unit test case for :py:func:`version_key`.
+        """
+        versions = ["1.10", "1.9", "2.0", "1.9-beta", "1.9.1"]
+        actual = sorted(versions, key=version_key)
+        assert_that(actual, is_(["1.9", "1.9-beta", "1.9.1", "1.10", "2.0"]))
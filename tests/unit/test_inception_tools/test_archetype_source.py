@@ -0,0 +1,163 @@
+"""
+test_archetype_source
+~~~~~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`archetype_source` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import os
+import shutil
+import tempfile
+import zipfile
+
+from hamcrest import assert_that, is_
+from pytest import raises
+
+from inception_tools.archetype_source import (
+    DirectorySource,
+    PackageSource,
+    ZipSource,
+    open_archetype_source,
+    split_archive_location,
+)
+from inception_tools.standard_archetype import StandardArchetype
+from inception_tools.template_archetype import TemplateArchetype
+from tests.archetype_output_test_base import ArchetypeOutputTestBase
+
+
+class TestArchetypeSource(object):
+    """
+    Unit test for the classes and functions of the :py:mod:`archetype_source`
+    module.
+    """
+
+    ##############################
+    # Class attributes
+
+    _DIR_PATH = StandardArchetype.SIMPLE.dir_path
+
+    _PARAMS = ArchetypeOutputTestBase._PARAMS
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._tmp_dir)
+
+    def _zip(self, *prefixes):
+        # Stores a copy of the simple archetype under each of the prefixes
+        path = os.path.join(self._tmp_dir, "archetypes.whl")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for prefix in prefixes:
+                for dir_path, _, file_names in os.walk(self._DIR_PATH):
+                    for n in file_names:
+                        p = os.path.join(dir_path, n)
+                        name = os.path.relpath(p, self._DIR_PATH).replace(os.sep, "/")
+                        zf.write(p, f"{prefix}/{name}" if prefix else name)
+        return path
+
+    def _validate_renders_simple_archetype(self, source):
+        archetype = TemplateArchetype(source)
+        expected = StandardArchetype.SIMPLE.render_to_mapping("root", self._PARAMS)
+        assert_that(archetype.render_to_mapping("root", self._PARAMS), is_(expected))
+        assert_that(archetype.metadata.archetype_id, is_("simple"))
+
+    # Test cases
+
+    def test_directory_source(self):
+        """
+        Unit test case for :py:class:`DirectorySource`.
+        """
+        source = DirectorySource(self._DIR_PATH)
+        assert_that(source.location, is_(self._DIR_PATH))
+        self._validate_renders_simple_archetype(source)
+
+    def test_zip_source(self):
+        """
+        Unit test case for :py:class:`ZipSource`.
+        """
+        path = self._zip("some_package/archetypes/simple")
+
+        with ZipSource(path) as source:
+            expected = f"{path}/some_package/archetypes/simple"
+            assert_that(source.location, is_(expected))
+            self._validate_renders_simple_archetype(source)
+
+    def test_zip_source_requires_prefix_for_several_archetypes(self):
+        """
+        Unit test case for :py:class:`ZipSource`.
+        """
+        path = self._zip("", "other")
+
+        assert_that(ZipSource.archetype_prefixes(path), is_(("", "other")))
+        with raises(ValueError):
+            ZipSource(path)
+        with ZipSource(path, "other") as source:
+            self._validate_renders_simple_archetype(source)
+
+    def test_package_source(self):
+        """
+        Unit test case for :py:class:`PackageSource`.
+        """
+        resource_dir = "data/archetypes/" + os.path.basename(self._DIR_PATH)
+        source = PackageSource("inception_tools", resource_dir)
+        location = f"package:inception_tools/{resource_dir}"
+        assert_that(source.location, is_(location))
+        self._validate_renders_simple_archetype(source)
+        source = open_archetype_source(location)
+        assert_that(isinstance(source, PackageSource), is_(True))
+        self._validate_renders_simple_archetype(source)
+
+    def test_open_binary(self):
+        """
+        Unit test case for :py:meth:`ArchetypeSource.open_binary`.
+        """
+        path = self._zip("")
+        with open(os.path.join(self._DIR_PATH, "archetype-metadata.json"), "rb") as f:
+            expected = f.read()
+
+        with DirectorySource(self._DIR_PATH).open_binary(
+            "archetype-metadata.json"
+        ) as f:
+            assert_that(f.read(), is_(expected))
+        with ZipSource(path) as source, source.open_binary(
+            "archetype-metadata.json"
+        ) as f:
+            assert_that(f.read(), is_(expected))
+
+    def test_open_archetype_source(self):
+        """
+        Unit test case for :py:func:`open_archetype_source`.
+        """
+        path = self._zip("some_package/simple")
+
+        location = os.path.join(path, "some_package", "simple")
+        assert_that(
+            split_archive_location(location), is_((path, "some_package/simple"))
+        )
+        with open_archetype_source(location) as source:
+            assert_that(isinstance(source, ZipSource), is_(True))
+            self._validate_renders_simple_archetype(source)
+        with open_archetype_source(path) as source:
+            assert_that(source.location, is_(f"{path}/some_package/simple"))
+        source = open_archetype_source(self._DIR_PATH)
+        assert_that(isinstance(source, DirectorySource), is_(True))
+        with raises(FileNotFoundError):
+            open_archetype_source(os.path.join(self._tmp_dir, "missing"))
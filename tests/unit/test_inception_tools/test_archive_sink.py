@@ -0,0 +1,270 @@
+"""
+test_archive_sink
+~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`archive_sink` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import gc
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from unittest import mock
+
+from hamcrest import assert_that, is_
+from pytest import raises
+
+from inception_tools.archetype_base import ArchetypeBase
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.archive_sink import (
+    DEFAULT_MTIME,
+    ArchiveFormat,
+    TarSink,
+    ZipSink,
+    archive_mtime,
+    open_archive_sink,
+)
+from inception_tools.build_report import BuildReport
+from inception_tools.directory_builder import DirectoryBuilder
+from inception_tools.file_builder import FileBuilder
+from tests.archetype_output_test_base import ArchetypeOutputTestBase
+
+
+class _MockFileBuilder(FileBuilder):
+    def __init__(self, subpath, render_content) -> None:
+        super().__init__()
+        self._subpath = subpath
+        self._render_content = render_content
+
+    def subpath(self, params: ArchetypeParameters) -> str:
+        return self._subpath
+
+    def render(self, params: ArchetypeParameters) -> str:
+        return self._render_content
+
+
+class _ChunkedFileBuilder(_MockFileBuilder):
+    # Only produces its content in chunks, raising any exception among them
+    def __init__(self, subpath, chunks) -> None:
+        super().__init__(subpath, None)
+        self._chunks = chunks
+
+    def render_bytes(self, params: ArchetypeParameters) -> bytes:
+        raise AssertionError("The content should be streamed")
+
+    def iter_render_bytes(self, params: ArchetypeParameters):
+        for chunk in self._chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+
+class _MockDirBuilder(DirectoryBuilder):
+    def __init__(self, subpath) -> None:
+        super().__init__()
+        self._subpath = subpath
+
+    def subpath(self, params: ArchetypeParameters) -> str:
+        return self._subpath
+
+
+class TestArchiveSink(object):
+    """
+    Unit test for the classes and functions of the :py:mod:`archive_sink` module.
+    """
+
+    ##############################
+    # Class attributes
+
+    _ROOT_DIR = ArchetypeOutputTestBase._ROOT_DIR
+    _PARAMS = ArchetypeOutputTestBase._PARAMS
+
+    _EXPECTED_NAMES = [
+        "some_root_dir/",
+        "some_root_dir/some_dir/",
+        "some_root_dir/some_dir/some_nested_dir/",
+        "some_root_dir/some_file",
+        "some_root_dir/some_dir/some_other_file",
+    ]
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._archetype = ArchetypeBase(
+            (
+                _MockFileBuilder("some_file", "some_content"),
+                _MockFileBuilder(
+                    os.path.join("some_dir", "some_other_file"), "some_other_content"
+                ),
+            ),
+            (_MockDirBuilder(os.path.join("some_dir", "some_nested_dir")),),
+        )
+
+    def _build(self, sink):
+        with sink:
+            report = self._archetype.build(self._ROOT_DIR, self._PARAMS, sink=sink)
+        assert_that(report, is_(BuildReport(created=2, written=0, unchanged=0)))
+        ArchetypeOutputTestBase._validate_path_doesnt_exist(self._ROOT_DIR)
+
+    def _build_tar(self, compress):
+        out = io.BytesIO()
+        self._build(TarSink(out, compress))
+        return out.getvalue()
+
+    # Test cases
+
+    def test_tar_sink(self):
+        """
+        Unit test case for :py:class:`TarSink`.
+        """
+        content = self._build_tar(compress=False)
+
+        with tarfile.open(fileobj=io.BytesIO(content)) as tar:
+            members = tar.getmembers()
+            actual = [m.name + ("/" if m.isdir() else "") for m in members]
+            assert_that(actual, is_(self._EXPECTED_NAMES))
+            assert_that({m.mtime for m in members}, is_({DEFAULT_MTIME}))
+            actual = tar.extractfile("some_root_dir/some_dir/some_other_file").read()
+            assert_that(actual, is_(b"some_other_content"))
+
+    def test_tar_sink_compressed_is_deterministic(self):
+        """
+        Unit test case for :py:class:`TarSink`.
+        """
+        content = self._build_tar(compress=True)
+
+        assert_that(content[:2], is_(b"\x1f\x8b"))
+        assert_that(self._build_tar(compress=True), is_(content))
+        with tarfile.open(fileobj=io.BytesIO(content), mode="r:gz") as tar:
+            actual = tar.extractfile("some_root_dir/some_file").read()
+        assert_that(actual, is_(b"some_content"))
+
+    def test_zip_sink(self):
+        """
+        Unit test case for :py:class:`ZipSink`.
+        """
+        out = io.BytesIO()
+        self._build(ZipSink(out))
+
+        with zipfile.ZipFile(io.BytesIO(out.getvalue())) as zf:
+            infos = zf.infolist()
+            assert_that([i.filename for i in infos], is_(self._EXPECTED_NAMES))
+            assert_that({i.date_time for i in infos}, is_({(1980, 1, 1, 0, 0, 0)}))
+            actual = zf.read("some_root_dir/some_dir/some_other_file")
+        assert_that(actual, is_(b"some_other_content"))
+
+    def test_archive_mtime_uses_source_date_epoch(self):
+        """
+        Unit test case for :py:func:`archive_mtime`.
+        """
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1000000000"}):
+            assert_that(archive_mtime(), is_(1000000000))
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "not-an-int"}):
+            with raises(ValueError):
+                archive_mtime()
+
+    def test_archive_format_from_path(self):
+        """
+        Unit test case for :py:meth:`ArchiveFormat.from_path`.
+        """
+        assert_that(ArchiveFormat.from_path("out.tar"), is_(ArchiveFormat.TAR))
+        assert_that(ArchiveFormat.from_path("out.TGZ"), is_(ArchiveFormat.TAR_GZ))
+        assert_that(ArchiveFormat.from_path("out.tar.gz"), is_(ArchiveFormat.TAR_GZ))
+        assert_that(ArchiveFormat.from_path("out.zip"), is_(ArchiveFormat.ZIP))
+        assert_that(ArchiveFormat.from_path("-"), is_(ArchiveFormat.TAR_GZ))
+        with raises(ValueError):
+            ArchiveFormat.from_path("out.rar")
+
+    def test_open_archive_sink(self):
+        """
+        Unit test case for :py:func:`open_archive_sink`.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "out.zip")
+            self._build(open_archive_sink(path))
+            with zipfile.ZipFile(path) as zf:
+                actual = zf.namelist()
+        finally:
+            shutil.rmtree(tmp_dir)
+        assert_that(actual, is_(self._EXPECTED_NAMES))
+
+    def test_sinks_stream_file_content(self):
+        """
+        Unit test case for :py:meth:`ArchiveSink.add_file`.
+        """
+        archetype = ArchetypeBase(
+            (_ChunkedFileBuilder("some_file", (b"some_", b"content")),), ()
+        )
+        out = io.BytesIO()
+        # Spooled to disk, beyond the first bytes
+        with mock.patch.object(TarSink, "SPOOL_SIZE", 4):
+            with TarSink(out) as sink:
+                archetype.build(self._ROOT_DIR, self._PARAMS, sink=sink)
+        with tarfile.open(fileobj=io.BytesIO(out.getvalue())) as tar:
+            actual = tar.extractfile("some_root_dir/some_file").read()
+        assert_that(actual, is_(b"some_content"))
+
+        out = io.BytesIO()
+        with ZipSink(out) as sink:
+            archetype.build(self._ROOT_DIR, self._PARAMS, sink=sink)
+        with zipfile.ZipFile(io.BytesIO(out.getvalue())) as zf:
+            actual = zf.read("some_root_dir/some_file")
+        assert_that(actual, is_(b"some_content"))
+
+    def test_tar_sink_abort_leaves_archive_unfinished(self):
+        """
+        Unit test case for :py:meth:`ArchiveSink.abort`.
+        """
+        archetype = ArchetypeBase(
+            (
+                _MockFileBuilder("some_file", "some_content"),
+                _ChunkedFileBuilder(
+                    "some_other_file", (b"some_", ValueError("Some test exception."))
+                ),
+            ),
+            (),
+        )
+        out = io.BytesIO()
+        sink = TarSink(out, compress=True)
+        with raises(ValueError):
+            with sink:
+                archetype.build(self._ROOT_DIR, self._PARAMS, sink=sink)
+        del sink
+        gc.collect()
+        with raises(EOFError):
+            gzip.decompress(out.getvalue())
+
+    def test_open_archive_sink_abort_removes_file(self):
+        """
+        Unit test case for :py:func:`open_archive_sink`.
+        """
+        archetype = ArchetypeBase(
+            (_ChunkedFileBuilder("some_file", (ValueError("Some test exception."),)),),
+            (),
+        )
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            for name in ("out.zip", "out.tar.gz"):
+                path = os.path.join(tmp_dir, name)
+                with raises(ValueError):
+                    with open_archive_sink(path) as sink:
+                        archetype.build(self._ROOT_DIR, self._PARAMS, sink=sink)
+                assert_that(os.path.exists(path), is_(False))
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,144 @@
+"""
+test_batch
+~~~~~~~~~~
+
+Unit test cases for the :py:mod:`batch` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import os
+import shutil
+import tempfile
+
+from hamcrest import assert_that, contains_string, is_, none
+
+from inception_tools.batch import (
+    incept_batch,
+    ManifestFormat,
+    ManifestRow,
+    read_manifest,
+)
+from tests.archetype_output_test_base import ArchetypeOutputTestBase
+from tests.file_matcher import is_file
+
+
+class TestBatch(object):
+    """
+    Unit test cases for the :py:mod:`batch` module.
+    """
+
+    ##############################
+    # Class attributes
+
+    _DATE = ArchetypeOutputTestBase._DATE
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._dir)
+
+    def _write_manifest(self, name, content):
+        path = os.path.join(self._dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def _root(self, name):
+        return os.path.join(self._dir, name)
+
+    # Test cases
+
+    def test_manifest_format_from_path(self):
+        """
+        Unit test case for :py:method:`ManifestFormat.from_path`.
+        """
+        assert_that(ManifestFormat.from_path("some.CSV"), is_(ManifestFormat.CSV))
+        assert_that(ManifestFormat.from_path("some.jsonl"), is_(ManifestFormat.JSONL))
+
+    def test_read_manifest_csv(self):
+        """
+        Unit test case for :py:func:`read_manifest`.
+        """
+        path = self._write_manifest(
+            "manifest.csv",
+            "package_name,project_root,author,author_email,archetype\n"
+            "some_package,some_root,some_author,some_email,lib\n",
+        )
+        actual = read_manifest(path)
+        expected = (
+            ManifestRow(
+                2, "some_package", "some_root", "some_author", "some_email", "lib", None
+            ),
+        )
+        assert_that(actual, is_(expected))
+
+    def test_read_manifest_applies_defaults(self):
+        """
+        Unit test case for :py:func:`read_manifest`.
+        """
+        path = self._write_manifest("manifest.jsonl", '{"package_name": "some"}\n')
+        (actual,) = read_manifest(path)
+        assert_that(actual.project_root, is_("some"))
+        assert_that(actual.archetype, is_("cli"))
+        assert_that(actual.error, is_(none()))
+
+    def test_read_manifest_reports_bad_rows(self):
+        """
+        Unit test case for :py:func:`read_manifest`.
+        """
+        path = self._write_manifest(
+            "manifest.jsonl", 'not json\n{"author": "some_author"}\n'
+        )
+        actual = read_manifest(path)
+        assert_that(actual[0].error, contains_string("Invalid JSON"))
+        assert_that(actual[1].error, contains_string("package_name"))
+
+    def test_incept_batch_builds_each_row(self):
+        """
+        Unit test case for :py:func:`incept_batch`.
+        """
+        path = self._write_manifest(
+            "manifest.jsonl",
+            f'{{"package_name": "a", "project_root": "{self._root("a")}"}}\n'
+            f'{{"package_name": "b", "project_root": "{self._root("b")}", '
+            f'"archetype": "simple"}}\n',
+        )
+        results = tuple(incept_batch(read_manifest(path), jobs=2, date=self._DATE))
+
+        assert_that([r.succeeded for r in results], is_([True, True]))
+        assert_that(os.path.join(self._root("a"), "a", "cli.py"), is_file())
+        assert_that(os.path.join(self._root("b"), "b.py"), is_file())
+
+    def test_incept_batch_continues_after_bad_row(self):
+        """
+        Unit test case for :py:func:`incept_batch`.
+        """
+        path = self._write_manifest(
+            "manifest.jsonl",
+            f'{{"package_name": "a", "project_root": "{self._root("a")}", '
+            f'"archetype": "no_such_archetype"}}\n'
+            f'{{"package_name": "b", "project_root": "{self._root("b")}", '
+            f'"archetype": "simple"}}\n',
+        )
+        results = tuple(incept_batch(read_manifest(path), jobs=1, date=self._DATE))
+
+        assert_that(results[0].error, contains_string("no_such_archetype"))
+        assert_that(results[1].succeeded, is_(True))
+        assert_that(os.path.join(self._root("b"), "b.py"), is_file())
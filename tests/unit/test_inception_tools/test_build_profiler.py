@@ -0,0 +1,93 @@
+"""
+test_build_profiler
+~~~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`build_profiler` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import os
+import shutil
+import tempfile
+
+from hamcrest import assert_that, is_
+
+from inception_tools.build_observer import BuildPhase
+from inception_tools.build_profiler import BuildProfiler
+from inception_tools.plan_record import ResourceKind
+from inception_tools.standard_archetype import StandardArchetype
+from inception_tools.template_archetype import TemplateArchetype
+from tests.archetype_output_test_base import ArchetypeOutputTestBase
+
+
+class TestBuildProfiler(object):
+    """
+    Unit test for class :py:class:`BuildProfiler`.
+    """
+
+    ##############################
+    # Class attributes
+
+    _PARAMS = ArchetypeOutputTestBase._PARAMS
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._tmp_dir = tempfile.mkdtemp()
+        self._root_dir = os.path.join(self._tmp_dir, "root")
+        self._profiler = BuildProfiler()
+        self._archetype = TemplateArchetype(
+            StandardArchetype.SIMPLE.dir_path, observers=[self._profiler]
+        )
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._tmp_dir)
+
+    # Test cases
+
+    def test_to_json(self):
+        """
+        Unit test case for :py:meth:`BuildProfiler.to_json`.
+        """
+        self._archetype.build(self._root_dir, self._PARAMS)
+        actual = self._profiler.to_json(top=3)
+
+        file_paths = self._archetype.file_paths(self._root_dir, self._PARAMS)
+        file_bytes = sum(os.path.getsize(p) for p in file_paths)
+        resources = self._profiler.resources
+        file_count = sum(1 for r in resources if r.kind == ResourceKind.FILE)
+        assert_that(file_count, is_(len(file_paths)))
+        assert_that(actual["resources"], is_(len(resources)))
+        assert_that(actual["bytes"], is_(file_bytes))
+        assert_that(actual["root_dir"], is_(self._root_dir))
+        assert_that(actual["load_s"] > 0, is_(True))
+        assert_that(set(actual["totals"]), is_(set(BuildPhase.ALL)))
+
+        durations = [r["duration"] for r in actual["slowest"]]
+        assert_that(durations, is_(sorted(durations, reverse=True)))
+        assert_that(len(durations), is_(3))
+
+    def test_to_json_keeps_most_recent_build(self):
+        """
+        Unit test case for :py:meth:`BuildProfiler.to_json`.
+        """
+        self._archetype.build(self._root_dir, self._PARAMS)
+        expected = self._profiler.to_json(top=None)["resources"]
+        self._archetype.build(self._root_dir, self._PARAMS, jobs=4)
+        actual = self._profiler.to_json(top=None)
+        assert_that(actual["resources"], is_(expected))
+        assert_that(len(actual["slowest"]), is_(expected))
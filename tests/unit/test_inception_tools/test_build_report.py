@@ -0,0 +1,45 @@
+"""
+test_build_report
+~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`build_report` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+from hamcrest import assert_that, is_
+
+from inception_tools.build_report import BuildReport, WriteStatus
+
+
+class TestBuildReport(object):
+    """
+    Unit test cases for :py:class:`BuildReport`.
+    """
+
+    # Test cases
+
+    def test_from_statuses(self):
+        """
+        Unit test case for :py:method:`BuildReport.from_statuses`.
+        """
+        actual = BuildReport.from_statuses(
+            (
+                WriteStatus.CREATED,
+                WriteStatus.UNCHANGED,
+                WriteStatus.WRITTEN,
+                WriteStatus.UNCHANGED,
+            )
+        )
+        expected = BuildReport(created=1, written=1, unchanged=2)
+        assert_that(actual, is_(expected))
+
+    def test_str(self):
+        """
+        Unit test case for :py:method:`BuildReport.__str__`.
+        """
+        actual = str(BuildReport(created=1, written=2, unchanged=3))
+        expected = "1 created, 2 written, 3 unchanged"
+        assert_that(actual, is_(expected))
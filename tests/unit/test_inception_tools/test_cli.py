@@ -9,8 +9,13 @@ __author__ = "Andrew van Herick"
 __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
 __license__ = "Apache Software License 2.0"
 
+import json
 import logging
 import os
+import shutil
+import subprocess
+import sys
+import tempfile
 from contextlib import closing
 from io import StringIO
 from logging import StreamHandler
@@ -19,7 +24,13 @@ from unittest import mock
 from click.testing import CliRunner
 from hamcrest import assert_that, contains_string, is_, starts_with
 
-from inception_tools import cli
+from inception_tools import archetype_registry, cli
+from inception_tools.archetype_metadata import ArchetypeMetadata
+from inception_tools.synthetic_archetype import (
+    SyntheticArchetypeSpec,
+    write_synthetic_archetype,
+)
+from inception_tools.template_archetype import TemplateArchetype
 from tests.archetype_output_test_base import ArchetypeOutputTestBase
 
 
@@ -201,3 +212,252 @@ class TestIncept(ArchetypeOutputTestBase):
         )
 
         assert_that(actual, starts_with(expected))
+
+    def test_incept_writes_profile(self):
+        """
+        Unit test case for :py:func:`inception_tools.cli.incept`.
+        """
+        result = self._runner.invoke(
+            cli.incept,
+            (
+                self._PACKAGE_NAME,
+                self._ROOT_DIR,
+                "--profile",
+                "-",
+                "--profile-top",
+                "2",
+            ),
+        )
+        assert_that(result.exit_code, is_(0))
+        profile = json.loads(result.output)
+        assert_that(profile["root_dir"], is_(self._ROOT_DIR))
+        assert_that(len(profile["slowest"]), is_(2))
+        assert_that(profile["bytes"] > 0, is_(True))
+
+    def test_incept_builds_registry_archetype(self):
+        """
+        Unit test case for :py:func:`inception_tools.cli.incept`.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            search_path = os.path.join(tmp_dir, "archetypes")
+            for version_id, depth in (("1.0", 0), ("1.1", 1)):
+                dir_path = os.path.join(search_path, version_id)
+                write_synthetic_archetype(
+                    dir_path, SyntheticArchetypeSpec(1, depth=depth, fan_out=1)
+                )
+                metadata = ArchetypeMetadata("synthetic", "synthetic", version_id)
+                path = os.path.join(dir_path, TemplateArchetype.METADATA_FILE_NAME)
+                with open(path, "w") as f:
+                    json.dump(metadata.to_json(), f)
+            env = {archetype_registry.SEARCH_PATH_ENV_VAR: search_path}
+            for archetype, expected in (("synthetic", 1), ("synthetic:1.0", 0)):
+                root_dir = os.path.join(tmp_dir, archetype.replace(":", "-"))
+                with mock.patch.dict(os.environ, env):
+                    result = self._runner.invoke(
+                        cli.incept,
+                        (self._PACKAGE_NAME, root_dir, "--archetype", archetype),
+                    )
+                assert_that(result.exit_code, is_(0))
+                dir_paths = [p for p, _, _ in os.walk(root_dir)]
+                assert_that(len(dir_paths) - 1, is_(expected))
+
+            with mock.patch.dict(os.environ, env):
+                result = self._runner.invoke(
+                    cli.incept,
+                    (self._PACKAGE_NAME, tmp_dir, "--archetype", "synthetic:9.9"),
+                )
+            assert_that(result.exit_code, is_(2))
+            assert_that(result.output, contains_string("'--archetype'"))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    @mock.patch("inception_tools.cli._incept")
+    def test_incept_rejects_conflicting_options(self, mock__incept):
+        """
+        Unit test case for :py:func:`inception_tools.cli.incept`.
+        """
+        for options in (
+            ("--output-archive", "some.tar", "--jobs", "2"),
+            ("--output-archive", "some.tar", "--incremental"),
+            ("--plan", "--profile", "-"),
+        ):
+            result = self._runner.invoke(
+                cli.incept, (self._PACKAGE_NAME, self._ROOT_DIR) + options
+            )
+            assert_that(result.exit_code, is_(2))
+            assert_that(result.output, contains_string("can't be combined"))
+        assert_that(mock__incept.called, is_(False))
+
+    @mock.patch("inception_tools.cli._incept")
+    def test_incept_rejects_unknown_archive_extension(self, mock__incept):
+        """
+        Unit test case for :py:func:`inception_tools.cli.incept`.
+        """
+        result = self._runner.invoke(
+            cli.incept,
+            (self._PACKAGE_NAME, self._ROOT_DIR, "--output-archive", "some.rar"),
+        )
+        assert_that(result.exit_code, is_(2))
+        assert_that(result.output, contains_string("'--output-archive'"))
+        assert_that(mock__incept.called, is_(False))
+
+
+class TestWarm(object):
+    """
+    Unit test for the function :py:func:`inception_tools.cli.warm`.
+    """
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._cache_dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._cache_dir)
+
+    # Test cases
+
+    def test_warm_compiles_standard_archetypes(self):
+        """
+        Unit test case for :py:func:`inception_tools.cli.warm`.
+        """
+        result = CliRunner().invoke(cli.warm, ("--cache-dir", self._cache_dir))
+        assert_that(result.exit_code, is_(0))
+        assert_that(result.output, contains_string("newly compiled"))
+
+    def test_warm_reports_cached_templates(self):
+        """
+        Unit test case for :py:func:`inception_tools.cli.warm`.
+        """
+        CliRunner().invoke(cli.warm, ("--cache-dir", self._cache_dir))
+        result = CliRunner().invoke(cli.warm, ("--cache-dir", self._cache_dir))
+        assert_that(result.output, contains_string("(0 newly compiled)"))
+
+
+class TestArchetypes(object):
+    """
+    Unit test for the function :py:func:`inception_tools.cli.archetypes`.
+    """
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._cache_dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._cache_dir)
+
+    def _invoke(self, *args):
+        env = {"INCEPTION_TOOLS_CACHE_DIR": self._cache_dir}
+        with mock.patch.dict(os.environ, env):
+            return CliRunner().invoke(cli.archetypes, args)
+
+    # Test cases
+
+    def test_archetypes_lists_standard_archetypes(self):
+        """
+        Unit test case for :py:func:`inception_tools.cli.archetypes`.
+        """
+        result = self._invoke()
+        assert_that(result.exit_code, is_(0))
+        actual = [line.split("\t")[1] for line in result.output.splitlines()]
+        assert_that(actual, is_(["cli", "library", "simple"]))
+
+    def test_archetypes_rejects_unknown_archetype(self):
+        """
+        Unit test case for :py:func:`inception_tools.cli.archetypes`.
+        """
+        result = self._invoke("--id", "unknown", "--latest")
+        assert_that(result.exit_code, is_(1))
+        assert_that(result.output, contains_string("No archetype found"))
+
+
+class TestGenSynthetic(object):
+    """
+    Unit test for the function :py:func:`inception_tools.cli.gen_synthetic`.
+    """
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._tmp_dir)
+
+    # Test cases
+
+    def test_gen_synthetic(self):
+        """
+        Unit test case for :py:func:`inception_tools.cli.gen_synthetic`.
+        """
+        dir_path = os.path.join(self._tmp_dir, "synthetic")
+        args = (dir_path, "--files", "12", "--depth", "1", "--fan-out", "3")
+        result = CliRunner().invoke(cli.gen_synthetic, args)
+        assert_that(result.exit_code, is_(0))
+        assert_that(result.output, contains_string("12 files"))
+
+        result = CliRunner().invoke(cli.gen_synthetic, args)
+        assert_that(result.exit_code, is_(1))
+
+
+class TestCli(object):
+    """
+    Unit test for the function :py:func:`inception_tools.cli.cli`.
+    """
+
+    # Test cases
+
+    def test_cli_defers_command_specific_imports(self):
+        """
+        Unit test case for the :py:mod:`inception_tools.cli` module.
+        """
+        deferred = (
+            "asyncio",
+            "inception_tools.archive_sink",
+            "inception_tools.batch",
+            "inception_tools.server",
+            "inception_tools.synthetic_archetype",
+        )
+        code = (
+            "import sys, inception_tools.cli; "
+            f"print([m for m in {deferred!r} if m in sys.modules])"
+        )
+        result = subprocess.run(
+            (sys.executable, "-c", code), stdout=subprocess.PIPE, check=True
+        )
+        assert_that(result.stdout.decode().strip(), is_("[]"))
@@ -11,12 +11,18 @@ __license__ = "Apache Software License 2.0"
 
 import os
 import shutil
+import stat
+from unittest import mock
 
 from hamcrest import assert_that, is_
+from pytest import raises
 
 from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools import file_builder
+from inception_tools.build_report import WriteStatus
 from inception_tools.file_builder import FileBuilder
 from tests.archetype_output_test_base import ArchetypeOutputTestBase
+from tests.file_matcher import not_exists
 
 
 class _MockFileBuilder(FileBuilder):
@@ -32,6 +38,18 @@ class _MockFileBuilder(FileBuilder):
         return self.render_value
 
 
+class _ChunkedFileBuilder(_MockFileBuilder):
+    def __init__(self, subpath, chunks) -> None:
+        super().__init__(subpath, None)
+        self.chunks = chunks
+
+    def iter_render_bytes(self, params: ArchetypeParameters):
+        for c in self.chunks:
+            if isinstance(c, Exception):
+                raise c
+            yield c
+
+
 class TestFileRenderer(object):
     """
     Unit test for class :py:class:`FileBuilder`.
@@ -89,3 +107,132 @@ class TestFileRenderer(object):
         expected = "some_content"
 
         assert_that(actual, is_(expected))
+
+    def test_render_bytes(self):
+        """
+        Unit test case for :py:method:`FileBuilder.render_bytes`.
+        """
+        actual = _MockFileBuilder("some_subpath", "caf\u00e9").render_bytes(
+            self._PARAMS
+        )
+        expected = b"caf\xc3\xa9"
+        assert_that(actual, is_(expected))
+
+    def test_build_returns_created_for_new_file(self):
+        """
+        Unit test case for :py:method:`FileBuilder.build`.
+        """
+        actual = self._builder.build(self._ROOT_DIR, self._PARAMS)
+        assert_that(actual, is_(WriteStatus.CREATED))
+
+    def test_build_returns_written_for_existing_file(self):
+        """
+        Unit test case for :py:method:`FileBuilder.build`.
+        """
+        self._builder.build(self._ROOT_DIR, self._PARAMS)
+        actual = self._builder.build(self._ROOT_DIR, self._PARAMS)
+        assert_that(actual, is_(WriteStatus.WRITTEN))
+
+    def test_build_incremental_leaves_unchanged_file(self):
+        """
+        Unit test case for :py:method:`FileBuilder.build`.
+        """
+        self._builder.build(self._ROOT_DIR, self._PARAMS)
+        path = self._builder.path(self._ROOT_DIR, self._PARAMS)
+        os.utime(path, (0, 0))
+
+        actual = self._builder.build(self._ROOT_DIR, self._PARAMS, incremental=True)
+
+        assert_that(actual, is_(WriteStatus.UNCHANGED))
+        assert_that(os.stat(path).st_mtime, is_(0))
+
+    def test_build_incremental_writes_changed_file(self):
+        """
+        Unit test case for :py:method:`FileBuilder.build`.
+        """
+        path = self._builder.path(self._ROOT_DIR, self._PARAMS)
+        os.makedirs(self._ROOT_DIR)
+        with open(path, "w") as f:
+            # Same size as the rendered content, but different bytes
+            f.write("SOME_CONTENT")
+
+        actual = self._builder.build(self._ROOT_DIR, self._PARAMS, incremental=True)
+
+        assert_that(actual, is_(WriteStatus.WRITTEN))
+        with open(path) as f:
+            assert_that(f.read(), is_("some_content"))
+
+    def test_build_incremental_opens_existing_file_once(self):
+        """
+        Unit test case for :py:method:`FileBuilder.build`.
+        """
+        self._builder.build(self._ROOT_DIR, self._PARAMS)
+        self._builder.render_value = "SOME_CONTENT"
+
+        with mock.patch.object(file_builder, "open", create=True, wraps=open) as m:
+            actual = self._builder.build(self._ROOT_DIR, self._PARAMS, incremental=True)
+
+        assert_that(actual, is_(WriteStatus.WRITTEN))
+        modes = [c[0][1] for c in m.call_args_list if c[0][1] != "rb"]
+        assert_that(modes, is_(["wb"]))
+
+    @mock.patch.object(file_builder, "_NEWLINE", b"\r\n")
+    def test_build_translates_newlines(self):
+        """
+        Unit test case for :py:method:`FileBuilder.build`.
+        """
+        builder = _ChunkedFileBuilder("some_subpath", (b"some\n", b"\ncontent\n"))
+        builder.build(self._ROOT_DIR, self._PARAMS)
+        path = builder.path(self._ROOT_DIR, self._PARAMS)
+        with open(path, "rb") as f:
+            assert_that(f.read(), is_(b"some\r\n\r\ncontent\r\n"))
+
+        builder = _MockFileBuilder("some_subpath", "some\ncontent")
+        actual = builder.build(self._ROOT_DIR, self._PARAMS, incremental=True)
+        assert_that(actual, is_(WriteStatus.WRITTEN))
+        actual = builder.build(self._ROOT_DIR, self._PARAMS, incremental=True)
+        assert_that(actual, is_(WriteStatus.UNCHANGED))
+
+    def test_build_writes_chunks(self):
+        """
+        Unit test case for :py:method:`FileBuilder.build`.
+        """
+        builder = _ChunkedFileBuilder("some_subpath", (b"some_", b"content"))
+        builder.build(self._ROOT_DIR, self._PARAMS)
+        path = builder.path(self._ROOT_DIR, self._PARAMS)
+        with open(path, "rb") as f:
+            assert_that(f.read(), is_(b"some_content"))
+
+    def test_build_removes_created_file_on_error(self):
+        """
+        Unit test case for :py:method:`FileBuilder.build`.
+        """
+        builder = _ChunkedFileBuilder(
+            "some_subpath", (b"some_", ValueError("Some test exception."))
+        )
+        with raises(ValueError):
+            builder.build(self._ROOT_DIR, self._PARAMS)
+        assert_that(builder.path(self._ROOT_DIR, self._PARAMS), not_exists())
+
+    def test_build_leaves_existing_file_intact_on_error(self):
+        """
+        Unit test case for :py:method:`FileBuilder.build`.
+        """
+        self._builder.build(self._ROOT_DIR, self._PARAMS)
+        path = self._builder.path(self._ROOT_DIR, self._PARAMS)
+        os.chmod(path, 0o640)
+        builder = _ChunkedFileBuilder(
+            "some_subpath", (b"other_", ValueError("Some test exception."))
+        )
+        with raises(ValueError):
+            builder.build(self._ROOT_DIR, self._PARAMS)
+        with open(path, "rb") as f:
+            assert_that(f.read(), is_(b"some_content"))
+        assert_that(os.listdir(self._ROOT_DIR), is_(["some_subpath"]))
+
+        builder.chunks = (b"other_", b"content")
+        actual = builder.build(self._ROOT_DIR, self._PARAMS)
+        assert_that(actual, is_(WriteStatus.WRITTEN))
+        with open(path, "rb") as f:
+            assert_that(f.read(), is_(b"other_content"))
+        assert_that(stat.S_IMODE(os.stat(path).st_mode), is_(0o640))
@@ -0,0 +1,118 @@
+"""
+test_file_copy
+~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`file_copy` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from hamcrest import assert_that, is_
+
+from inception_tools import file_copy
+from inception_tools.file_copy import copy_fileobj, default_reflink, REFLINK_ENV_VAR
+
+
+class TestFileCopy(object):
+    """
+    Unit test for the functions of the :py:mod:`file_copy` module.
+    """
+
+    ##############################
+    # Class attributes
+
+    # Every byte value, and more than one chunk
+    _CONTENT = bytes(range(256)) * (file_copy.COPY_CHUNK_SIZE // 128 + 1)
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._tmp_dir = tempfile.mkdtemp()
+        self._src_path = os.path.join(self._tmp_dir, "src.bin")
+        self._dst_path = os.path.join(self._tmp_dir, "dst.bin")
+        with open(self._src_path, "wb") as f:
+            f.write(self._CONTENT)
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._tmp_dir)
+
+    def _read_dst(self):
+        with open(self._dst_path, "rb") as f:
+            return f.read()
+
+    # Test cases
+
+    def test_copy_fileobj(self):
+        """
+        Unit test case for :py:func:`copy_fileobj`.
+        """
+        with open(self._src_path, "rb") as fsrc, open(self._dst_path, "wb") as fdst:
+            method = copy_fileobj(fsrc, fdst, reflink=True)
+        assert_that(
+            method in ("reflink", "copy_file_range", "sendfile", "copyfileobj"),
+            is_(True),
+        )
+        assert_that(self._read_dst(), is_(self._CONTENT))
+
+    def test_copy_fileobj_from_current_position(self):
+        """
+        Unit test case for :py:func:`copy_fileobj`.
+        """
+        with open(self._src_path, "rb") as fsrc, open(self._dst_path, "wb") as fdst:
+            fsrc.read(10)
+            fdst.write(b"some_header")
+            copy_fileobj(fsrc, fdst, reflink=True)
+            fdst.write(b"some_footer")
+        expected = b"some_header" + self._CONTENT[10:] + b"some_footer"
+        assert_that(self._read_dst(), is_(expected))
+
+    def test_copy_fileobj_falls_back_without_file_descriptors(self):
+        """
+        Unit test case for :py:func:`copy_fileobj`.
+        """
+        fdst = io.BytesIO()
+        with open(self._src_path, "rb") as fsrc:
+            method = copy_fileobj(fsrc, fdst)
+        assert_that(method, is_("copyfileobj"))
+        assert_that(fdst.getvalue(), is_(self._CONTENT))
+
+    def test_copy_fileobj_falls_back_when_unsupported(self):
+        """
+        Unit test case for :py:func:`copy_fileobj`.
+        """
+        error = OSError(file_copy.errno.EXDEV, "Some test exception.")
+        with mock.patch.object(
+            file_copy, "_copy_file_range", side_effect=error
+        ), mock.patch.object(file_copy, "_sendfile", side_effect=error):
+            with open(self._src_path, "rb") as fsrc, open(self._dst_path, "wb") as fdst:
+                method = copy_fileobj(fsrc, fdst)
+        assert_that(method, is_("copyfileobj"))
+        assert_that(self._read_dst(), is_(self._CONTENT))
+
+    def test_default_reflink(self):
+        """
+        Unit test case for :py:func:`default_reflink`.
+        """
+        with mock.patch.dict(os.environ, {REFLINK_ENV_VAR: "1"}):
+            assert_that(default_reflink(), is_(True))
+        with mock.patch.dict(os.environ, {REFLINK_ENV_VAR: ""}):
+            assert_that(default_reflink(), is_(False))
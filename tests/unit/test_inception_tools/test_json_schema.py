@@ -0,0 +1,120 @@
+"""
+test_json_schema
+~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`json_schema` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import jsonschema
+from hamcrest import assert_that, is_
+from pytest import raises
+
+from inception_tools.archetype_descriptor import ArchetypeDescriptor
+from inception_tools.archetype_metadata import ArchetypeMetadata
+from inception_tools.json_schema import (
+    create_validator,
+    is_supported,
+    SchemaValidationError,
+    SubsetValidator,
+)
+
+
+class TestJsonSchema(object):
+    """
+    Unit test for the classes and functions of the :py:mod:`json_schema` module.
+    """
+
+    ##############################
+    # Class attributes
+
+    _SCHEMA = {
+        "type": "object",
+        "required": ["name"],
+        "properties": {
+            "name": {"type": "string"},
+            "count": {"type": ["integer", "null"]},
+            "mode": {"enum": ["some_mode", 1, None, [0]]},
+            "tags": {"type": "array", "items": {"$ref": "#/definitions/tag"}},
+        },
+        "additionalProperties": False,
+        "definitions": {"tag": {"type": "object", "properties": {}}},
+    }
+
+    _INSTANCES = (
+        {"name": "some_name", "count": 1, "tags": [{}, {"x": 1}]},
+        {"name": "some_name", "count": None},
+        [],
+        {"count": 1},
+        {"name": 5},
+        {"name": "some_name", "count": True},
+        {"name": "some_name", "count": 1.5},
+        {"name": "some_name", "tags": [{}, "some_tag"]},
+        {"name": "some_name", "other": 1, "another": 2},
+        {"name": "some_name", "mode": "some_mode"},
+        {"name": "some_name", "mode": [0]},
+        {"name": "some_name", "mode": "some_other_mode"},
+        {"name": "some_name", "mode": True},
+        {"name": "some_name", "mode": [False]},
+    )
+
+    ##############################
+    # Instance methods
+
+    # Test cases
+
+    def test_is_supported(self):
+        """
+        Unit test case for :py:func:`is_supported`.
+        """
+        assert_that(is_supported(self._SCHEMA), is_(True))
+        assert_that(is_supported(ArchetypeDescriptor.JSON_SCHEMA), is_(True))
+        assert_that(is_supported(ArchetypeMetadata.JSON_SCHEMA), is_(True))
+        assert_that(is_supported({"type": "string", "minLength": 1}), is_(False))
+        assert_that(is_supported({"$ref": "#/definitions/missing"}), is_(False))
+        assert_that(is_supported({"items": [{"type": "string"}]}), is_(False))
+        assert_that(is_supported({"enum": "some_value"}), is_(False))
+
+    def test_errors_match_jsonschema(self):
+        """
+        Unit test case for :py:class:`SubsetValidator`.
+        """
+        validator = SubsetValidator(self._SCHEMA)
+        reference = jsonschema.Draft7Validator(self._SCHEMA)
+        for instance in self._INSTANCES:
+            actual = [(e.message, e.path) for e in validator.iter_errors(instance)]
+            expected = [
+                (e.message, tuple(e.absolute_path))
+                for e in reference.iter_errors(instance)
+            ]
+            assert_that(sorted(actual), is_(sorted(expected)))
+
+    def test_validate(self):
+        """
+        Unit test case for :py:meth:`SubsetValidator.validate`.
+        """
+        validator = SubsetValidator(self._SCHEMA)
+        validator.validate(self._INSTANCES[0])
+        with raises(SchemaValidationError) as e:
+            validator.validate({"name": 5})
+        assert_that(e.value.message, is_("5 is not of type 'string'"))
+        assert_that(e.value.path, is_(("name",)))
+
+    def test_create_validator_falls_back_to_jsonschema(self):
+        """
+        Unit test case for :py:func:`create_validator`.
+        """
+        schema = {"type": "string", "minLength": 2}
+        validator = create_validator(schema)
+        assert_that(isinstance(validator, SubsetValidator), is_(False))
+        validator.validate("ab")
+        with raises(SchemaValidationError):
+            validator.validate("a")
+        assert_that(
+            isinstance(create_validator(self._SCHEMA), SubsetValidator), is_(True)
+        )
+        with raises(ValueError):
+            create_validator(schema, subset_only=True)
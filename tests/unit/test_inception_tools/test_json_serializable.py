@@ -23,7 +23,7 @@ class _MockJsonSerializable(JsonSerializable):
         self.json_obj = json_obj
 
     @classmethod
-    def from_json(cls, json_obj: JSON_OBJ_TYPE) -> JsonSerializable:
+    def from_json(cls, json_obj: JSON_OBJ_TYPE, validate: bool = True):
         return cls(json_obj)
 
     def to_json(self) -> JSON_OBJ_TYPE:
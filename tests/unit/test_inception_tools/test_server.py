@@ -0,0 +1,296 @@
+"""
+test_server
+~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`server` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import asyncio
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import zipfile
+from unittest import mock
+
+from hamcrest import assert_that, is_
+from pytest import raises
+
+from inception_tools import server
+from inception_tools.archetype_base import ArchetypeBase
+from inception_tools.archetype_parameters import ArchetypeParameters
+from inception_tools.file_builder import FileBuilder
+from inception_tools.server import ArchetypeServer
+from inception_tools.standard_archetype import StandardArchetype
+from inception_tools.synthetic_archetype import (
+    SyntheticArchetypeSpec,
+    write_synthetic_archetype,
+)
+from inception_tools.template_archetype import TemplateArchetype
+from tests.archetype_output_test_base import ArchetypeOutputTestBase
+
+
+class _ChunkedFileBuilder(FileBuilder):
+    # Produces its content in chunks, raising any exception among them
+    def __init__(self, subpath, chunks) -> None:
+        super().__init__()
+        self._subpath = subpath
+        self._chunks = chunks
+
+    def subpath(self, params: ArchetypeParameters) -> str:
+        return self._subpath
+
+    def render(self, params: ArchetypeParameters) -> str:
+        raise NotImplementedError()
+
+    def iter_render_bytes(self, params: ArchetypeParameters):
+        for chunk in self._chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+
+def _dechunk(body: bytes) -> bytes:
+    result = b""
+    while True:
+        size, _, rest = body.partition(b"\r\n")
+        size = int(size, 16)
+        if size == 0:
+            return result
+        result += rest[:size]
+        body = rest[size + 2 :]
+
+
+class TestArchetypeServer(object):
+    """
+    Unit test for class :py:class:`ArchetypeServer`.
+    """
+
+    ##############################
+    # Class attributes
+
+    _SIMPLE = StandardArchetype.SIMPLE.canonical_name
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._server = ArchetypeServer.load(jobs=2)
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        self._server.close()
+
+    def _raw_request(self, method, path, body=b""):
+        # Sends a single request to the server and returns the whole response
+        async def run():
+            server = await self._server.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(
+                    f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+                return response
+
+        return asyncio.run(run())
+
+    def _request(self, method, path, body=b""):
+        # Sends a single request to the server and returns the status code, the
+        # headers and the body of the response.
+        response = self._raw_request(method, path, body)
+        head, _, body = response.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = dict(line.split(": ", 1) for line in lines[1:])
+        if headers.get("Transfer-Encoding") == "chunked":
+            body = _dechunk(body)
+        return status, headers, body
+
+    def _incept(self, **fields):
+        return self._request("POST", "/incept", json.dumps(fields).encode("utf-8"))
+
+    # Test cases
+
+    def test_incept_streams_tar_gz(self):
+        """
+        Unit test case for :py:class:`ArchetypeServer`.
+        """
+        status, headers, body = self._incept(
+            package_name="some_package_name", archetype=self._SIMPLE
+        )
+
+        assert_that(status, is_(200))
+        assert_that(headers["Content-Type"], is_("application/gzip"))
+        with tarfile.open(fileobj=io.BytesIO(body), mode="r:gz") as tar:
+            actual = sorted(m.name for m in tar.getmembers() if m.isfile())
+        expected = sorted(
+            "/".join(p.split(os.sep))
+            for p in StandardArchetype.SIMPLE.file_paths(
+                "some_package_name", ArchetypeOutputTestBase._PARAMS
+            )
+        )
+        assert_that(actual, is_(expected))
+
+    def test_incept_streams_zip(self):
+        """
+        Unit test case for :py:class:`ArchetypeServer`.
+        """
+        status, headers, body = self._incept(
+            package_name="some_package_name", archetype=self._SIMPLE, format="zip"
+        )
+
+        assert_that(status, is_(200))
+        assert_that(headers["Content-Type"], is_("application/zip"))
+        with zipfile.ZipFile(io.BytesIO(body)) as zf:
+            assert_that(zf.testzip(), is_(None))
+            assert_that("some_package_name/LICENSE" in zf.namelist(), is_(True))
+
+    def test_incept_rejects_invalid_parameters(self):
+        """
+        Unit test case for :py:class:`ArchetypeServer`.
+        """
+        for fields in (
+            {},
+            {"package_name": "not a package"},
+            {"package_name": "some_package_name", "archetype": "unknown"},
+            {"package_name": "some_package_name", "format": "rar"},
+        ):
+            status, _, body = self._incept(**fields)
+            assert_that(status, is_(400))
+            assert_that("error" in json.loads(body), is_(True))
+
+    def test_archetypes(self):
+        """
+        Unit test case for :py:class:`ArchetypeServer`.
+        """
+        status, _, body = self._request("GET", "/archetypes")
+
+        assert_that(status, is_(200))
+        expected = sorted(StandardArchetype.canonical_names())
+        assert_that(json.loads(body), is_({"archetypes": expected}))
+
+    def test_unknown_path_and_method(self):
+        """
+        Unit test case for :py:class:`ArchetypeServer`.
+        """
+        assert_that(self._request("GET", "/unknown")[0], is_(404))
+        assert_that(self._request("GET", "/incept")[0], is_(405))
+
+    def test_incept_matches_names_regardless_of_case(self):
+        """
+        Unit test case for :py:class:`ArchetypeServer`.
+        """
+        self._server.close()
+        self._server = ArchetypeServer({"SomeArchetype": StandardArchetype.SIMPLE})
+
+        for name in ("SomeArchetype", "someArchetype"):
+            status, _, _ = self._incept(
+                package_name="some_package_name", archetype=name
+            )
+            assert_that(status, is_(200))
+        with raises(ValueError):
+            ArchetypeServer(
+                {
+                    "SomeArchetype": StandardArchetype.SIMPLE,
+                    "somearchetype": StandardArchetype.SIMPLE,
+                }
+            )
+
+    def test_incept_reports_render_failure(self):
+        """
+        Unit test case for :py:class:`ArchetypeServer`.
+        """
+        failing = ArchetypeBase(
+            (
+                _ChunkedFileBuilder("some_file", (b"some_content",)),
+                _ChunkedFileBuilder("some_other_file", (ValueError("Some error."),)),
+            ),
+            (),
+        )
+        self._server.close()
+        self._server = ArchetypeServer({"failing": failing})
+
+        status, _, body = self._incept(
+            package_name="some_package_name", archetype="failing"
+        )
+
+        assert_that(status, is_(500))
+        assert_that(json.loads(body), is_({"error": "Some error."}))
+
+    def test_incept_ends_failed_stream_without_final_chunk(self):
+        """
+        Unit test case for :py:class:`ArchetypeServer`.
+        """
+        # Incompressible, so that part of the archive is sent before the failure
+        content = os.urandom(4 * server.CHUNK_SIZE)
+        failing = ArchetypeBase(
+            (
+                _ChunkedFileBuilder("some_file", (content,)),
+                _ChunkedFileBuilder("some_other_file", (ValueError("Some error."),)),
+            ),
+            (),
+        )
+        self._server.close()
+        self._server = ArchetypeServer({"failing": failing})
+
+        body = json.dumps({"package_name": "some_package_name", "archetype": "failing"})
+        response = self._raw_request("POST", "/incept", body.encode("utf-8"))
+
+        assert_that(response.startswith(b"HTTP/1.1 200 OK\r\n"), is_(True))
+        assert_that(response.endswith(b"\r\n0\r\n\r\n"), is_(False))
+
+    def test_put_threadsafe_gives_up_when_loop_stopped(self):
+        """
+        Unit test case for :py:class:`ArchetypeServer`.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            # The loop isn't running, so the put never completes
+            queue = asyncio.Queue()
+            with mock.patch.object(server, "_PUT_POLL_INTERVAL", 0.01):
+                with raises(server._Aborted):
+                    server._put_threadsafe(loop, queue, b"", threading.Event())
+        finally:
+            loop.close()
+
+    def test_close_closes_loaded_archetypes(self):
+        """
+        Unit test case for :py:meth:`ArchetypeServer.close`.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dir_path = os.path.join(tmp_dir, "archetype")
+            write_synthetic_archetype(dir_path, SyntheticArchetypeSpec(1, depth=0))
+            with mock.patch.object(TemplateArchetype, "close", autospec=True) as close:
+                loaded = ArchetypeServer.load((dir_path,))
+                assert_that(close.called, is_(False))
+                loaded.close()
+                assert_that(close.call_count, is_(1))
+
+                close.reset_mock()
+                with raises(ValueError):
+                    ArchetypeServer.load((dir_path, dir_path))
+                assert_that(close.call_count, is_(2))
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -10,6 +10,7 @@ __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Re
 __license__ = "Apache Software License 2.0"
 
 import os
+from unittest import mock
 
 from hamcrest import assert_that, is_
 
@@ -76,6 +77,19 @@ class _StandardArchetypeTestBase(ArchetypeOutputTestBase):
         self._validate_archetype_files(self._ROOT_DIR, self._expected_files())
         self._validate_archetype_dirs(self._ROOT_DIR, self._expected_dirs())
 
+    def test_render_to_mapping(self):
+        """
+        Unit test case for :py:method:`StandardArchetype.CLI.render_to_mapping`.
+        """
+        actual = self._ARCHETYPE.render_to_mapping(self._ROOT_DIR, self._PARAMS)
+        for j in self._expected_files():
+            expected = self._get_file_content(j.expected_content_path)
+            content = actual[os.path.join(self._ROOT_DIR, j.subpath)]
+            assert_that(content.decode("utf-8"), is_(expected))
+        for j in self._expected_dirs():
+            assert_that(actual[os.path.join(self._ROOT_DIR, j.subpath)], is_(None))
+        self._validate_path_doesnt_exist(self._ROOT_DIR)
+
 
 class TestStandardArchetypeCli(_StandardArchetypeTestBase):
     """
@@ -194,3 +208,51 @@ class TestStandardArchetypeSimple(_StandardArchetypeTestBase):
         (f"{ArchetypeOutputTestBase._PACKAGE_NAME}.py",),
         ("tests", "__init__.py"),
     )
+
+
+class TestStandardArchetypeDelegate(object):
+    """
+    Unit test cases for :py:attr:`StandardArchetype.delegate`.
+    """
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        # Temporarily discard any delegate loaded by other tests, so that lazy
+        # loading can be observed.
+        self._saved_delegate = StandardArchetype.SIMPLE._delegate
+        StandardArchetype.SIMPLE._delegate = None
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        StandardArchetype.SIMPLE._delegate = self._saved_delegate
+
+    # Test cases
+
+    @mock.patch("inception_tools.standard_archetype.TemplateArchetype")
+    def test_delegate_is_loaded_on_first_use(self, mock_template_archetype):
+        """
+        Unit test case for :py:attr:`StandardArchetype.delegate`.
+        """
+        assert_that(mock_template_archetype.call_count, is_(0))
+
+        StandardArchetype.SIMPLE.file_paths(
+            ArchetypeOutputTestBase._ROOT_DIR, ArchetypeOutputTestBase._PARAMS
+        )
+        StandardArchetype.SIMPLE.dir_paths(
+            ArchetypeOutputTestBase._ROOT_DIR, ArchetypeOutputTestBase._PARAMS
+        )
+
+        mock_template_archetype.assert_called_once_with(
+            StandardArchetype.SIMPLE.dir_path
+        )
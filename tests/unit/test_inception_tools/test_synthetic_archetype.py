@@ -0,0 +1,137 @@
+"""
+test_synthetic_archetype
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`synthetic_archetype` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import os
+import shutil
+import tempfile
+
+from hamcrest import assert_that, is_
+from pytest import raises
+
+from inception_tools.synthetic_archetype import (
+    SizeDistribution,
+    SyntheticArchetypeSpec,
+    write_synthetic_archetype,
+)
+from inception_tools.template_archetype import TemplateArchetype
+from tests.archetype_output_test_base import ArchetypeOutputTestBase
+
+
+class TestSyntheticArchetype(object):
+    """
+    Unit test for the classes and functions of the :py:mod:`synthetic_archetype`
+    module.
+    """
+
+    ##############################
+    # Class attributes
+
+    _PARAMS = ArchetypeOutputTestBase._PARAMS
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._tmp_dir)
+
+    def _write(self, name, **kwargs):
+        dir_path = os.path.join(self._tmp_dir, name)
+        descriptor = write_synthetic_archetype(
+            dir_path, SyntheticArchetypeSpec(**kwargs)
+        )
+        return dir_path, descriptor
+
+    # Test cases
+
+    def test_write_synthetic_archetype(self):
+        """
+        Unit test case for :py:func:`write_synthetic_archetype`.
+        """
+        dir_path, descriptor = self._write(
+            "a", file_count=10, depth=2, fan_out=3, path_density=0
+        )
+        archetype = TemplateArchetype(dir_path)
+        file_paths = archetype.file_paths("root", self._PARAMS)
+        assert_that(len(file_paths), is_(10))
+        # 9 leaves, one holding two files
+        assert_that(len({os.path.dirname(p) for p in file_paths}), is_(9))
+        assert_that(file_paths[0], is_(os.path.join("root", "d0_0", "d1_0", "f0.py")))
+        rendered = archetype.render_to_mapping("root", self._PARAMS)
+        assert_that(sum(v is not None for v in rendered.values()), is_(10))
+
+    def test_write_synthetic_archetype_creates_empty_leaves(self):
+        """
+        Unit test case for :py:func:`write_synthetic_archetype`.
+        """
+        dir_path, _ = self._write("a", file_count=2, depth=1, fan_out=4)
+        archetype = TemplateArchetype(dir_path)
+        assert_that(len(archetype.dir_paths("root", self._PARAMS)), is_(2))
+
+    def test_write_synthetic_archetype_densities(self):
+        """
+        Unit test case for :py:func:`write_synthetic_archetype`.
+        """
+        dir_path, descriptor = self._write(
+            "a", file_count=5, depth=1, variable_density=1, path_density=1
+        )
+        for f in descriptor.files:
+            assert_that(f.subpath.count("{{package_name}}"), is_(2))
+            with open(os.path.join(dir_path, f.prototype)) as fp:
+                lines = fp.read().splitlines()
+            assert_that(all("{{" in line for line in lines), is_(True))
+
+    def test_write_synthetic_archetype_is_deterministic(self):
+        """
+        Unit test case for :py:func:`write_synthetic_archetype`.
+        """
+        kwargs = {
+            "file_count": 20,
+            "size_distribution": SizeDistribution.EXPONENTIAL,
+            "path_density": 0.5,
+        }
+        dir_a, descriptor_a = self._write("a", **kwargs)
+        dir_b, descriptor_b = self._write("b", **kwargs)
+        assert_that(descriptor_a, is_(descriptor_b))
+        actual = TemplateArchetype(dir_a).render_to_mapping("root", self._PARAMS)
+        expected = TemplateArchetype(dir_b).render_to_mapping("root", self._PARAMS)
+        assert_that(actual, is_(expected))
+
+    def test_write_synthetic_archetype_requires_empty_directory(self):
+        """
+        Unit test case for :py:func:`write_synthetic_archetype`.
+        """
+        self._write("a", file_count=1)
+        with raises(FileExistsError):
+            self._write("a", file_count=1)
+
+    def test_spec_rejects_invalid_values(self):
+        """
+        Unit test case for :py:class:`SyntheticArchetypeSpec`.
+        """
+        with raises(ValueError):
+            SyntheticArchetypeSpec(fan_out=0)
+        with raises(ValueError):
+            SyntheticArchetypeSpec(size_distribution="unknown")
+        with raises(ValueError):
+            SyntheticArchetypeSpec(variable_density=1.5)
@@ -9,10 +9,21 @@ __author__ = "Andrew van Herick"
 __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
 __license__ = "Apache Software License 2.0"
 
+import json
 import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
 
 from hamcrest import assert_that, is_
 
+from inception_tools.archetype_source import DirectorySource, ZipSource
+from inception_tools.synthetic_archetype import (
+    PROTOTYPE_DIR,
+    SyntheticArchetypeSpec,
+    write_synthetic_archetype,
+)
 from inception_tools.template_archetype import TemplateArchetype
 from tests.archetype_output_test_base import (
     _OutputFile,
@@ -90,3 +101,142 @@ class TestTemplateArchetype(ArchetypeOutputTestBase):
         self._archetype.build(self._ROOT_DIR, self._PARAMS)
         self._validate_archetype_files(self._ROOT_DIR, self._OUTPUT_FILES)
         self._validate_archetype_dirs(self._ROOT_DIR, self._OUTPUT_DIRS)
+
+    def test_prototypes_are_loaded_lazily(self):
+        """
+        Unit test case for :py:class:`TemplateArchetype`.
+        """
+        dir_path = os.path.join(self._TEST_RESOURCE_PATH, self._ARCHETYPE_NAME)
+        source = DirectorySource(dir_path)
+        with mock.patch.object(
+            source, "read_text", wraps=source.read_text
+        ) as mock_read_text:
+            archetype = TemplateArchetype(source)
+            archetype.file_paths(self._ROOT_DIR, self._PARAMS)
+            # The metadata and descriptor may come from the ArchetypeCache
+            names = {c.args[0] for c in mock_read_text.call_args_list}
+            expected = {
+                TemplateArchetype.METADATA_FILE_NAME,
+                TemplateArchetype.DESCRIPTOR_FILE_NAME,
+            }
+            assert_that(names <= expected, is_(True))
+
+            read_count = mock_read_text.call_count
+            archetype.build(self._ROOT_DIR, self._PARAMS)
+            archetype.build(self._ROOT_DIR, self._PARAMS)
+            assert_that(mock_read_text.call_count, is_(read_count + 1))
+        self._validate_archetype_files(self._ROOT_DIR, self._OUTPUT_FILES)
+
+    def test_load(self):
+        """
+        Unit test case for :py:method:`TemplateArchetype.load`.
+        """
+        assert_that(any(fb.loaded for fb in self._archetype._file_builders), is_(False))
+        self._archetype.load()
+        assert_that(all(fb.loaded for fb in self._archetype._file_builders), is_(True))
+
+    def test_prototypes_include_archetype_members(self):
+        """
+        Unit test case for :py:class:`TemplateArchetype`.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dir_path = os.path.join(tmp_dir, "archetype")
+            write_synthetic_archetype(dir_path, SyntheticArchetypeSpec(2, depth=0))
+            for name, content in (
+                ("header.jinja", "# {{author}}\n"),
+                ("p0.py.jinja", '{% include "prototypes/header.jinja" %}x = 0\n'),
+                ("p1.py.jinja", '{% include "prototypes/header.jinja" %}x = 1\n'),
+            ):
+                with open(os.path.join(dir_path, PROTOTYPE_DIR, name), "w") as f:
+                    f.write(content)
+
+            archetype = TemplateArchetype(dir_path)
+            names = []
+            read_text = DirectorySource.read_text
+
+            def recording_read_text(source, name):
+                names.append(name)
+                return read_text(source, name)
+
+            with mock.patch.object(DirectorySource, "read_text", recording_read_text):
+                actual = archetype.render_to_mapping("root", self._PARAMS)
+            assert_that(
+                actual,
+                is_(
+                    {
+                        os.path.join("root", "f0.py"): b"# some_author\nx = 0\n",
+                        os.path.join("root", "f1.py"): b"# some_author\nx = 1\n",
+                    }
+                ),
+            )
+            header_reads = [n for n in names if n.endswith("header.jinja")]
+            assert_that(len(header_reads), is_(1))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_verbatim_files(self):
+        """
+        Unit test case for :py:class:`TemplateArchetype`.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dir_path = os.path.join(tmp_dir, "archetype")
+            write_synthetic_archetype(dir_path, SyntheticArchetypeSpec(1, depth=0))
+            content = b"\x89PNG\r\n\x1a\n\xff{{author}}"
+            with open(os.path.join(dir_path, PROTOTYPE_DIR, "logo.png"), "wb") as f:
+                f.write(content)
+            descriptor_path = os.path.join(
+                dir_path, TemplateArchetype.DESCRIPTOR_FILE_NAME
+            )
+            with open(descriptor_path) as f:
+                descriptor = json.load(f)
+            descriptor["files"].append(
+                {
+                    "subpath": "{{package_name}}.png",
+                    "prototype": f"{PROTOTYPE_DIR}/logo.png",
+                    "kind": "verbatim",
+                }
+            )
+            with open(descriptor_path, "w") as f:
+                json.dump(descriptor, f)
+
+            archetype = TemplateArchetype(dir_path)
+            root_dir = os.path.join(tmp_dir, "root")
+            archetype.build(root_dir, self._PARAMS)
+            with open(os.path.join(root_dir, "some_package_name.png"), "rb") as f:
+                assert_that(f.read(), is_(content))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_close(self):
+        """
+        Unit test case for :py:meth:`TemplateArchetype.close`.
+        """
+        dir_path = os.path.join(self._TEST_RESOURCE_PATH, self._ARCHETYPE_NAME)
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            zip_path = os.path.join(tmp_dir, "archetype.zip")
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                for parent, _, names in os.walk(dir_path):
+                    for name in names:
+                        path = os.path.join(parent, name)
+                        zf.write(path, os.path.relpath(path, dir_path))
+            with mock.patch.object(ZipSource, "close", autospec=True) as close:
+                with TemplateArchetype(zip_path) as archetype:
+                    assert_that(isinstance(archetype.source, ZipSource), is_(True))
+                    assert_that(close.called, is_(False))
+                close.assert_called_once_with(archetype.source)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_close_leaves_given_source_open(self):
+        """
+        Unit test case for :py:meth:`TemplateArchetype.close`.
+        """
+        dir_path = os.path.join(self._TEST_RESOURCE_PATH, self._ARCHETYPE_NAME)
+        source = DirectorySource(dir_path)
+        with mock.patch.object(source, "close") as close:
+            with TemplateArchetype(source):
+                pass
+            assert_that(close.called, is_(False))
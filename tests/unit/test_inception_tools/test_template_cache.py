@@ -0,0 +1,271 @@
+"""
+test_template_cache
+~~~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`template_cache` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import marshal
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from hamcrest import assert_that, is_, is_not
+from jinja2 import Environment, StrictUndefined, Template, Undefined, UndefinedError
+from pytest import raises
+
+from inception_tools.template_cache import (
+    CACHE_DIR_ENV_VAR,
+    default_cache_dir,
+    prune_cache_entries,
+    PROTOTYPE_ENVIRONMENT,
+    SUBPATH_ENVIRONMENT,
+    TemplateCache,
+)
+
+
+class TestTemplateCache(object):
+    """
+    Unit test cases for :py:class:`TemplateCache`.
+    """
+
+    ##############################
+    # Class attributes
+
+    _SOURCE = "Hello {{author}}!\n"
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._cache_dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._cache_dir)
+
+    # Test cases
+
+    def test_compile_renders_template(self):
+        """
+        Unit test case for :py:method:`TemplateCache.compile`.
+        """
+        template = TemplateCache(self._cache_dir).compile(
+            PROTOTYPE_ENVIRONMENT, self._SOURCE
+        )
+        assert_that(template.render(author="some_author"), is_("Hello some_author!\n"))
+
+    def test_compile_stores_entry(self):
+        """
+        Unit test case for :py:method:`TemplateCache.compile`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        template_cache.compile(PROTOTYPE_ENVIRONMENT, self._SOURCE)
+        assert_that(template_cache.misses, is_(1))
+        assert_that(len(os.listdir(template_cache.dir_path)), is_(1))
+
+    @mock.patch.object(TemplateCache, "MAX_ENTRIES", 2)
+    @mock.patch.object(TemplateCache, "PRUNE_INTERVAL", 1)
+    def test_compile_prunes_oldest_entries(self):
+        """
+        Unit test case for :py:method:`TemplateCache.compile`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        for i in range(4):
+            template_cache.compile(PROTOTYPE_ENVIRONMENT, f"{i}{self._SOURCE}")
+        assert_that(len(os.listdir(template_cache.dir_path)), is_(2))
+        template_cache.compile(PROTOTYPE_ENVIRONMENT, f"3{self._SOURCE}")
+        assert_that(template_cache.hits, is_(1))
+
+    def test_compile_skips_compilation_for_cached_entry(self):
+        """
+        Unit test case for :py:method:`TemplateCache.compile`.
+        """
+        TemplateCache(self._cache_dir).compile(PROTOTYPE_ENVIRONMENT, self._SOURCE)
+
+        template_cache = TemplateCache(self._cache_dir)
+        with mock.patch.object(PROTOTYPE_ENVIRONMENT, "compile") as mock_compile:
+            template = template_cache.compile(PROTOTYPE_ENVIRONMENT, self._SOURCE)
+            mock_compile.assert_not_called()
+
+        assert_that(template_cache.hits, is_(1))
+        assert_that(template.render(author="some_author"), is_("Hello some_author!\n"))
+
+    def test_compile_ignores_corrupt_entry(self):
+        """
+        Unit test case for :py:method:`TemplateCache.compile`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        key = template_cache.key(PROTOTYPE_ENVIRONMENT, self._SOURCE)
+        os.makedirs(template_cache.dir_path)
+        entry_path = os.path.join(
+            template_cache.dir_path, key + TemplateCache.CACHE_FILE_SUFFIX
+        )
+        with open(entry_path, "wb") as f:
+            f.write(b"not marshalled code")
+
+        template = template_cache.compile(PROTOTYPE_ENVIRONMENT, self._SOURCE)
+
+        assert_that(template_cache.misses, is_(1))
+        assert_that(template.render(author="some_author"), is_("Hello some_author!\n"))
+
+    def test_compile_ignores_outdated_entry(self):
+        """
+        Unit test case for :py:method:`TemplateCache.compile`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        key = template_cache.key(PROTOTYPE_ENVIRONMENT, self._SOURCE)
+        os.makedirs(template_cache.dir_path)
+        entry_path = os.path.join(
+            template_cache.dir_path, key + TemplateCache.CACHE_FILE_SUFFIX
+        )
+        with open(entry_path, "wb") as f:
+            marshal.dump(PROTOTYPE_ENVIRONMENT.compile(self._SOURCE), f)
+
+        template = template_cache.compile(PROTOTYPE_ENVIRONMENT, self._SOURCE)
+
+        assert_that(template_cache.misses, is_(1))
+        assert_that(template.render(author="some_author"), is_("Hello some_author!\n"))
+
+    def test_fold(self):
+        """
+        Unit test case for :py:method:`TemplateCache.fold`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        for source, expected in (
+            ("LICENSE", "LICENSE"),
+            ("{# comment #}{% set x = 2 %}{{ x }}\n", "2\n"),
+            ("{% raw %}{{author}}{% endraw %}", "{{author}}"),
+            (self._SOURCE, None),
+            ("{{ lipsum() }}", None),
+            ("{{ [1, 2] | random }}", None),
+        ):
+            actual = template_cache.fold(PROTOTYPE_ENVIRONMENT, source)
+            if expected is None:
+                assert_that(isinstance(actual, Template), is_(True))
+            else:
+                assert_that(actual, is_(expected))
+
+        with mock.patch.object(PROTOTYPE_ENVIRONMENT, "compile") as mock_compile:
+            actual = TemplateCache(self._cache_dir).fold(
+                PROTOTYPE_ENVIRONMENT, "LICENSE"
+            )
+            mock_compile.assert_not_called()
+        assert_that(actual, is_("LICENSE"))
+
+    def test_load(self):
+        """
+        Unit test case for :py:method:`TemplateCache.load`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        for source, expected in (
+            ("LICENSE", ()),
+            (self._SOURCE, (("author", None),)),
+            ("{{date.year}} {{date.month}}", (("date", ("month", "year")),)),
+            ("{{date.year}} {{date}}", (("date", None),)),
+            ("{{ lipsum() }}", None),
+        ):
+            actual = template_cache.load(PROTOTYPE_ENVIRONMENT, source)
+            assert_that(actual.variables, is_(expected))
+
+        actual = TemplateCache(self._cache_dir).load(PROTOTYPE_ENVIRONMENT, "LICENSE")
+        assert_that((actual.template, actual.constant), is_((None, "LICENSE")))
+
+    def test_key_depends_on_environment(self):
+        """
+        Unit test case for :py:method:`TemplateCache.key`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        actual = template_cache.key(SUBPATH_ENVIRONMENT, self._SOURCE)
+        expected = template_cache.key(PROTOTYPE_ENVIRONMENT, self._SOURCE)
+        assert_that(actual, is_not(expected))
+
+    def test_key_depends_on_async(self):
+        """
+        Unit test case for :py:method:`TemplateCache.key`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        actual = template_cache.key(Environment(enable_async=True), self._SOURCE)
+        expected = template_cache.key(Environment(), self._SOURCE)
+        assert_that(actual, is_not(expected))
+
+    def test_key_depends_on_undefined(self):
+        """
+        Unit test case for :py:method:`TemplateCache.key`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        actual = template_cache.key(
+            Environment(undefined=StrictUndefined), self._SOURCE
+        )
+        expected = template_cache.key(Environment(), self._SOURCE)
+        assert_that(actual, is_not(expected))
+
+        template_cache.compile(Environment(), self._SOURCE)
+        template = template_cache.compile(
+            Environment(undefined=StrictUndefined), self._SOURCE
+        )
+        with raises(UndefinedError):
+            template.render()
+        assert_that(len(os.listdir(template_cache.dir_path)), is_(2))
+
+        class LocalUndefined(Undefined):
+            pass
+
+        template_cache.compile(Environment(undefined=LocalUndefined), self._SOURCE)
+        assert_that(len(os.listdir(template_cache.dir_path)), is_(2))
+
+    def test_compile_bypasses_cache_for_unfingerprintable_environment(self):
+        """
+        Unit test case for :py:method:`TemplateCache.compile`.
+        """
+        template_cache = TemplateCache(self._cache_dir)
+        source = "a{{ x }}b"
+        template_cache.compile(Environment(), source)
+
+        environment = Environment(finalize=lambda v: "" if v is None else v)
+        for _ in range(2):
+            template = template_cache.compile(environment, source)
+            assert_that(template.render(x=None), is_("ab"))
+        assert_that(len(os.listdir(template_cache.dir_path)), is_(1))
+
+        environment = Environment()
+        environment.filters["shout"] = lambda v: v.upper()
+        actual = template_cache.fold(environment, "{{ 'x'|shout }}")
+        assert_that(actual, is_("X"))
+        assert_that(len(os.listdir(template_cache.dir_path)), is_(1))
+
+    @mock.patch.dict(os.environ, {CACHE_DIR_ENV_VAR: "some_cache_dir"})
+    def test_default_cache_dir_uses_environment_variable(self):
+        """
+        Unit test case for :py:func:`default_cache_dir`.
+        """
+        assert_that(default_cache_dir(), is_("some_cache_dir"))
+
+    def test_prune_cache_entries(self):
+        """
+        Unit test case for :py:func:`prune_cache_entries`.
+        """
+        for i, name in enumerate(("a.entry", "b.entry", "c.entry", "d.other")):
+            path = os.path.join(self._cache_dir, name)
+            with open(path, "wb"):
+                pass
+            os.utime(path, (i, i))
+
+        assert_that(prune_cache_entries(self._cache_dir, ".entry", 2), is_(1))
+        actual = sorted(os.listdir(self._cache_dir))
+        assert_that(actual, is_(["b.entry", "c.entry", "d.other"]))
+        assert_that(prune_cache_entries(self._cache_dir, ".entry", 2), is_(0))
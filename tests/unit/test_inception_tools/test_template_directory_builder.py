@@ -60,3 +60,11 @@ class TestTemplateDirectoryBuilder(object):
             "",
         )
         assert_that(actual, is_(expected))
+
+    def test_subpath_of_constant_template(self):
+        """
+        Unit test case for :py:method:`TemplateFileBuilder.subpath`.
+        """
+        builder = TemplateDirectoryBuilder.from_string("tests/unit")
+        actual = builder.subpath(self._PARAMS)
+        assert_that(actual, is_(os.path.join("tests", "unit")))
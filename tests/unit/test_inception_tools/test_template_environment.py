@@ -0,0 +1,88 @@
+"""
+test_template_environment
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`template_environment` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import os
+import shutil
+import tempfile
+
+from hamcrest import assert_that, is_
+from jinja2 import StrictUndefined, TemplateNotFound, UndefinedError
+from pytest import raises
+
+from inception_tools.archetype_source import DirectorySource
+from inception_tools.template_environment import TemplateEnvironment
+from inception_tools.template_file_builder import TemplateFileBuilder
+from tests.archetype_output_test_base import ArchetypeOutputTestBase
+
+
+class TestTemplateEnvironment(object):
+    """
+    Unit test cases for :py:class:`TemplateEnvironment`.
+    """
+
+    ##############################
+    # Class attributes
+
+    _PARAMS = ArchetypeOutputTestBase._PARAMS
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._tmp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self._tmp_dir, "macros.jinja"), "w") as f:
+            f.write("{% macro shout(s) %}{{ s | upper }}!{% endmacro %}")
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._tmp_dir)
+
+    # Test cases
+
+    def test_create_loads_templates_from_source(self):
+        """
+        Unit test case for :py:meth:`TemplateEnvironment.create`.
+        """
+        environment = TemplateEnvironment.create(DirectorySource(self._tmp_dir))
+        builder = TemplateFileBuilder.from_strings(
+            "{{package_name}}.py\n",
+            '{% import "macros.jinja" as m %}{{ m.shout(author) }}\n',
+            environment=environment,
+        )
+        assert_that(builder.subpath(self._PARAMS), is_("some_package_name.py"))
+        assert_that(builder.render(self._PARAMS), is_("SOME_AUTHOR!\n"))
+
+        builder = TemplateFileBuilder.from_strings(
+            "some_file", '{% include "missing.jinja" %}', environment=environment
+        )
+        with raises(TemplateNotFound):
+            builder.render(self._PARAMS)
+
+    def test_create_applies_options(self):
+        """
+        Unit test case for :py:meth:`TemplateEnvironment.create`.
+        """
+        environment = TemplateEnvironment.create(undefined=StrictUndefined)
+        assert_that(environment.subpath.undefined is StrictUndefined, is_(True))
+        builder = TemplateFileBuilder.from_strings(
+            "some_file", "{{ some_undefined_variable }}", environment=environment
+        )
+        with raises(UndefinedError):
+            builder.render(self._PARAMS)
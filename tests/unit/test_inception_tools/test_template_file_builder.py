@@ -10,10 +10,13 @@ __copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Re
 __license__ = "Apache Software License 2.0"
 
 import os
+from unittest import mock
 
 from hamcrest import assert_that, is_
 from jinja2 import Template
 
+from inception_tools import template_file_builder
+from inception_tools.archetype_source import ArchetypeSource
 from inception_tools.template_file_builder import TemplateFileBuilder
 from tests.archetype_output_test_base import ArchetypeOutputTestBase
 
@@ -58,6 +61,28 @@ class TestTemplateFileBuilder(object):
         assert_that(actual.subpath(self._PARAMS), is_(expected.subpath(self._PARAMS)))
         assert_that(actual.render(self._PARAMS), is_(expected.render(self._PARAMS)))
 
+    def test_from_source(self):
+        """
+        Unit test case for
+        :py:method:`TemplateFileBuilder.from_source`.
+        """
+        source = mock.create_autospec(ArchetypeSource, instance=True)
+        source.read_text.return_value = self._PROTOTYPE_SOURCE
+        source.size.return_value = 42
+
+        actual = TemplateFileBuilder.from_source(
+            self._SUBPATH_SOURCE, source, "some_prototype"
+        )
+        expected = self._BUILDER
+        assert_that(actual.subpath(self._PARAMS), is_(expected.subpath(self._PARAMS)))
+        assert_that(actual.size_hint(), is_(42))
+        assert_that(actual.loaded, is_(False))
+        assert_that(source.read_text.called, is_(False))
+        assert_that(actual.render(self._PARAMS), is_(expected.render(self._PARAMS)))
+        assert_that(actual.render(self._PARAMS), is_(expected.render(self._PARAMS)))
+        assert_that(actual.loaded, is_(True))
+        source.read_text.assert_called_once_with("some_prototype")
+
     def test_subpath(self):
         """
         Unit test case for :py:method:`TemplateFileBuilder.subpath`.
@@ -84,3 +109,140 @@ class TestTemplateFileBuilder(object):
             "year=2000,\n"
         )
         assert_that(actual, is_(expected))
+
+    def test_from_strings_folds_constant_templates(self):
+        """
+        Unit test case for
+        :py:method:`TemplateFileBuilder.from_strings`.
+        """
+        builder = TemplateFileBuilder.from_strings(
+            "tests/unit/__init__.py", "{# No variables #}# Empty module\n"
+        )
+        with mock.patch.object(Template, "render") as mock_render:
+            subpath = builder.subpath(self._PARAMS)
+            content = builder.render_bytes(self._PARAMS)
+            assert_that(builder.render_bytes(self._PARAMS) is content, is_(True))
+        assert_that(mock_render.called, is_(False))
+        assert_that(subpath, is_(os.path.join("tests", "unit", "__init__.py")))
+        assert_that(content, is_(b"# Empty module\n"))
+
+    def test_render_bytes_caches_content(self):
+        """
+        Unit test case for
+        :py:method:`TemplateFileBuilder.render_bytes`.
+        """
+        builder = TemplateFileBuilder.from_strings(
+            "LICENSE", "Copyright {{date.year}} {{author}}\n"
+        )
+        expected = builder.render(self._PARAMS).encode(TemplateFileBuilder.ENCODING)
+        other_package = self._PARAMS._replace(package_name="some_other_package")
+        other_author = self._PARAMS._replace(author="some_other_author")
+
+        with mock.patch.object(
+            Template, "render", autospec=True, return_value="some_content"
+        ) as mock_render:
+            assert_that(builder.render_bytes(self._PARAMS), is_(b"some_content"))
+            assert_that(builder.render_bytes(self._PARAMS), is_(b"some_content"))
+            assert_that(builder.render_bytes(other_package), is_(b"some_content"))
+            assert_that(mock_render.call_count, is_(1))
+            builder.render_bytes(other_author)
+            assert_that(mock_render.call_count, is_(2))
+
+        other_builder = TemplateFileBuilder.from_strings(
+            "LICENSE", "Copyright {{date.year}} {{author}}\n"
+        )
+        assert_that(other_builder.render_bytes(self._PARAMS), is_(expected))
+
+    def test_render_bytes_bounds_cached_content(self):
+        """
+        Unit test case for
+        :py:method:`TemplateFileBuilder.render_bytes`.
+        """
+        with mock.patch.object(TemplateFileBuilder, "RENDER_CACHE_SIZE", 16):
+            builder = TemplateFileBuilder.from_strings("some_file", "{{author}}\n")
+        builder.RENDER_CACHE_ENTRY_SIZE = 8
+        authors = ("a" * 7, "b" * 7, "c" * 7, "d" * 9)
+
+        with mock.patch.object(Template, "render", autospec=True) as mock_render:
+            mock_render.side_effect = lambda _, **context: context["author"]
+            for author in authors:
+                builder.render_bytes(self._PARAMS._replace(author=author))
+            assert_that(mock_render.call_count, is_(4))
+            # Only two contents fit, and the last one is too large to be kept
+            for author in authors:
+                builder.render_bytes(self._PARAMS._replace(author=author))
+            assert_that(mock_render.call_count, is_(8))
+            builder.render_bytes(self._PARAMS._replace(author="d" * 9))
+            assert_that(mock_render.call_count, is_(9))
+            builder.render_bytes(self._PARAMS._replace(author="c" * 7))
+            assert_that(mock_render.call_count, is_(9))
+
+    def test_render_cache_is_shared_by_all_instances(self):
+        """
+        Unit test case for :py:attr:`TemplateFileBuilder.RENDER_CACHE_SIZE`.
+        """
+        with mock.patch.object(TemplateFileBuilder, "RENDER_CACHE_SIZE", 64):
+            builders = [
+                TemplateFileBuilder.from_strings(
+                    f"some_file_{i}", f"{i}: {{{{author}}}}\n"
+                )
+                for i in range(10)
+            ]
+        render_cache = template_file_builder._shared_render_cache()
+        for b in builders:
+            for author in ("some_author", "some_other_author"):
+                b.render_bytes(self._PARAMS._replace(author=author))
+                assert_that(render_cache.size <= 64, is_(True))
+        assert_that(render_cache.size > 0, is_(True))
+
+        # Contents of different templates are kept apart
+        actual = [b.render_bytes(self._PARAMS) for b in builders[:2]]
+        assert_that(actual, is_([b"0: some_author\n", b"1: some_author\n"]))
+
+    def test_iter_render_bytes_streams_prototypes(self):
+        """
+        Unit test case for
+        :py:method:`TemplateFileBuilder.iter_render_bytes`.
+        """
+        builder = TemplateFileBuilder.from_strings(
+            "some_file",
+            '{% for c in "abcdefghijklmnopqrst" %}line {{ c }} by {{ author }}\n'
+            "{% endfor %}",
+        )
+        expected = builder.render(self._PARAMS).encode(TemplateFileBuilder.ENCODING)
+
+        builder.STREAM_CHUNK_SIZE = 16
+        with mock.patch.object(Template, "render") as mock_render:
+            actual = list(builder.iter_render_bytes(self._PARAMS))
+        assert_that(mock_render.called, is_(False))
+        assert_that(b"".join(actual), is_(expected))
+        assert_that(len(actual) > 1, is_(True))
+        assert_that(max(len(c) for c in actual) < 32, is_(True))
+
+        # The streamed content was added to the render cache
+        with mock.patch.object(Template, "generate") as mock_generate:
+            actual = list(builder.iter_render_bytes(self._PARAMS))
+        assert_that(mock_generate.called, is_(False))
+        assert_that(actual, is_([expected]))
+
+    def test_iter_render_bytes_skips_caching_large_content(self):
+        """
+        Unit test case for
+        :py:method:`TemplateFileBuilder.iter_render_bytes`.
+        """
+        builder = TemplateFileBuilder.from_strings(
+            "some_file",
+            '{% for c in "abcdefghijklmnopqrst" %}line {{ c }} by {{ author }}\n'
+            "{% endfor %}",
+        )
+        builder.STREAM_CHUNK_SIZE = 16
+        builder.RENDER_CACHE_ENTRY_SIZE = 64
+
+        expected = b"".join(builder.iter_render_bytes(self._PARAMS))
+        with mock.patch.object(
+            Template, "generate", autospec=True, return_value=iter(("x",))
+        ) as mock_generate:
+            actual = b"".join(builder.iter_render_bytes(self._PARAMS))
+        assert_that(mock_generate.called, is_(True))
+        assert_that(actual, is_(b"x"))
+        assert_that(len(expected) > 64, is_(True))
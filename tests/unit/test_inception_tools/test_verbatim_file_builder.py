@@ -0,0 +1,146 @@
+"""
+test_verbatim_file_builder
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Unit test cases for the :py:mod:`verbatim_file_builder` module.
+"""
+
+__author__ = "Andrew van Herick"
+__copyright__ = "Unpublished Copyright (c) 2022 Andrew van Herick. All Rights Reserved."
+__license__ = "Apache Software License 2.0"
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from hamcrest import assert_that, is_
+from pytest import raises
+
+from inception_tools.archetype_source import DirectorySource
+from inception_tools.build_report import WriteStatus
+from inception_tools.verbatim_file_builder import VerbatimFileBuilder
+from tests.archetype_output_test_base import ArchetypeOutputTestBase
+
+
+class TestVerbatimFileBuilder(object):
+    """
+    Unit test for :py:class:`VerbatimFileBuilder`.
+    """
+
+    ##############################
+    # Class attributes
+
+    _PARAMS = ArchetypeOutputTestBase._PARAMS
+
+    _SUBPATH_SOURCE = "{{package_name}}/assets/logo.png"
+
+    # Not valid UTF-8, and containing Jinja syntax which mustn't be rendered
+    _CONTENT = b"\x89PNG\r\n\x1a\n\xff\xfe{{author}}" * 10000
+
+    ##############################
+    # Instance methods
+
+    # Instance set up / tear down
+
+    def setup(self):
+        """
+        Called before each method in this class with a name of the form
+        test_*().
+        """
+        self._tmp_dir = tempfile.mkdtemp()
+        source_dir = os.path.join(self._tmp_dir, "archetype")
+        os.makedirs(source_dir)
+        with open(os.path.join(source_dir, "logo.png"), "wb") as f:
+            f.write(self._CONTENT)
+        self._source = DirectorySource(source_dir)
+        self._root_dir = os.path.join(self._tmp_dir, "root")
+        self._builder = VerbatimFileBuilder.from_source(
+            self._SUBPATH_SOURCE, self._source, "logo.png"
+        )
+
+    def teardown(self):
+        """
+        Called after each method in this class with a name of the form
+        test_*().
+        """
+        shutil.rmtree(self._tmp_dir)
+
+    # Test cases
+
+    def test_subpath(self):
+        """
+        Unit test case for :py:method:`VerbatimFileBuilder.subpath`.
+        """
+        actual = self._builder.subpath(self._PARAMS)
+        expected = os.path.join("some_package_name", "assets", "logo.png")
+        assert_that(actual, is_(expected))
+
+    def test_size_hint(self):
+        """
+        Unit test case for :py:method:`VerbatimFileBuilder.size_hint`.
+        """
+        assert_that(self._builder.size_hint(), is_(len(self._CONTENT)))
+
+    def test_render_bytes(self):
+        """
+        Unit test case for :py:method:`VerbatimFileBuilder.render_bytes`.
+        """
+        assert_that(self._builder.render_bytes(self._PARAMS), is_(self._CONTENT))
+        actual = b"".join(self._builder.iter_render_bytes(self._PARAMS))
+        assert_that(actual, is_(self._CONTENT))
+
+    def test_build(self):
+        """
+        Unit test case for :py:method:`VerbatimFileBuilder.build`.
+        """
+        actual = self._builder.build(self._root_dir, self._PARAMS)
+        assert_that(actual, is_(WriteStatus.CREATED))
+        path = self._builder.path(self._root_dir, self._PARAMS)
+        with open(path, "rb") as f:
+            assert_that(f.read(), is_(self._CONTENT))
+
+        actual = self._builder.build(self._root_dir, self._PARAMS)
+        assert_that(actual, is_(WriteStatus.WRITTEN))
+        actual = self._builder.build(self._root_dir, self._PARAMS, incremental=True)
+        assert_that(actual, is_(WriteStatus.UNCHANGED))
+
+    @mock.patch("inception_tools.file_builder._NEWLINE", b"\r\n")
+    def test_build_incremental_keeps_newlines(self):
+        """
+        Unit test case for :py:method:`VerbatimFileBuilder.build`.
+        """
+        actual = self._builder.build(self._root_dir, self._PARAMS, incremental=True)
+        assert_that(actual, is_(WriteStatus.CREATED))
+        path = self._builder.path(self._root_dir, self._PARAMS)
+        with open(path, "rb") as f:
+            assert_that(f.read(), is_(self._CONTENT))
+
+    def test_build_removes_created_file_on_error(self):
+        """
+        Unit test case for :py:method:`VerbatimFileBuilder.build`.
+        """
+        with mock.patch(
+            "inception_tools.verbatim_file_builder.copy_fileobj",
+            side_effect=OSError("Some test exception."),
+        ):
+            with raises(OSError):
+                self._builder.build(self._root_dir, self._PARAMS)
+        path = self._builder.path(self._root_dir, self._PARAMS)
+        assert_that(os.path.exists(path), is_(False))
+
+    def test_build_leaves_existing_file_intact_on_error(self):
+        """
+        Unit test case for :py:method:`VerbatimFileBuilder.build`.
+        """
+        self._builder.build(self._root_dir, self._PARAMS)
+        path = self._builder.path(self._root_dir, self._PARAMS)
+        with mock.patch(
+            "inception_tools.verbatim_file_builder.copy_fileobj",
+            side_effect=OSError("Some test exception."),
+        ):
+            with raises(OSError):
+                self._builder.build(self._root_dir, self._PARAMS)
+        with open(path, "rb") as f:
+            assert_that(f.read(), is_(self._CONTENT))
+        assert_that(os.listdir(os.path.dirname(path)), is_([os.path.basename(path)]))